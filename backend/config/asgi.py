@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+from core.services.company_profile import warm_company_profile_cache  # noqa: E402
+
+warm_company_profile_cache()
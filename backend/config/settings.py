@@ -1,6 +1,7 @@
 """Django settings for the construction ERP backend."""
 
 import os
+import tempfile
 import warnings
 from datetime import timedelta
 from pathlib import Path
@@ -61,6 +62,31 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+RESPONSE_COMPRESSION_ENABLED = os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_COMPRESSION_GZIP_LEVEL = int(os.getenv("RESPONSE_COMPRESSION_GZIP_LEVEL", "6"))
+RESPONSE_COMPRESSION_BROTLI_QUALITY = int(os.getenv("RESPONSE_COMPRESSION_BROTLI_QUALITY", "5"))
+RESPONSE_COMPRESSION_CONTENT_TYPES = [
+    content_type.strip()
+    for content_type in os.getenv(
+        "RESPONSE_COMPRESSION_CONTENT_TYPES",
+        "application/json,application/vnd.oai.openapi,text/csv,text/plain",
+    ).split(",")
+    if content_type.strip()
+]
+REQUEST_PROFILING_ENABLED = os.getenv("REQUEST_PROFILING_ENABLED", "false").lower() == "true"
+REQUEST_PROFILING_SLOW_QUERY_SAMPLES = int(os.getenv("REQUEST_PROFILING_SLOW_QUERY_SAMPLES", "0"))
+REQUEST_PROFILING_MAX_VIEWS = int(os.getenv("REQUEST_PROFILING_MAX_VIEWS", "500"))
+REQUEST_PROFILING_FLUSH_SECONDS = int(os.getenv("REQUEST_PROFILING_FLUSH_SECONDS", "30"))
+REQUEST_PROFILING_DUMP_DIR = os.getenv(
+    "REQUEST_PROFILING_DUMP_DIR",
+    os.path.join(tempfile.gettempdir(), "erp-profiling"),
+)
+if RESPONSE_COMPRESSION_ENABLED:
+    MIDDLEWARE.insert(1, "core.compression.CompressionMiddleware")
+if REQUEST_PROFILING_ENABLED:
+    MIDDLEWARE.insert(0, "core.profiling.RequestProfilingMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -139,6 +165,10 @@ else:
         }
     }
 
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    database["CONN_HEALTH_CHECKS"] = os.getenv("DB_CONN_HEALTH_CHECKS", "true").lower() == "true"
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -171,15 +201,19 @@ AUTH_USER_MODEL = "core.User"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.RoleClaimJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
-        "rest_framework.filters.SearchFilter",
+        "core.filters.FullTextSearchFilter",
         "rest_framework.filters.OrderingFilter",
     ),
+    "DEFAULT_RENDERER_CLASSES": (
+        os.getenv("API_JSON_RENDERER", "core.renderers.FastJSONRenderer"),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
@@ -194,6 +228,26 @@ SIMPLE_JWT = {
 GOOGLE_OAUTH_CLIENT_ID = os.getenv("GOOGLE_OAUTH_CLIENT_ID", "")
 STRIPE_API_KEY = os.getenv("STRIPE_API_KEY", "")
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+PAYMENTS_WEBHOOK_BATCH_SIZE = int(os.getenv("PAYMENTS_WEBHOOK_BATCH_SIZE", "200"))
+PAYMENTS_WEBHOOK_MAX_ATTEMPTS = int(os.getenv("PAYMENTS_WEBHOOK_MAX_ATTEMPTS", "5"))
+PAYMENTS_WEBHOOK_RETRY_BACKOFF_SECONDS = int(os.getenv("PAYMENTS_WEBHOOK_RETRY_BACKOFF_SECONDS", "30"))
+
+JWT_STATELESS_ROLE_CLAIMS = os.getenv("JWT_STATELESS_ROLE_CLAIMS", "false").lower() == "true"
+AUTH_VERSION_CACHE_SECONDS = int(os.getenv("AUTH_VERSION_CACHE_SECONDS", "60"))
+COMPANY_PROFILE_CACHE_SECONDS = int(os.getenv("COMPANY_PROFILE_CACHE_SECONDS", "60"))
+API_V1_READONLY = os.getenv("API_V1_READONLY", "").lower() == "true"
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_BACKOFF_SECONDS = int(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+ROW_SCOPE_STRATEGY = os.getenv("ROW_SCOPE_STRATEGY", "access_index").strip().lower()
+PAGINATION_COUNT_MODE = os.getenv("PAGINATION_COUNT_MODE", "exact").strip().lower()
+PAGINATION_ESTIMATED_COUNT_THRESHOLD = int(os.getenv("PAGINATION_ESTIMATED_COUNT_THRESHOLD", "10000"))
+BULK_CREATE_MAX_ITEMS = int(os.getenv("BULK_CREATE_MAX_ITEMS", "1000"))
+BULK_CREATE_BATCH_SIZE = int(os.getenv("BULK_CREATE_BATCH_SIZE", "500"))
+FULL_TEXT_SEARCH_ENABLED = os.getenv("FULL_TEXT_SEARCH_ENABLED", "true").lower() == "true"
+REPORT_TIME_BUDGET_SECONDS = float(os.getenv("REPORT_TIME_BUDGET_SECONDS", "30"))
+REPORT_CONCURRENT_QUERIES = os.getenv("REPORT_CONCURRENT_QUERIES", "true").lower() == "true"
+REPORT_THREAD_POOL_SIZE = int(os.getenv("REPORT_THREAD_POOL_SIZE", "4"))
+PROCUREMENT_ALLOW_NEGATIVE_STOCK = os.getenv("PROCUREMENT_ALLOW_NEGATIVE_STOCK", "false").lower() == "true"
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Construction ERP API",
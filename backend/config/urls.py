@@ -2,9 +2,8 @@
 from django.urls import include, path
 from django.views.generic import RedirectView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from rest_framework_simplejwt.views import TokenRefreshView
 
-from core.auth import RoleAwareTokenObtainPairView
+from core.auth import RoleAwareTokenObtainPairView, RoleAwareTokenRefreshView
 from core.views import GoogleOAuthView
 
 urlpatterns = [
@@ -13,7 +12,7 @@ urlpatterns = [
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
     path("api/auth/token/", RoleAwareTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/auth/token/refresh/", RoleAwareTokenRefreshView.as_view(), name="token_refresh"),
     path("api/auth/google/", GoogleOAuthView.as_view(), name="google_oauth"),
     path("api/v1/core/", include("core.urls")),
     path("api/v1/projects/", include("projects.urls")),
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import os
 from collections.abc import Iterable
 
+from django.apps import apps
+from django.conf import settings
 from django.db.models import Q
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
@@ -17,6 +18,10 @@ ROLE_UNASSIGNED = None
 
 
 def get_user_role_slug(user) -> str | None:
+    role_claims = getattr(user, "role_claims", None)
+    if role_claims is not None:
+        return role_claims.get("role_slug")
+
     role = getattr(user, "role", None)
     role_slug = getattr(role, "slug", None)
     if getattr(user, "is_customer", False) and not role_slug:
@@ -36,7 +41,7 @@ class ActionBasedRolePermission(BasePermission):
 
         # Optional toggle to force v1 APIs into read-only mode
         if (
-            os.getenv("API_V1_READONLY", "").lower() == "true"
+            settings.API_V1_READONLY
             and request.method not in SAFE_METHODS
             and request.path.startswith("/api/v1/")
         ):
@@ -55,24 +60,76 @@ class ActionBasedRolePermission(BasePermission):
         return role_slug in set(allowed_roles)
 
 
+ROW_SCOPE_STRATEGY_JOIN = "join"
+ROW_SCOPE_STRATEGY_ACCESS_INDEX = "access_index"
+
+
+def _lookup_is_multivalued(model, lookup: str) -> bool:
+    for part in lookup.split("__"):
+        field = model._meta.get_field(part)
+        if field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation:
+            return False
+        model = field.related_model
+    return False
+
+
 class RowLevelScopeMixin:
     user_scope_fields: tuple[str, ...] = ()
     global_scope_role_slugs: tuple[str, ...] = (ROLE_ADMIN, ROLE_ACCOUNTANT)
+    # Paths from the queryset model to projects.Project ("pk" for Project itself).
+    # Matching "<path>__created_by" scope lookups are answered from the
+    # projects.ProjectAccess index instead of joining through to the owner.
+    project_scope_fields: tuple[str, ...] = ()
+    row_scope_strategy: str | None = None
+
+    def get_row_scope_strategy(self) -> str:
+        return self.row_scope_strategy or getattr(settings, "ROW_SCOPE_STRATEGY", ROW_SCOPE_STRATEGY_ACCESS_INDEX)
+
+    def _project_owner_lookups(self) -> dict[str, str]:
+        return {
+            ("created_by" if path == "pk" else f"{path}__created_by"): path
+            for path in self.project_scope_fields
+        }
+
+    def _build_indexed_row_scope(self, queryset, user) -> tuple[Q, bool]:
+        project_access_model = apps.get_model("projects", "ProjectAccess")
+        accessible_project_ids = project_access_model.objects.filter(user=user).values("project_id")
+        owner_lookups = self._project_owner_lookups()
+
+        row_scope = Q()
+        needs_distinct = False
+        for lookup in self.user_scope_fields:
+            project_path = owner_lookups.get(lookup)
+            if project_path:
+                row_scope |= Q(**{f"{project_path}__in": accessible_project_ids})
+                continue
+            row_scope |= Q(**{lookup: user})
+            needs_distinct = needs_distinct or _lookup_is_multivalued(queryset.model, lookup)
+        return row_scope, needs_distinct
+
+    def has_global_row_scope(self) -> bool:
+        user = self.request.user
+        if not user or not user.is_authenticated:
+            return False
+        return user.is_superuser or get_user_role_slug(user) in self.global_scope_role_slugs
 
     def apply_row_level_scope(self, queryset):
         user = self.request.user
         if not user or not user.is_authenticated:
             return queryset.none()
-        if user.is_superuser:
-            return queryset
-
-        role_slug = get_user_role_slug(user)
-        if role_slug in self.global_scope_role_slugs:
+        if self.has_global_row_scope():
             return queryset
 
         if not self.user_scope_fields:
             return queryset.none()
 
+        if self.project_scope_fields and self.get_row_scope_strategy() == ROW_SCOPE_STRATEGY_ACCESS_INDEX:
+            row_scope, needs_distinct = self._build_indexed_row_scope(queryset, user)
+            queryset = queryset.filter(row_scope)
+            return queryset.distinct() if needs_distinct else queryset
+
         row_scope = Q()
         for lookup in self.user_scope_fields:
             row_scope |= Q(**{lookup: user})
@@ -1,6 +1,13 @@
 ﻿from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        autodiscover_modules("jobs")
+        autodiscover_modules("search_indexes")
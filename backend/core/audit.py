@@ -45,13 +45,13 @@ class AuditLogMixin:
                 }
         return changes
 
-    def log_action(self, *, action: str, instance, changes=None):
+    def _audit_entry(self, *, action: str, instance, changes=None) -> AuditLog | None:
         request = getattr(self, "request", None)
         user = getattr(request, "user", None) if request else None
         if not user or not user.is_authenticated:
-            return
+            return None
 
-        AuditLog.objects.create(
+        return AuditLog(
             user=user,
             action=action,
             model_name=instance.__class__.__name__,
@@ -61,6 +61,19 @@ class AuditLogMixin:
             user_agent=request.META.get("HTTP_USER_AGENT", "") if request else "",
         )
 
+    def log_action(self, *, action: str, instance, changes=None):
+        entry = self._audit_entry(action=action, instance=instance, changes=changes)
+        if entry is not None:
+            entry.save()
+
+    def log_bulk_action(self, *, action: str, instances, changes=None):
+        changes = changes or [None] * len(instances)
+        entries = [
+            self._audit_entry(action=action, instance=instance, changes=instance_changes)
+            for instance, instance_changes in zip(instances, changes)
+        ]
+        AuditLog.objects.bulk_create([entry for entry in entries if entry is not None])
+
     def perform_create(self, serializer):
         instance = serializer.save()
         self.log_action(action="create", instance=instance, changes=serializer.validated_data)
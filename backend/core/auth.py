@@ -1,36 +1,71 @@
 from __future__ import annotations
 
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from .authentication import AUTH_VERSION_CLAIM
 
-class RoleAwareTokenObtainPairSerializer(TokenObtainPairSerializer):
-    @staticmethod
-    def _build_permission_claims(user) -> list[str]:
-        # Keep JWT size bounded for cookie storage:
-        # - superusers get a compact wildcard claim
-        # - other users only get explicitly assigned permissions
-        if user.is_superuser:
-            return ["full_access"]
-        explicit_permissions = sorted(
-            set(user.get_user_permissions()) | set(user.get_group_permissions())
+
+def _build_permission_claims(user) -> list[str]:
+    # Keep JWT size bounded for cookie storage:
+    # - superusers get a compact wildcard claim
+    # - other users only get explicitly assigned permissions
+    if user.is_superuser:
+        return ["full_access"]
+    explicit_permissions = sorted(
+        set(user.get_user_permissions()) | set(user.get_group_permissions())
+    )
+    return explicit_permissions
+
+
+def apply_role_claims(token, user):
+    role = getattr(user, "role", None)
+    is_customer = getattr(user, "is_customer", False)
+    token["username"] = user.get_username()
+    token["role_id"] = getattr(role, "id", None)
+    token["role_name"] = getattr(role, "name", None) or ("Customer" if is_customer else None)
+    token["role_slug"] = getattr(role, "slug", None) or ("customer" if is_customer else None)
+    token["permissions"] = _build_permission_claims(user)
+    token["is_superuser"] = user.is_superuser
+    token["is_staff"] = user.is_staff
+    token["is_customer"] = is_customer
+    token[AUTH_VERSION_CLAIM] = getattr(user, "auth_version", 0)
+    return token
+
+
+class RoleAwareRefreshToken(RefreshToken):
+    @property
+    def access_token(self):
+        access = super().access_token
+        user = (
+            get_user_model()
+            .objects.select_related("role")
+            .filter(**{api_settings.USER_ID_FIELD: self.payload.get(api_settings.USER_ID_CLAIM)})
+            .first()
         )
-        return explicit_permissions
+        if user is not None:
+            apply_role_claims(access, user)
+        return access
+
+
+class RoleAwareTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleAwareRefreshToken
 
     @classmethod
     def get_token(cls, user):
-        token = super().get_token(user)
+        return apply_role_claims(super().get_token(user), user)
 
-        role = getattr(user, "role", None)
-        is_customer = getattr(user, "is_customer", False)
-        token["username"] = user.get_username()
-        token["role_id"] = getattr(role, "id", None)
-        token["role_name"] = getattr(role, "name", None) or ("Customer" if is_customer else None)
-        token["role_slug"] = getattr(role, "slug", None) or ("customer" if is_customer else None)
-        token["permissions"] = cls._build_permission_claims(user)
 
-        return token
+class RoleAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleAwareRefreshToken
 
 
 class RoleAwareTokenObtainPairView(TokenObtainPairView):
     serializer_class = RoleAwareTokenObtainPairSerializer
+
+
+class RoleAwareTokenRefreshView(TokenRefreshView):
+    serializer_class = RoleAwareTokenRefreshSerializer
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+AUTH_VERSION_CLAIM = "auth_version"
+AUTH_VERSION_CACHE_KEY = "core:auth-version:{user_id}"
+
+
+def get_user_auth_version(user_id) -> int | None:
+    cache_key = AUTH_VERSION_CACHE_KEY.format(user_id=user_id)
+    auth_version = cache.get(cache_key)
+    if auth_version is None:
+        auth_version = (
+            get_user_model()
+            .objects.filter(**{api_settings.USER_ID_FIELD: user_id}, is_active=True)
+            .values_list("auth_version", flat=True)
+            .first()
+        )
+        if auth_version is not None:
+            cache.set(cache_key, auth_version, settings.AUTH_VERSION_CACHE_SECONDS)
+    return auth_version
+
+
+def forget_user_auth_version(*user_ids):
+    cache.delete_many([AUTH_VERSION_CACHE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+
+class RoleClaimsUser(SimpleLazyObject):
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, validated_token, loader):
+        super().__init__(loader)
+        self.__dict__["role_claims"] = validated_token
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def id(self):
+        return self.role_claims[api_settings.USER_ID_CLAIM]
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def is_superuser(self) -> bool:
+        return bool(self.role_claims.get("is_superuser", False))
+
+    @property
+    def is_staff(self) -> bool:
+        return bool(self.role_claims.get("is_staff", False))
+
+    @property
+    def is_customer(self) -> bool:
+        return bool(self.role_claims.get("is_customer", False))
+
+
+class RoleClaimJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_ROLE_CLAIMS or AUTH_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as exc:
+            raise InvalidToken("Token contained no recognizable user identification") from exc
+
+        auth_version = get_user_auth_version(user_id)
+        if auth_version is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if validated_token[AUTH_VERSION_CLAIM] != auth_version:
+            raise AuthenticationFailed("Role claims are outdated, refresh the token.", code="token_outdated")
+
+        return RoleClaimsUser(validated_token, partial(super().get_user, validated_token))
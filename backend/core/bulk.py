@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.audit import AuditLogMixin
+
+
+class BulkCreateListSerializer(serializers.ListSerializer):
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        prepare = getattr(self.child, "prepare_bulk_create", None)
+        if prepare is not None:
+            validated_data = prepare(validated_data)
+        return bulk_create_with_pks(model, [model(**attrs) for attrs in validated_data])
+
+
+def bulk_create_with_pks(model, objs, *, batch_size: int | None = None):
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # Audit rows and the response need primary keys, which this backend cannot return from a bulk insert.
+        for obj in objs:
+            obj.save()
+        return objs
+    return model._default_manager.bulk_create(objs, batch_size=batch_size or settings.BULK_CREATE_BATCH_SIZE)
+
+
+def bulk_upsert(model, objs, *, unique_fields: list[str], update_fields: list[str], batch_size: int | None = None):
+    conflict_options = {"update_conflicts": True, "update_fields": update_fields}
+    # MySQL's ON DUPLICATE KEY UPDATE matches any unique key and rejects an explicit conflict target.
+    if connection.features.supports_update_conflicts_with_target:
+        conflict_options["unique_fields"] = unique_fields
+    return model._default_manager.bulk_create(objs, batch_size=batch_size or settings.BULK_CREATE_BATCH_SIZE, **conflict_options)
+
+
+def indexed_item_errors(errors) -> dict[int, dict]:
+    return {index: item_errors for index, item_errors in enumerate(errors) if item_errors}
+
+
+def validate_bulk_payload(serializer_class, data, *, context: dict):
+    if not isinstance(data, list):
+        raise ValidationError({"items": "Expected a list of items."})
+    if not data:
+        raise ValidationError({"items": "At least one item is required."})
+    if len(data) > settings.BULK_CREATE_MAX_ITEMS:
+        raise ValidationError({"items": f"At most {settings.BULK_CREATE_MAX_ITEMS} items can be created per request."})
+    serializer = serializer_class(data=data, many=True, context=context)
+    if not serializer.is_valid():
+        raise ValidationError({"items": indexed_item_errors(serializer.errors)})
+    return serializer
+
+
+def run_bulk_create(create):
+    try:
+        with transaction.atomic():
+            return create()
+    except IntegrityError:
+        raise ValidationError({"items": "Items conflict with existing records or with each other."})
+
+
+class BulkCreateMixin:
+    def get_bulk_save_kwargs(self) -> dict:
+        return {}
+
+    def perform_bulk_create(self, serializer):
+        instances = serializer.save(**self.get_bulk_save_kwargs())
+        if isinstance(self, AuditLogMixin):
+            self.log_bulk_action(action="create", instances=instances, changes=serializer.validated_data)
+        return instances
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        serializer = validate_bulk_payload(self.get_serializer_class(), request.data, context=self.get_serializer_context())
+        instances = run_bulk_create(lambda: self.perform_bulk_create(serializer))
+        created = self.queryset.in_bulk([instance.pk for instance in instances])
+        response_serializer = self.get_serializer([created[instance.pk] for instance in instances], many=True)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import gzip
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+_ACCEPT_ENCODING_RE = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+def accepted_encodings(header: str) -> dict[str, float]:
+    encodings = {}
+    for part in header.split(","):
+        match = _ACCEPT_ENCODING_RE.fullmatch(part)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) is not None else 1.0
+        except ValueError:
+            continue
+        encodings[match.group(1).lower()] = quality
+    return encodings
+
+
+def choose_encoding(header: str) -> str | None:
+    encodings = accepted_encodings(header)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_quality = None, 0.0
+    for candidate in candidates:
+        quality = encodings.get(candidate, encodings.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = candidate, quality
+    return best
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(content, quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=settings.RESPONSE_COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        patch_vary_headers(response, ("Accept-Encoding",))
+        content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+        # HTML pages carry CSRF tokens; leaving them uncompressed sidesteps BREACH-style attacks.
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or content_type not in settings.RESPONSE_COMPRESSION_CONTENT_TYPES
+            or len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES
+        ):
+            return response
+
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # The representation changed, so a strong validator no longer applies byte-for-byte.
+            response.headers["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, Max
+from django.db.models.signals import post_delete
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+_tracked_models: set[str] = set()
+
+
+class NotModified(Exception):
+    pass
+
+
+def _bump_delete_version(sender, **kwargs):
+    from core.models import ModelVersion
+
+    label = sender._meta.label_lower
+    counters = ModelVersion.objects.filter(label=label)
+    if not counters.update(deletes=F("deletes") + 1, updated_at=timezone.now()):
+        ModelVersion.objects.bulk_create([ModelVersion(label=label)], ignore_conflicts=True)
+        counters.update(deletes=F("deletes") + 1, updated_at=timezone.now())
+
+
+def track_model_versions(*models) -> None:
+    # Deletes are counted per model so that ETags never need a COUNT over the table.
+    for model in models:
+        label = model._meta.label_lower
+        _tracked_models.add(label)
+        post_delete.connect(_bump_delete_version, sender=model, dispatch_uid=f"core_conditional_deletes_{label}")
+
+
+def model_versions(models) -> list[str]:
+    from core.models import ModelVersion
+
+    labels = [model._meta.label_lower for model in models]
+    untracked = [label for label in labels if label not in _tracked_models]
+    if untracked:
+        raise ImproperlyConfigured(f"Register {', '.join(untracked)} with track_model_versions() before using it for ETags.")
+    deletes = dict(ModelVersion.objects.filter(label__in=labels).values_list("label", "deletes"))
+    versions = []
+    for model, label in zip(models, labels):
+        # Max(updated_at) is served by an index on updated_at; deletes come from the counter.
+        last_change = model._default_manager.aggregate(last_change=Max("updated_at"))["last_change"]
+        versions.append(f"{label}:{deletes.get(label, 0)}:{last_change.isoformat() if last_change else ''}")
+    return versions
+
+
+def compute_etag(request, scope: str, models) -> str:
+    parts = [
+        scope,
+        request.get_full_path(),
+        getattr(request, "accepted_media_type", "") or "",
+        str(getattr(request.user, "pk", "") or ""),
+        timezone.localdate().isoformat(),
+        *model_versions(models),
+    ]
+    return quote_etag(hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest())
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request, etag: str) -> bool:
+    candidates = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+    if "*" in candidates:
+        return True
+    return _strip_weak(etag) in {_strip_weak(candidate) for candidate in candidates}
+
+
+class ConditionalGetMixin:
+    conditional_models: dict[str, tuple] = {}
+
+    def get_conditional_models(self) -> tuple:
+        models = self.conditional_models.get(self.action)
+        if models is None:
+            models = self.conditional_models.get("*", ())
+        return tuple(models)
+
+    def initial(self, request, *args, **kwargs):
+        self._etag = None
+        super().initial(request, *args, **kwargs)
+        models = self.get_conditional_models()
+        if request.method not in CONDITIONAL_METHODS or not models:
+            return
+        self._etag = compute_etag(request, f"{type(self).__module__}.{type(self).__name__}:{self.action}", models)
+        if etag_matches(request, self._etag):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "_etag", None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            patch_vary_headers(response, ("Authorization",))
+        return response
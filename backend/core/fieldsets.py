@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+TRUTHY_QUERY_VALUES = {"1", "true", "yes"}
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+COMPACT_QUERY_PARAM = "compact"
+
+
+def query_flag(request, name: str) -> bool:
+    return request.query_params.get(name, "").lower() in TRUTHY_QUERY_VALUES
+
+
+def parse_field_list(value: str | None) -> list[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class SparseFieldsetSerializerMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in ("GET", "HEAD"):
+            return
+
+        expandable_fields = getattr(self.Meta, "expandable_fields", {})
+        for field_name in parse_field_list(request.query_params.get(EXPAND_QUERY_PARAM)):
+            if field_name in expandable_fields and field_name not in self.fields:
+                serializer_class, serializer_kwargs = expandable_fields[field_name]
+                self.fields[field_name] = serializer_class(**serializer_kwargs)
+
+        requested = set(parse_field_list(request.query_params.get(FIELDS_QUERY_PARAM)))
+        if requested:
+            for field_name in list(self.fields):
+                if field_name != "id" and field_name not in requested:
+                    self.fields.pop(field_name)
+
+
+class QueryPlan:
+    def __init__(self):
+        self.select_related: set[str] = set()
+        self.prefetch_related: set[str] = set()
+        self.only: set[str] | None = set()
+
+    def give_up_only(self):
+        self.only = None
+
+
+def build_query_plan(serializer, model) -> QueryPlan:
+    plan = QueryPlan()
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == "*":
+            plan.give_up_only()
+            continue
+        _plan_field(plan, field, model)
+    return plan
+
+
+def _plan_field(plan: QueryPlan, field, model):
+    current_model = model
+    path: list[str] = []
+    for index, attr in enumerate(field.source_attrs):
+        is_last = index == len(field.source_attrs) - 1
+        lookup = "__".join([*path, attr])
+        try:
+            model_field = current_model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            plan.give_up_only()
+            return
+
+        if model_field.many_to_many or model_field.one_to_many:
+            plan.prefetch_related.add(lookup)
+            if is_last and isinstance(field, ListSerializer):
+                nested = build_query_plan(field.child, model_field.related_model)
+                plan.prefetch_related.update(
+                    f"{lookup}__{nested_lookup}" for nested_lookup in nested.select_related | nested.prefetch_related
+                )
+            return
+        if not model_field.concrete:
+            plan.give_up_only()
+            return
+        if plan.only is not None:
+            plan.only.add(lookup)
+        if not model_field.is_relation:
+            return
+        if is_last:
+            if isinstance(field, BaseSerializer):
+                nested = build_query_plan(field, model_field.related_model)
+                plan.select_related.add(lookup)
+                plan.select_related.update(f"{lookup}__{nested_lookup}" for nested_lookup in nested.select_related)
+                plan.prefetch_related.update(f"{lookup}__{nested_lookup}" for nested_lookup in nested.prefetch_related)
+                if nested.only is None:
+                    plan.give_up_only()
+                elif plan.only is not None:
+                    plan.only.update(f"{lookup}__{nested_lookup}" for nested_lookup in nested.only)
+            return
+        plan.select_related.add(lookup)
+        current_model = model_field.related_model
+        path.append(attr)
+
+
+def apply_query_plan(queryset, plan: QueryPlan):
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if plan.select_related:
+        queryset = queryset.select_related(*sorted(plan.select_related))
+    if plan.prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(plan.prefetch_related))
+    return queryset.only(*sorted(plan.only))
+
+
+class SparseFieldsetViewMixin:
+    list_serializer_class = None
+
+    def use_compact_list(self) -> bool:
+        return self.action == "list" and self.list_serializer_class is not None and query_flag(self.request, COMPACT_QUERY_PARAM)
+
+    def get_serializer_class(self):
+        if self.use_compact_list():
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+        query_params = self.request.query_params
+        if not (self.use_compact_list() or FIELDS_QUERY_PARAM in query_params or EXPAND_QUERY_PARAM in query_params):
+            return queryset
+        plan = build_query_plan(self.get_serializer(), queryset.model)
+        if plan.only is None:
+            # Computed fields may rely on the view's own select/prefetch setup.
+            return queryset
+        return apply_query_plan(queryset, plan)
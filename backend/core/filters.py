@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.conf import settings
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+from core.services.search import full_text_search
+
+
+class FullTextSearchFilter(SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not getattr(view, "search_fields", None) or not settings.FULL_TEXT_SEARCH_ENABLED:
+            return super().filter_queryset(request, queryset, view)
+
+        explicit_ordering = request.query_params.get(api_settings.ORDERING_PARAM)
+        results = full_text_search(queryset, " ".join(search_terms), rank=not explicit_ordering)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
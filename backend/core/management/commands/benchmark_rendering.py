@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.compression import brotli, compress
+from core.renderers import FastJSONRenderer, orjson
+from finance.models import JournalEntry
+from finance.services import reporting as finance_reporting
+
+
+class Command(BaseCommand):
+    help = "Compare JSON renderers and response compression on the largest finance reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--start-date", dest="start_date", default=None)
+        parser.add_argument("--end-date", dest="end_date", default=None)
+        parser.add_argument("--output", default="", help="Write JSON results to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        bounds = JournalEntry.objects.aggregate(first=Min("entry_date"), last=Max("entry_date"))
+        today = timezone.localdate()
+        start_date = self._parse(options["start_date"]) or bounds["first"] or today.replace(month=1, day=1)
+        end_date = self._parse(options["end_date"]) or bounds["last"] or today
+        iterations = max(options["iterations"], 1)
+
+        reports = {
+            "finance.general_ledger": finance_reporting.build_general_ledger(start_date=start_date, end_date=end_date),
+            "finance.general_journal": finance_reporting.build_general_journal(start_date=start_date, end_date=end_date),
+            "finance.trial_balance": finance_reporting.build_trial_balance(start_date=start_date, end_date=end_date),
+        }
+        renderers = {"drf_json": JSONRenderer(), "fast_json": FastJSONRenderer()}
+
+        results = []
+        for name, data in reports.items():
+            result = {"name": name}
+            for renderer_name, renderer in renderers.items():
+                samples = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    content = renderer.render(data)
+                    samples.append((time.perf_counter() - started) * 1000)
+                result[renderer_name] = {"median_ms": round(statistics.median(samples), 3), "bytes": len(content)}
+
+            content = FastJSONRenderer().render(data)
+            encodings = ["gzip", "br"] if brotli is not None else ["gzip"]
+            for encoding in encodings:
+                started = time.perf_counter()
+                compressed = compress(content, encoding)
+                result[encoding] = {
+                    "compress_ms": round((time.perf_counter() - started) * 1000, 3),
+                    "bytes": len(compressed),
+                    "ratio": round(len(compressed) / len(content), 4) if content else 0,
+                }
+            results.append(result)
+
+        payload = {
+            "generated_at": timezone.now().isoformat(),
+            "environment": {"orjson": orjson is not None, "brotli": brotli is not None},
+            "parameters": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "iterations": iterations,
+            },
+            "results": results,
+        }
+        output = json.dumps(payload, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} rendering results to {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    def _parse(self, value):
+        return datetime.strptime(value, "%Y-%m-%d").date() if value else None
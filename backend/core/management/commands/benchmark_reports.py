@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from erp_v2 import services as erp_v2_services
+from erp_v2.models import GLEntry, GLEntryLine, InventoryLocation, MasterCustomer, MasterItem, SalesInvoice, SalesInvoiceLine
+from finance.models import Account, JournalEntry, JournalLine, PostingRule, PostingRuleLine
+from finance.services import reporting as finance_reporting
+from finance.services.posting_engine import PostingEngine
+from projects.models import Project, ProjectCostRollup
+from projects.services import portfolio_cost_rows, portfolio_cost_totals
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _run_in_rollback(callback):
+    try:
+        with transaction.atomic():
+            callback()
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+class Command(BaseCommand):
+    help = "Time report builders and posting services and emit JSON results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=3)
+        parser.add_argument("--start-date", dest="start_date", default=None)
+        parser.add_argument("--end-date", dest="end_date", default=None)
+        parser.add_argument("--project-id", dest="project_id", type=int, default=None)
+        parser.add_argument("--only", default="", help="Comma separated benchmark names to run.")
+        parser.add_argument("--output", default="", help="Write JSON results to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        start_date, end_date = self._resolve_dates(options)
+        project_id = options["project_id"]
+        benchmarks = {
+            "finance.trial_balance": lambda: finance_reporting.build_trial_balance(
+                start_date=start_date, end_date=end_date, project_id=project_id
+            ),
+            "finance.general_journal": lambda: finance_reporting.build_general_journal(
+                start_date=start_date, end_date=end_date, project_id=project_id
+            ),
+            "finance.general_ledger": lambda: finance_reporting.build_general_ledger(
+                start_date=start_date, end_date=end_date, project_id=project_id
+            ),
+            "finance.balance_sheet": lambda: finance_reporting.build_balance_sheet(
+                as_of_date=end_date, project_id=project_id
+            ),
+            "finance.income_statement": lambda: finance_reporting.build_income_statement(
+                start_date=start_date, end_date=end_date, project_id=project_id
+            ),
+            "erp_v2.trial_balance": lambda: erp_v2_services.build_trial_balance(start_date=start_date, end_date=end_date),
+            "erp_v2.income_statement": lambda: erp_v2_services.build_income_statement(
+                start_date=start_date, end_date=end_date
+            ),
+            "erp_v2.balance_sheet": lambda: erp_v2_services.build_balance_sheet(as_of_date=end_date),
+            "erp_v2.ar_aging": lambda: erp_v2_services.build_ar_aging(as_of_date=end_date),
+            "erp_v2.ap_aging": lambda: erp_v2_services.build_ap_aging(as_of_date=end_date),
+            "erp_v2.profitability_customers": lambda: erp_v2_services.build_profitability(
+                dimension="customers", start_date=start_date, end_date=end_date
+            ),
+            "erp_v2.profitability_items": lambda: erp_v2_services.build_profitability(
+                dimension="items", start_date=start_date, end_date=end_date
+            ),
+            "erp_v2.profitability_cost_centers": lambda: erp_v2_services.build_profitability(
+                dimension="cost-centers", start_date=start_date, end_date=end_date
+            ),
+            "erp_v2.kpis": erp_v2_services.build_kpis,
+            "projects.portfolio_costs": lambda: (
+                list(portfolio_cost_rows(Project.objects.all()).order_by("variance")),
+                portfolio_cost_totals(Project.objects.all()),
+            ),
+            "finance.post_from_operational_event": lambda: _run_in_rollback(self._post_operational_event),
+            "erp_v2.post_gl_entry": lambda: _run_in_rollback(self._post_gl_entry),
+            "erp_v2.auto_post_sales_invoice": lambda: _run_in_rollback(self._auto_post_sales_invoice),
+        }
+        selected = {name.strip() for name in options["only"].split(",") if name.strip()}
+
+        results = []
+        for name, benchmark in benchmarks.items():
+            if selected and name not in selected:
+                continue
+            results.append(self._time(name, benchmark, max(options["iterations"], 1)))
+
+        payload = {
+            "generated_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "parameters": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "project_id": project_id,
+                "iterations": max(options["iterations"], 1),
+            },
+            "volume": {
+                "journal_lines": JournalLine.objects.count(),
+                "gl_lines": GLEntryLine.objects.count(),
+                "sales_invoices": SalesInvoice.objects.count(),
+                "project_cost_rollups": ProjectCostRollup.objects.count(),
+            },
+            "results": results,
+        }
+        output = json.dumps(payload, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} benchmark results to {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    def _resolve_dates(self, options) -> tuple[date, date]:
+        bounds = JournalEntry.objects.aggregate(first=Min("entry_date"), last=Max("entry_date"))
+        today = timezone.localdate()
+        start_date = (
+            datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+            if options["start_date"]
+            else bounds["first"] or today.replace(month=1, day=1)
+        )
+        end_date = (
+            datetime.strptime(options["end_date"], "%Y-%m-%d").date() if options["end_date"] else bounds["last"] or today
+        )
+        return start_date, end_date
+
+    def _time(self, name: str, benchmark, iterations: int) -> dict:
+        samples = []
+        query_counts = []
+        error = ""
+        for _ in range(iterations):
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                try:
+                    benchmark()
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                    break
+                samples.append((time.perf_counter() - started) * 1000)
+            query_counts.append(counter.count)
+
+        result = {"name": name, "iterations": len(samples)}
+        if samples:
+            result.update(
+                {
+                    "median_ms": round(statistics.median(samples), 3),
+                    "min_ms": round(min(samples), 3),
+                    "max_ms": round(max(samples), 3),
+                    "queries": max(query_counts),
+                }
+            )
+        if error:
+            result["error"] = error
+        return result
+
+    def _benchmark_user(self):
+        user, _ = get_user_model().objects.get_or_create(username="benchmark-poster", defaults={"is_active": True})
+        return user
+
+    def _post_operational_event(self):
+        accounts = list(Account.objects.order_by("code")[:2])
+        if len(accounts) < 2:
+            raise ValueError("At least two finance accounts are required; run generate_load_data first.")
+        debit_account, credit_account = accounts
+        rule = PostingRule.objects.create(
+            name="Benchmark rule",
+            source_module="benchmark",
+            source_event="benchmark_event",
+        )
+        PostingRuleLine.objects.create(
+            posting_rule=rule, line_order=1, account=debit_account, side=PostingRuleLine.Side.DEBIT, amount_source="amount"
+        )
+        PostingRuleLine.objects.create(
+            posting_rule=rule, line_order=2, account=credit_account, side=PostingRuleLine.Side.CREDIT, amount_source="amount"
+        )
+        PostingEngine.post_from_operational_event(
+            source_module="benchmark",
+            source_event="benchmark_event",
+            source_object=SimpleNamespace(id=0, amount=Decimal("125.00"), currency=None, project=None),
+            entry_date=timezone.localdate(),
+            description="Benchmark posting",
+        )
+
+    def _post_gl_entry(self):
+        accounts = erp_v2_services.ensure_default_accounts()
+        entry = GLEntry.objects.create(
+            entry_number="BENCH-GL-000001",
+            entry_date=timezone.localdate(),
+            description="Benchmark entry",
+        )
+        GLEntryLine.objects.create(entry=entry, account=accounts["cash"], debit=Decimal("125.00"))
+        GLEntryLine.objects.create(entry=entry, account=accounts["sales"], credit=Decimal("125.00"))
+        erp_v2_services.post_gl_entry(entry=entry, posted_by=self._benchmark_user())
+
+    def _auto_post_sales_invoice(self):
+        customer = MasterCustomer.objects.create(code="BENCH-CUS", name="Benchmark Customer")
+        item = MasterItem.objects.create(sku="BENCH-ITEM", name="Benchmark Item", track_inventory=False)
+        location = InventoryLocation.objects.create(code="BENCH-LOC", name="Benchmark Location")
+        invoice = SalesInvoice.objects.create(
+            invoice_number="BENCH-SIN-000001",
+            customer=customer,
+            invoice_date=timezone.localdate(),
+        )
+        SalesInvoiceLine.objects.bulk_create(
+            [
+                SalesInvoiceLine(invoice=invoice, item=item, quantity=Decimal("2.000"), unit_price=Decimal("15.00"))
+                for _ in range(10)
+            ]
+        )
+        erp_v2_services.auto_post_sales_invoice(
+            invoice,
+            location=location,
+            posted_by=self._benchmark_user(),
+            enforce_maker_checker=False,
+        )
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+HEAVY_STARTUP_MODULES = ("openpyxl", "stripe", "google.auth", "google.oauth2")
+STARTUP_PROBE = "import sys, django; django.setup(); import config.urls; print(' '.join(sorted(sys.modules)))"
+
+
+def startup_environment() -> dict:
+    env = os.environ.copy()
+    env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    return env
+
+
+def loaded_heavy_modules(module_names) -> list[str]:
+    loaded = set(module_names)
+    return [name for name in HEAVY_STARTUP_MODULES if name in loaded]
+
+
+def probe_startup_modules() -> list[str]:
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE],
+        cwd=settings.BASE_DIR,
+        env=startup_environment(),
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip() or "Startup probe failed.")
+    return completed.stdout.split()
+
+
+def parse_importtime(output: str) -> list[dict]:
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name[1:]
+        modules.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip())) // 2,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Measure interpreter startup for `manage.py check` with -X importtime and list heavy modules loaded at startup"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=3)
+        parser.add_argument("--top", type=int, default=15)
+        parser.add_argument("--output", default="", help="Write JSON results to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        iterations = max(options["iterations"], 1)
+        samples = []
+        modules = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "manage.py", "check"],
+                cwd=settings.BASE_DIR,
+                env=startup_environment(),
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            samples.append((time.perf_counter() - started) * 1000)
+            if completed.returncode != 0:
+                raise CommandError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "manage.py check failed.")
+            modules = parse_importtime(completed.stderr)
+
+        # Only outermost imports; nested ones are already counted in their parent's cumulative time.
+        top_level = [module for module in modules if module["depth"] == 0]
+        top_level.sort(key=lambda module: module["cumulative_us"], reverse=True)
+
+        payload = {
+            "generated_at": timezone.now().isoformat(),
+            "parameters": {"iterations": iterations},
+            "wall_ms": {"median": round(statistics.median(samples), 3), "min": round(min(samples), 3)},
+            "imports_ms": round(sum(module["self_us"] for module in modules) / 1000, 3),
+            "heavy_modules_loaded": loaded_heavy_modules(module["module"] for module in modules),
+            "top_packages": [
+                {"module": module["module"], "cumulative_ms": round(module["cumulative_us"] / 1000, 3)}
+                for module in top_level[: options["top"]]
+            ],
+        }
+        output = json.dumps(payload, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                handle.write(output)
+            self.stdout.write(self.style.SUCCESS(f"Wrote startup benchmark to {options['output']}."))
+        else:
+            self.stdout.write(output)
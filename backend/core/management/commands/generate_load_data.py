@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Customer
+from erp_v2.models import CostCenter, GLAccount, GLEntry, GLEntryLine, MasterCustomer, MasterItem, SalesInvoice
+from finance.models import Account, Invoice, JournalEntry, JournalLine
+from projects.models import CostCode, Project, ProjectAccess, ProjectBudgetLine, ProjectCostRecord
+from projects.services import rebuild_project_cost_rollups
+
+LOAD_ACCOUNTS = [
+    ("1110", Account.AccountType.ASSET, Account.ReportGrouping.CURRENT_ASSET, "Cash"),
+    ("1120", Account.AccountType.ASSET, Account.ReportGrouping.CURRENT_ASSET, "Bank"),
+    ("1130", Account.AccountType.ASSET, Account.ReportGrouping.CURRENT_ASSET, "Accounts Receivable"),
+    ("1510", Account.AccountType.ASSET, Account.ReportGrouping.NON_CURRENT_ASSET, "Equipment"),
+    ("2110", Account.AccountType.LIABILITY, Account.ReportGrouping.CURRENT_LIABILITY, "Accounts Payable"),
+    ("2510", Account.AccountType.LIABILITY, Account.ReportGrouping.NON_CURRENT_LIABILITY, "Long Term Loan"),
+    ("3110", Account.AccountType.EQUITY, Account.ReportGrouping.EQUITY, "Capital"),
+    ("4110", Account.AccountType.REVENUE, Account.ReportGrouping.OPERATING_REVENUE, "Contract Revenue"),
+    ("4910", Account.AccountType.REVENUE, Account.ReportGrouping.OTHER_REVENUE, "Other Revenue"),
+    ("5110", Account.AccountType.EXPENSE, Account.ReportGrouping.OPERATING_EXPENSE, "Materials"),
+    ("5120", Account.AccountType.EXPENSE, Account.ReportGrouping.OPERATING_EXPENSE, "Labour"),
+    ("5910", Account.AccountType.EXPENSE, Account.ReportGrouping.OTHER_EXPENSE, "Finance Cost"),
+]
+
+LOAD_GL_ACCOUNTS = [
+    ("1100", GLAccount.AccountType.ASSET, "Accounts Receivable"),
+    ("1110", GLAccount.AccountType.ASSET, "Cash"),
+    ("1200", GLAccount.AccountType.ASSET, "Inventory"),
+    ("2100", GLAccount.AccountType.LIABILITY, "Accounts Payable"),
+    ("3100", GLAccount.AccountType.EQUITY, "Capital"),
+    ("4100", GLAccount.AccountType.REVENUE, "Sales"),
+    ("5100", GLAccount.AccountType.EXPENSE, "Cost of Goods Sold"),
+    ("5200", GLAccount.AccountType.EXPENSE, "Purchases"),
+]
+
+
+def _money(rng: random.Random, low: int, high: int) -> Decimal:
+    return Decimal(rng.randint(low * 100, high * 100)) / Decimal("100")
+
+
+def _ids_by_key(queryset, key_field: str, keys: list[str]) -> dict[str, int]:
+    return dict(queryset.filter(**{f"{key_field}__in": keys}).values_list(key_field, "id"))
+
+
+class Command(BaseCommand):
+    help = "Generate deterministic, high-volume data for report and posting benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="LD", help="Code prefix that namespaces the generated rows.")
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--customers", type=int, default=200)
+        parser.add_argument("--items", type=int, default=500)
+        parser.add_argument("--invoices", type=int, default=5000)
+        parser.add_argument("--journal-entries", dest="journal_entries", type=int, default=100000)
+        parser.add_argument("--gl-entries", dest="gl_entries", type=int, default=100000)
+        parser.add_argument("--lines-per-entry", dest="lines_per_entry", type=int, default=4)
+        parser.add_argument("--cost-codes-per-project", dest="cost_codes_per_project", type=int, default=10)
+        parser.add_argument("--start-date", dest="start_date", default="2024-01-01")
+        parser.add_argument("--days", type=int, default=730, help="Spread generated documents over this many days.")
+        parser.add_argument("--batch-size", dest="batch_size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.prefix = options["prefix"].upper()
+        self.batch_size = max(options["batch_size"], 1)
+        self.start_date = datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+        self.days = max(options["days"], 1)
+        self.lines_per_entry = max(options["lines_per_entry"] // 2 * 2, 2)
+
+        if Project.objects.filter(code__startswith=f"{self.prefix}-").exists():
+            raise CommandError(f"Load data with prefix {self.prefix!r} already exists; pass a different --prefix.")
+
+        self.user, _ = get_user_model().objects.get_or_create(
+            username=f"{self.prefix.lower()}-loadgen",
+            defaults={"is_active": True},
+        )
+        self.accounts = self._ensure_accounts()
+        self.gl_accounts = self._ensure_gl_accounts()
+
+        project_ids = self._generate_projects(options["projects"])
+        customer_ids = self._generate_customers(options["customers"])
+        master_customer_ids, item_ids, cost_center_ids = self._generate_erp_masters(
+            options["customers"], options["items"]
+        )
+        self._generate_invoices(options["invoices"], project_ids, customer_ids)
+        self._generate_sales_invoices(options["invoices"], master_customer_ids, cost_center_ids)
+        journal_line_count = self._generate_journal_entries(options["journal_entries"], project_ids)
+        gl_line_count = self._generate_gl_entries(options["gl_entries"], master_customer_ids, item_ids, cost_center_ids)
+        self._generate_project_costs(project_ids, options["cost_codes_per_project"])
+        # bulk_create skips the post_save hooks that keep the search entries current.
+        call_command("rebuild_search_index", stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(project_ids)} projects, {len(customer_ids)} customers, {len(item_ids)} items, "
+                f"{options['invoices']} invoices, {journal_line_count} journal lines and {gl_line_count} GL lines."
+            )
+        )
+
+    def _random_date(self) -> date:
+        return self.start_date + timedelta(days=self.rng.randrange(self.days))
+
+    def _ensure_accounts(self) -> list[Account]:
+        accounts = []
+        for code, account_type, report_group, name in LOAD_ACCOUNTS:
+            account, _ = Account.objects.get_or_create(
+                code=f"{self.prefix}{code}",
+                defaults={"name": f"{name} ({self.prefix})", "account_type": account_type, "report_group": report_group},
+            )
+            accounts.append(account)
+        return accounts
+
+    def _ensure_gl_accounts(self) -> list[GLAccount]:
+        gl_accounts = []
+        for code, account_type, name in LOAD_GL_ACCOUNTS:
+            gl_account, _ = GLAccount.objects.get_or_create(
+                code=f"{self.prefix}{code}",
+                defaults={"name": f"{name} ({self.prefix})", "account_type": account_type},
+            )
+            gl_accounts.append(gl_account)
+        return gl_accounts
+
+    @transaction.atomic
+    def _generate_projects(self, count: int) -> list[int]:
+        codes = [f"{self.prefix}-PRJ-{index:06d}" for index in range(count)]
+        Project.objects.bulk_create(
+            [
+                Project(
+                    code=code,
+                    name=f"Load Project {index}",
+                    client_name=f"Client {index % 37}",
+                    status=self.rng.choice(Project.Status.values),
+                    budget=_money(self.rng, 50_000, 5_000_000),
+                    contract_value=_money(self.rng, 60_000, 6_000_000),
+                    start_date=self._random_date(),
+                    created_by=self.user,
+                )
+                for index, code in enumerate(codes)
+            ],
+            batch_size=self.batch_size,
+        )
+        project_ids = list(_ids_by_key(Project.objects, "code", codes).values())
+        # bulk_create skips the post_save hook that maintains the access index.
+        ProjectAccess.objects.bulk_create(
+            [ProjectAccess(user=self.user, project_id=project_id) for project_id in project_ids],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        return sorted(project_ids)
+
+    @transaction.atomic
+    def _generate_project_costs(self, project_ids: list[int], per_project: int):
+        CostCode.objects.bulk_create(
+            [
+                CostCode(project_id=project_id, code=f"{self.prefix}-CC-{index:03d}", name=f"Cost Code {index}")
+                for project_id in project_ids
+                for index in range(per_project)
+            ],
+            batch_size=self.batch_size,
+        )
+        cost_codes = list(
+            CostCode.objects.filter(project_id__in=project_ids, code__startswith=f"{self.prefix}-CC-").values_list("project_id", "id")
+        )
+        budget_lines = []
+        cost_records = []
+        for project_id, cost_code_id in cost_codes:
+            budget = _money(self.rng, 5_000, 500_000)
+            budget_lines.append(
+                ProjectBudgetLine(project_id=project_id, cost_code_id=cost_code_id, baseline_amount=budget, revised_amount=budget)
+            )
+            for record_type, share in ((ProjectCostRecord.RecordType.COMMITMENT, 90), (ProjectCostRecord.RecordType.ACTUAL, 70)):
+                cost_records.append(
+                    ProjectCostRecord(
+                        project_id=project_id,
+                        cost_code_id=cost_code_id,
+                        record_type=record_type,
+                        amount=(budget * self.rng.randint(share - 40, share + 40) / 100).quantize(Decimal("0.01")),
+                        record_date=self._random_date(),
+                        source_module="loadgen",
+                        source_reference=f"{self.prefix}-{cost_code_id}",
+                        created_by=self.user,
+                    )
+                )
+        ProjectBudgetLine.objects.bulk_create(budget_lines, batch_size=self.batch_size)
+        ProjectCostRecord.objects.bulk_create(cost_records, batch_size=self.batch_size)
+        # bulk_create skips the signals that keep the cost rollups current.
+        rebuild_project_cost_rollups(project_ids)
+
+    @transaction.atomic
+    def _generate_customers(self, count: int) -> list[int]:
+        codes = [f"{self.prefix}-CUS-{index:06d}" for index in range(count)]
+        Customer.objects.bulk_create(
+            [Customer(code=code, name=f"Load Customer {index}") for index, code in enumerate(codes)],
+            batch_size=self.batch_size,
+        )
+        return sorted(_ids_by_key(Customer.objects, "code", codes).values())
+
+    @transaction.atomic
+    def _generate_erp_masters(self, customer_count: int, item_count: int) -> tuple[list[int], list[int], list[int]]:
+        customer_codes = [f"{self.prefix}-MC-{index:06d}" for index in range(customer_count)]
+        MasterCustomer.objects.bulk_create(
+            [MasterCustomer(code=code, name=f"Load Customer {index}") for index, code in enumerate(customer_codes)],
+            batch_size=self.batch_size,
+        )
+        skus = [f"{self.prefix}-ITM-{index:06d}" for index in range(item_count)]
+        items = []
+        for index, sku in enumerate(skus):
+            standard_cost = _money(self.rng, 1, 500)
+            items.append(
+                MasterItem(
+                    sku=sku,
+                    name=f"Load Item {index}",
+                    standard_cost=standard_cost,
+                    sales_price=standard_cost * Decimal("1.25"),
+                )
+            )
+        MasterItem.objects.bulk_create(items, batch_size=self.batch_size)
+        cost_center_codes = [f"{self.prefix}-CC-{index:03d}" for index in range(20)]
+        CostCenter.objects.bulk_create(
+            [CostCenter(code=code, name=f"Load Cost Center {index}") for index, code in enumerate(cost_center_codes)],
+            batch_size=self.batch_size,
+        )
+        return (
+            sorted(_ids_by_key(MasterCustomer.objects, "code", customer_codes).values()),
+            sorted(_ids_by_key(MasterItem.objects, "sku", skus).values()),
+            sorted(_ids_by_key(CostCenter.objects, "code", cost_center_codes).values()),
+        )
+
+    def _generate_invoices(self, count: int, project_ids: list[int], customer_ids: list[int]):
+        statuses = [
+            Invoice.InvoiceStatus.ISSUED,
+            Invoice.InvoiceStatus.PARTIALLY_PAID,
+            Invoice.InvoiceStatus.PAID,
+            Invoice.InvoiceStatus.DRAFT,
+        ]
+        for batch_start in range(0, count, self.batch_size):
+            invoices = []
+            for index in range(batch_start, min(batch_start + self.batch_size, count)):
+                issue_date = self._random_date()
+                subtotal = _money(self.rng, 100, 250_000)
+                tax_amount = (subtotal * Decimal("0.15")).quantize(Decimal("0.01"))
+                invoices.append(
+                    Invoice(
+                        invoice_number=f"{self.prefix}-INV-{index:08d}",
+                        invoice_type=Invoice.InvoiceType.CUSTOMER,
+                        status=self.rng.choice(statuses),
+                        project_id=self.rng.choice(project_ids) if project_ids else None,
+                        customer_id=self.rng.choice(customer_ids) if customer_ids else None,
+                        partner_name=f"Load Partner {index % 97}",
+                        issue_date=issue_date,
+                        due_date=issue_date + timedelta(days=30),
+                        subtotal=subtotal,
+                        tax_amount=tax_amount,
+                        total_amount=subtotal + tax_amount,
+                        created_by=self.user,
+                    )
+                )
+            with transaction.atomic():
+                Invoice.objects.bulk_create(invoices, batch_size=self.batch_size)
+
+    def _generate_sales_invoices(self, count: int, customer_ids: list[int], cost_center_ids: list[int]):
+        if not customer_ids:
+            return
+        statuses = [SalesInvoice.Status.POSTED, SalesInvoice.Status.PARTIALLY_PAID, SalesInvoice.Status.PAID]
+        for batch_start in range(0, count, self.batch_size):
+            invoices = []
+            for index in range(batch_start, min(batch_start + self.batch_size, count)):
+                invoice_date = self._random_date()
+                total_amount = _money(self.rng, 50, 100_000)
+                status = self.rng.choice(statuses)
+                if status == SalesInvoice.Status.PAID:
+                    paid_amount = total_amount
+                elif status == SalesInvoice.Status.PARTIALLY_PAID:
+                    paid_amount = (total_amount / 2).quantize(Decimal("0.01"))
+                else:
+                    paid_amount = Decimal("0.00")
+                invoices.append(
+                    SalesInvoice(
+                        invoice_number=f"{self.prefix}-SIN-{index:08d}",
+                        customer_id=self.rng.choice(customer_ids),
+                        cost_center_id=self.rng.choice(cost_center_ids) if cost_center_ids else None,
+                        invoice_date=invoice_date,
+                        due_date=invoice_date + timedelta(days=self.rng.choice([15, 30, 60])),
+                        subtotal=total_amount,
+                        total_amount=total_amount,
+                        paid_amount=paid_amount,
+                        status=status,
+                        created_by=self.user,
+                        posted_by=self.user,
+                        posted_at=timezone.now(),
+                    )
+                )
+            with transaction.atomic():
+                SalesInvoice.objects.bulk_create(invoices, batch_size=self.batch_size)
+
+    def _balanced_amounts(self) -> list[tuple[Decimal, Decimal]]:
+        sides = []
+        for _ in range(self.lines_per_entry // 2):
+            amount = _money(self.rng, 1, 50_000)
+            sides.extend([(amount, Decimal("0.00")), (Decimal("0.00"), amount)])
+        return sides
+
+    def _generate_journal_entries(self, count: int, project_ids: list[int]) -> int:
+        line_count = 0
+        for batch_start in range(0, count, self.batch_size):
+            entries = []
+            entry_lines: dict[str, list[JournalLine]] = {}
+            for index in range(batch_start, min(batch_start + self.batch_size, count)):
+                entry_number = f"{self.prefix}-JE-{index:09d}"
+                project_id = self.rng.choice(project_ids) if project_ids and self.rng.random() < 0.7 else None
+                entries.append(
+                    JournalEntry(
+                        entry_number=entry_number,
+                        entry_date=self._random_date(),
+                        description=f"Load entry {index}",
+                        status=JournalEntry.Status.POSTED if self.rng.random() < 0.95 else JournalEntry.Status.DRAFT,
+                        project_id=project_id,
+                        created_by=self.user,
+                    )
+                )
+                entry_lines[entry_number] = [
+                    JournalLine(
+                        account=self.rng.choice(self.accounts),
+                        description=f"Load line {index}",
+                        debit=debit,
+                        credit=credit,
+                        project_id=project_id,
+                    )
+                    for debit, credit in self._balanced_amounts()
+                ]
+            with transaction.atomic():
+                JournalEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+                entry_ids = _ids_by_key(JournalEntry.objects, "entry_number", list(entry_lines))
+                lines = []
+                for entry_number, entry_line_list in entry_lines.items():
+                    for line in entry_line_list:
+                        line.entry_id = entry_ids[entry_number]
+                        lines.append(line)
+                JournalLine.objects.bulk_create(lines, batch_size=self.batch_size)
+            line_count += len(lines)
+            self.stdout.write(f"Journal entries: {min(batch_start + self.batch_size, count)}/{count}")
+        return line_count
+
+    def _generate_gl_entries(
+        self,
+        count: int,
+        customer_ids: list[int],
+        item_ids: list[int],
+        cost_center_ids: list[int],
+    ) -> int:
+        line_count = 0
+        for batch_start in range(0, count, self.batch_size):
+            entries = []
+            entry_lines: dict[str, list[GLEntryLine]] = {}
+            for index in range(batch_start, min(batch_start + self.batch_size, count)):
+                entry_number = f"{self.prefix}-GL-{index:09d}"
+                entries.append(
+                    GLEntry(
+                        entry_number=entry_number,
+                        entry_date=self._random_date(),
+                        description=f"Load GL entry {index}",
+                        status=GLEntry.Status.POSTED,
+                        source_type="load_data",
+                        created_by=self.user,
+                        posted_by=self.user,
+                        posted_at=timezone.now(),
+                    )
+                )
+                entry_lines[entry_number] = [
+                    GLEntryLine(
+                        account=self.rng.choice(self.gl_accounts),
+                        customer_id=self.rng.choice(customer_ids) if customer_ids else None,
+                        item_id=self.rng.choice(item_ids) if item_ids else None,
+                        cost_center_id=self.rng.choice(cost_center_ids) if cost_center_ids else None,
+                        debit=debit,
+                        credit=credit,
+                    )
+                    for debit, credit in self._balanced_amounts()
+                ]
+            with transaction.atomic():
+                GLEntry.objects.bulk_create(entries, batch_size=self.batch_size)
+                entry_ids = _ids_by_key(GLEntry.objects, "entry_number", list(entry_lines))
+                lines = []
+                for entry_number, entry_line_list in entry_lines.items():
+                    for line in entry_line_list:
+                        line.entry_id = entry_ids[entry_number]
+                        lines.append(line)
+                GLEntryLine.objects.bulk_create(lines, batch_size=self.batch_size)
+            line_count += len(lines)
+            self.stdout.write(f"GL entries: {min(batch_start + self.batch_size, count)}/{count}")
+        return line_count
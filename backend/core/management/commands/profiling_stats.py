@@ -0,0 +1,40 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.profiling import PERCENTILES, load_dumped_profiles, summarize
+
+
+class Command(BaseCommand):
+    help = "Dump request profiling statistics flushed by running workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dump-dir", dest="dump_dir", default=settings.REQUEST_PROFILING_DUMP_DIR)
+        parser.add_argument("--limit", type=int, default=25, help="Number of views to print, slowest total time first.")
+        parser.add_argument("--json", action="store_true", help="Emit the full summary as JSON.")
+        parser.add_argument("--reset", action="store_true", help="Delete dumped statistics after printing.")
+
+    def handle(self, *args, **options):
+        dump_dir = Path(options["dump_dir"])
+        summary = summarize(load_dumped_profiles(dump_dir)) if dump_dir.is_dir() else {}
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+        elif not summary:
+            self.stdout.write(self.style.WARNING(f"No profiling dumps found in {dump_dir}."))
+        else:
+            for view_key, stats in list(summary.items())[: options["limit"]]:
+                latency = " ".join(f"p{percentile}={stats[f'p{percentile}_ms']}ms" for percentile in PERCENTILES)
+                self.stdout.write(
+                    f"{view_key}: requests={stats['requests']} {latency} "
+                    f"queries={stats['avg_queries']} (max {stats['max_queries']}) db={stats['avg_query_ms']}ms"
+                )
+                for query in stats["slow_queries"]:
+                    origin = query["origin"][-1] if query["origin"] else "?"
+                    self.stdout.write(f"    {query['duration_ms']}ms {origin}: {query['sql'][:120]}")
+
+        if options["reset"] and dump_dir.is_dir():
+            for dump_file in dump_dir.glob("profile-*.json"):
+                dump_file.unlink()
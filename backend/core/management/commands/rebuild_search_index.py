@@ -0,0 +1,29 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.services.search import rebuild_search_index, registered_search_indexes
+
+
+class Command(BaseCommand):
+    help = "Rebuild full-text search entries for registered models"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", dest="models", action="append", help="app_label.ModelName to rebuild (repeatable).")
+
+    def handle(self, *args, **options):
+        indexed_models = [index.model for index in registered_search_indexes()]
+        if options["models"]:
+            try:
+                selected = [apps.get_model(label) for label in options["models"]]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc))
+            unknown = [model._meta.label for model in selected if model not in indexed_models]
+            if unknown:
+                raise CommandError(f"Not registered for search: {', '.join(unknown)}")
+            indexed_models = selected
+
+        for model in indexed_models:
+            with transaction.atomic():
+                indexed = rebuild_search_index(model)
+            self.stdout.write(f"{model._meta.label}: {indexed} entries")
@@ -0,0 +1,88 @@
+import multiprocessing
+import signal
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _install_stop_handlers(stop_event):
+    def request_stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+
+def _worker_process(index: int, stop_event, poll_interval: float, names: list[str] | None, drain: bool):
+    # Under spawn/forkserver the child re-imports this module, so Django must be set up
+    # before anything touches the models.
+    import django
+
+    django.setup()
+    from core.services.jobs import default_worker_id, run_worker
+
+    _install_stop_handlers(stop_event)
+    run_worker(
+        worker_id=f"{default_worker_id()}:{index}",
+        poll_interval=poll_interval,
+        names=names,
+        drain=drain,
+        should_stop=stop_event.is_set,
+    )
+
+
+class Command(BaseCommand):
+    help = "Run background job workers backed by the core Job table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=1.0)
+        parser.add_argument("--job", dest="names", action="append", help="Only run jobs with this name (repeatable).")
+        parser.add_argument("--drain", action="store_true", help="Exit once no runnable job is left.")
+        parser.add_argument(
+            "--stale-after",
+            dest="stale_after",
+            type=int,
+            default=0,
+            help="Requeue running jobs without a heartbeat for this many seconds (crashed workers); fail those out of attempts.",
+        )
+
+    def handle(self, *args, **options):
+        from core.services.jobs import requeue_stale_jobs, run_worker
+
+        if options["stale_after"]:
+            stale = requeue_stale_jobs(timedelta(seconds=options["stale_after"]))
+            if stale["requeued"] or stale["failed"]:
+                self.stdout.write(
+                    self.style.WARNING(f"Requeued {stale['requeued']} stale jobs and failed {stale['failed']} out of attempts.")
+                )
+
+        worker_count = max(options["workers"], 1)
+        context = multiprocessing.get_context()
+        stop_event = context.Event()
+        _install_stop_handlers(stop_event)
+
+        if worker_count == 1:
+            processed = run_worker(
+                poll_interval=options["poll_interval"],
+                names=options["names"],
+                drain=options["drain"],
+                should_stop=stop_event.is_set,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} jobs."))
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        worker_args = (stop_event, options["poll_interval"], options["names"], options["drain"])
+        processes = [
+            context.Process(target=_worker_process, args=(index, *worker_args), daemon=False)
+            for index in range(worker_count)
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {worker_count} job workers.")
+        for process in processes:
+            process.join()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped."))
@@ -0,0 +1,84 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FULL_TEXT_INDEX_SQL = {
+    "postgresql": (
+        [
+            "CREATE INDEX core_searchentry_body_tsv ON core_searchentry USING GIN (to_tsvector('simple', body))",
+        ],
+        [
+            "DROP INDEX IF EXISTS core_searchentry_body_tsv",
+        ],
+    ),
+    "sqlite": (
+        [
+            "CREATE VIRTUAL TABLE core_searchentry_fts USING fts5("
+            "body, content='core_searchentry', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            "CREATE TRIGGER core_searchentry_fts_ai AFTER INSERT ON core_searchentry BEGIN "
+            "INSERT INTO core_searchentry_fts(rowid, body) VALUES (new.id, new.body); END",
+            "CREATE TRIGGER core_searchentry_fts_ad AFTER DELETE ON core_searchentry BEGIN "
+            "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, body) VALUES ('delete', old.id, old.body); END",
+            "CREATE TRIGGER core_searchentry_fts_au AFTER UPDATE ON core_searchentry BEGIN "
+            "INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, body) VALUES ('delete', old.id, old.body); "
+            "INSERT INTO core_searchentry_fts(rowid, body) VALUES (new.id, new.body); END",
+        ],
+        [
+            "DROP TRIGGER IF EXISTS core_searchentry_fts_au",
+            "DROP TRIGGER IF EXISTS core_searchentry_fts_ad",
+            "DROP TRIGGER IF EXISTS core_searchentry_fts_ai",
+            "DROP TABLE IF EXISTS core_searchentry_fts",
+        ],
+    ),
+    "mysql": (
+        [
+            "CREATE FULLTEXT INDEX core_searchentry_body_ft ON core_searchentry (body)",
+        ],
+        [
+            "DROP INDEX core_searchentry_body_ft ON core_searchentry",
+        ],
+    ),
+}
+
+
+def _run_full_text_sql(schema_editor, position):
+    statements = FULL_TEXT_INDEX_SQL.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for statement in statements[position]:
+        schema_editor.execute(statement)
+
+
+def create_full_text_index(apps, schema_editor):
+    _run_full_text_sql(schema_editor, 0)
+
+
+def drop_full_text_index(apps, schema_editor):
+    _run_full_text_sql(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0005_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('body', models.TextField(blank=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='core_search_entry_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-19 12:10
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+# Mirrors the search_indexes registrations at the time the index was introduced.
+SEARCH_INDEX_FIELDS = {
+    ("core", "Document"): ["name", "notes"],
+    ("finance", "JournalEntry"): ["entry_number", "description", "project__code", "source_module", "source_event"],
+    ("finance", "Invoice"): ["invoice_number", "partner_name", "project__code", "cost_code__code"],
+    ("erp_v2", "SalesInvoice"): ["invoice_number", "customer__name"],
+}
+
+
+def _build_body(instance, fields) -> str:
+    values = []
+    for path in fields:
+        value = instance
+        for attr in path.split("__"):
+            value = getattr(value, attr, None)
+            if value is None:
+                break
+        if value not in (None, ""):
+            values.append(str(value))
+    return " ".join(values)
+
+
+def backfill_search_entries(apps, schema_editor):
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    SearchEntry = apps.get_model("core", "SearchEntry")
+    for (app_label, model_name), fields in SEARCH_INDEX_FIELDS.items():
+        model = apps.get_model(app_label, model_name)
+        if not model.objects.exists():
+            continue
+        content_type, _ = ContentType.objects.get_or_create(app_label=app_label, model=model_name.lower())
+        SearchEntry.objects.filter(content_type=content_type).delete()
+        related = sorted({path.rsplit("__", 1)[0] for path in fields if "__" in path})
+        batch = []
+        for instance in model.objects.select_related(*related).order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            batch.append(SearchEntry(content_type=content_type, object_id=instance.pk, body=_build_body(instance, fields)))
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_searchentry'),
+        ('erp_v2', '0003_bankstatementline_matched_entry_and_more'),
+        ('finance', '0009_invoice_paid_amount'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
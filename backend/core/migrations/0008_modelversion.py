@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_backfill_search_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('label', models.CharField(max_length=120, unique=True)),
+                ('deletes', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['label'],
+            },
+        ),
+    ]
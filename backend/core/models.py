@@ -2,7 +2,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 from decimal import Decimal
 
 
@@ -39,6 +41,7 @@ class User(AbstractUser):
     job_title = models.CharField(max_length=120, blank=True)
     is_field_staff = models.BooleanField(default=False)
     is_customer = models.BooleanField(default=False)
+    auth_version = models.PositiveIntegerField(default=0)
 
     class Meta:
         indexes = [
@@ -175,6 +178,17 @@ class Sequence(TimeStampedModel):
         return f"{self.key} ({self.prefix}{self.next_number})"
 
 
+class ModelVersion(TimeStampedModel):
+    label = models.CharField(max_length=120, unique=True)
+    deletes = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["label"]
+
+    def __str__(self) -> str:
+        return f"{self.label} ({self.deletes})"
+
+
 class Document(TimeStampedModel):
     name = models.CharField(max_length=255)
     file = models.FileField(upload_to="documents/")
@@ -198,3 +212,55 @@ class Document(TimeStampedModel):
 
     def __str__(self) -> str:
         return self.name
+
+
+class Job(TimeStampedModel):
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+        CANCELLED = "cancelled", "Cancelled"
+
+    name = models.CharField(max_length=120)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=120, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    progress_message = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "run_at"]),
+            models.Index(fields=["name", "status"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name}#{self.pk} ({self.status})"
+
+
+class SearchEntry(TimeStampedModel):
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="core_search_entry_unique_object"),
+        ]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+COUNT_MODE_EXACT = "exact"
+COUNT_MODE_ESTIMATED = "estimated"
+
+
+def estimate_queryset_count(queryset) -> int | None:
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    count_is_estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_queryset_count(self.object_list)
+        # Small results are cheap to count exactly and planner estimates are least reliable there.
+        if estimate is None or estimate < settings.PAGINATION_ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        self.count_is_estimated = True
+        return estimate
+
+
+class ViewCursorPagination(CursorPagination):
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+
+class HighVolumePagination(PageNumberPagination):
+    pagination_query_param = "pagination"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if request.query_params.get(self.pagination_query_param) == "cursor" or request.query_params.get("cursor"):
+            ordering = getattr(view, "cursor_ordering", None) or queryset.query.order_by or queryset.model._meta.ordering
+            self.cursor_paginator = ViewCursorPagination(ordering=tuple(ordering))
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+        count_mode = request.query_params.get(self.count_query_param, settings.PAGINATION_COUNT_MODE)
+        self.django_paginator_class = EstimatedCountPaginator if count_mode == COUNT_MODE_ESTIMATED else Paginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        if getattr(self.page.paginator, "count_is_estimated", False):
+            response.data["count_is_estimated"] = True
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimated"] = {"type": "boolean"}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.pagination_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` for keyset pagination without a total count.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": "cursor",
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Use `estimated` to take the total from PostgreSQL planner statistics.",
+                "schema": {"type": "string", "enum": [COUNT_MODE_EXACT, COUNT_MODE_ESTIMATED]},
+            },
+        ]
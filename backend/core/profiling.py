@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+# Latency buckets (ms) grow geometrically from 0.5ms to ~60s; anything slower lands in the last bucket.
+BUCKET_BOUNDS_MS = tuple(round(0.5 * 1.25**index, 3) for index in range(53))
+PERCENTILES = (50, 95, 99)
+UNRESOLVED_VIEW_KEY = "<unresolved>"
+DEFAULT_SLOW_QUERY_SAMPLES = 10
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: LatencyHistogram):
+        self.buckets = [left + right for left, right in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percentile: int) -> float:
+        if not self.count:
+            return 0.0
+        threshold = self.count * percentile / 100
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                upper_bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(upper_bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": self.buckets,
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> LatencyHistogram:
+        histogram = cls()
+        histogram.buckets = list(payload["buckets"])
+        histogram.count = payload["count"]
+        histogram.total_ms = payload["total_ms"]
+        histogram.max_ms = payload["max_ms"]
+        return histogram
+
+
+class EndpointProfile:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.query_count = 0
+        self.query_ms = 0.0
+        self.max_queries = 0
+        self.slow_queries: list[dict] = []
+
+    def record(self, latency_ms: float, query_count: int, query_ms: float, slow_queries: list[dict]):
+        self.latency.record(latency_ms)
+        self.query_count += query_count
+        self.query_ms += query_ms
+        self.max_queries = max(self.max_queries, query_count)
+        if slow_queries:
+            self._keep_slowest(slow_queries)
+
+    def merge(self, other: EndpointProfile):
+        self.latency.merge(other.latency)
+        self.query_count += other.query_count
+        self.query_ms += other.query_ms
+        self.max_queries = max(self.max_queries, other.max_queries)
+        self._keep_slowest(other.slow_queries)
+
+    def _keep_slowest(self, slow_queries: list[dict]):
+        limit = settings.REQUEST_PROFILING_SLOW_QUERY_SAMPLES or DEFAULT_SLOW_QUERY_SAMPLES
+        self.slow_queries = sorted(self.slow_queries + slow_queries, key=lambda query: -query["duration_ms"])[:limit]
+
+    def summary(self) -> dict:
+        requests = self.latency.count
+        return {
+            "requests": requests,
+            **{f"p{percentile}_ms": round(self.latency.percentile(percentile), 3) for percentile in PERCENTILES},
+            "avg_ms": round(self.latency.total_ms / requests, 3) if requests else 0.0,
+            "max_ms": round(self.latency.max_ms, 3),
+            "avg_queries": round(self.query_count / requests, 2) if requests else 0.0,
+            "max_queries": self.max_queries,
+            "avg_query_ms": round(self.query_ms / requests, 3) if requests else 0.0,
+            "slow_queries": self.slow_queries,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "latency": self.latency.to_dict(),
+            "query_count": self.query_count,
+            "query_ms": self.query_ms,
+            "max_queries": self.max_queries,
+            "slow_queries": self.slow_queries,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> EndpointProfile:
+        profile = cls()
+        profile.latency = LatencyHistogram.from_dict(payload["latency"])
+        profile.query_count = payload["query_count"]
+        profile.query_ms = payload["query_ms"]
+        profile.max_queries = payload["max_queries"]
+        profile.slow_queries = list(payload["slow_queries"])
+        return profile
+
+
+class ProfileRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles: dict[str, EndpointProfile] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, view_key: str, latency_ms: float, query_count: int, query_ms: float, slow_queries: list[dict]):
+        with self._lock:
+            profile = self._profiles.get(view_key)
+            if profile is None:
+                if len(self._profiles) >= settings.REQUEST_PROFILING_MAX_VIEWS:
+                    view_key = UNRESOLVED_VIEW_KEY
+                profile = self._profiles.setdefault(view_key, EndpointProfile())
+            profile.record(latency_ms, query_count, query_ms, slow_queries)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {view_key: profile.to_dict() for view_key, profile in self._profiles.items()}
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            return summarize(self._profiles)
+
+    def reset(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def flush_if_due(self):
+        dump_dir = settings.REQUEST_PROFILING_DUMP_DIR
+        if not dump_dir or time.monotonic() - self._last_flush < settings.REQUEST_PROFILING_FLUSH_SECONDS:
+            return
+        self._last_flush = time.monotonic()
+        self.flush(dump_dir)
+
+    def flush(self, dump_dir: str):
+        Path(dump_dir).mkdir(parents=True, exist_ok=True)
+        target = Path(dump_dir) / f"profile-{os.getpid()}.json"
+        temporary = target.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        temporary.replace(target)
+
+
+def summarize(profiles: dict[str, EndpointProfile]) -> dict[str, dict]:
+    ordered = sorted(profiles.items(), key=lambda item: -item[1].latency.total_ms)
+    return {view_key: profile.summary() for view_key, profile in ordered}
+
+
+def load_dumped_profiles(dump_dir: str) -> dict[str, EndpointProfile]:
+    merged: dict[str, EndpointProfile] = {}
+    for dump_file in sorted(Path(dump_dir).glob("profile-*.json")):
+        for view_key, payload in json.loads(dump_file.read_text(encoding="utf-8")).items():
+            merged.setdefault(view_key, EndpointProfile()).merge(EndpointProfile.from_dict(payload))
+    return merged
+
+
+registry = ProfileRegistry()
+
+
+def resolve_view_key(view_func, method: str) -> str:
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__qualname__}"
+    view_name = f"{view_class.__module__}.{view_class.__name__}"
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return f"{view_name}:{action}"
+
+
+def _query_origin() -> list[str]:
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame
+        for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(base_dir) and "site-packages" not in frame.filename
+    ]
+    return [f"{Path(frame.filename).relative_to(base_dir)}:{frame.lineno} in {frame.name}" for frame in frames[-5:]]
+
+
+class QueryRecorder:
+    def __init__(self, sample_slow_queries: bool):
+        self.sample_slow_queries = sample_slow_queries
+        self.count = 0
+        self.duration_ms = 0.0
+        self.slow_queries: list[dict] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.count += 1
+            self.duration_ms += duration_ms
+            if self.sample_slow_queries:
+                self._sample(sql, duration_ms)
+
+    def _sample(self, sql: str, duration_ms: float):
+        limit = settings.REQUEST_PROFILING_SLOW_QUERY_SAMPLES
+        if len(self.slow_queries) >= limit and duration_ms <= self.slow_queries[-1]["duration_ms"]:
+            return
+        self.slow_queries.append({"duration_ms": round(duration_ms, 3), "sql": sql[:500], "origin": _query_origin()})
+        self.slow_queries.sort(key=lambda query: -query["duration_ms"])
+        del self.slow_queries[limit:]
+
+
+class RequestProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder(sample_slow_queries=settings.REQUEST_PROFILING_SLOW_QUERY_SAMPLES > 0)
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        view_key = getattr(request, "_profiling_view_key", UNRESOLVED_VIEW_KEY)
+        registry.record(view_key, latency_ms, recorder.count, recorder.duration_ms, recorder.slow_queries)
+        registry.flush_if_due()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._profiling_view_key = resolve_view_key(view_func, request.method)
+        return None
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.access import ActionBasedRolePermission
+from core.renderers import dumps_json
+from core.services.report_runner import ReportTimeout, budget_exhausted, report_time_budget
+
+
+class ReportTimeBudgetMixin:
+    report_time_budget_seconds: float | None = None
+
+    def dispatch(self, request, *args, **kwargs):
+        with report_time_budget(self.report_time_budget_seconds):
+            return super().dispatch(request, *args, **kwargs)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, OperationalError) and budget_exhausted():
+            exc = ReportTimeout()
+        return super().handle_exception(exc)
+
+
+class AsyncReportView(View):
+    http_method_names = ["get", "options"]
+    permission_classes = [ActionBasedRolePermission]
+    action_role_map: dict = {}
+    reports: dict[str, Callable] = {}
+    report_time_budget_seconds: float | None = None
+
+    def get_report_kwargs(self, request: Request, report: str) -> dict:
+        return {}
+
+    def _authorize(self, request: Request):
+        for permission_class in self.permission_classes:
+            permission = permission_class()
+            if not permission.has_permission(request, self):
+                if not request.successful_authenticator:
+                    raise NotAuthenticated()
+                raise PermissionDenied(getattr(permission, "message", None))
+
+    def _build(self, request: Request, report: str):
+        try:
+            self._authorize(request)
+            kwargs = self.get_report_kwargs(request, report)
+            with report_time_budget(self.get_time_budget()):
+                try:
+                    return self.reports[report](**kwargs)
+                except OperationalError:
+                    if budget_exhausted():
+                        raise ReportTimeout()
+                    raise
+        finally:
+            close_old_connections()
+
+    def get_time_budget(self) -> float:
+        if self.report_time_budget_seconds is not None:
+            return self.report_time_budget_seconds
+        return settings.REPORT_TIME_BUDGET_SECONDS
+
+    async def get(self, request, report: str):
+        self.action = report.replace("-", "_")
+        if self.action not in self.reports:
+            return self._json_response({"detail": "Unknown report."}, status_code=status.HTTP_404_NOT_FOUND)
+
+        drf_request = Request(
+            request,
+            authenticators=[authenticator() for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+        )
+        budget = self.get_time_budget()
+        try:
+            payload = await asyncio.wait_for(
+                sync_to_async(self._build, thread_sensitive=False)(drf_request, self.action),
+                timeout=budget or None,
+            )
+        except asyncio.TimeoutError:
+            return self._error_response(ReportTimeout())
+        except APIException as exc:
+            return self._error_response(exc)
+        return self._json_response(payload)
+
+    def _json_response(self, data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+        return HttpResponse(dumps_json(data), content_type="application/json", status=status_code)
+
+    def _error_response(self, exc: APIException) -> HttpResponse:
+        detail = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+        return self._json_response(detail, status_code=exc.status_code)
@@ -0,0 +1,4 @@
+from core.models import Document
+from core.services.search import register_search_index
+
+register_search_index(Document, fields=["name", "notes"])
@@ -1,6 +1,6 @@
 ﻿from rest_framework import serializers
 
-from .models import AuditLog, CompanyProfile, Customer, Document, Role, Sequence, User
+from .models import AuditLog, CompanyProfile, Customer, Document, Job, Role, Sequence, User
 
 
 class RoleSerializer(serializers.ModelSerializer):
@@ -135,3 +135,28 @@ class DocumentSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["uploaded_by", "created_at", "updated_at"]
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "name",
+            "status",
+            "payload",
+            "result",
+            "error",
+            "attempts",
+            "max_attempts",
+            "progress",
+            "progress_message",
+            "run_at",
+            "started_at",
+            "heartbeat_at",
+            "finished_at",
+            "created_by",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
@@ -1,15 +1,62 @@
 from __future__ import annotations
 
+from copy import copy
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+
 from core.models import CompanyProfile
 
+COMPANY_PROFILE_VERSION_CACHE_KEY = "core:company-profile-version"
+
+_profile_cache: dict[str, CompanyProfile] = {}
+
+
+def _company_profile_version():
+    # The shared cache tells each process whether its local copy is still current.
+    version = cache.get(COMPANY_PROFILE_VERSION_CACHE_KEY)
+    if version is None:
+        version = CompanyProfile.objects.values_list("updated_at", flat=True).first()
+        if version is not None:
+            cache.set(COMPANY_PROFILE_VERSION_CACHE_KEY, version, settings.COMPANY_PROFILE_CACHE_SECONDS)
+    return version
+
+
+def _cache_company_profile(profile: CompanyProfile):
+    _profile_cache["profile"] = profile
+    cache.set(COMPANY_PROFILE_VERSION_CACHE_KEY, profile.updated_at, settings.COMPANY_PROFILE_CACHE_SECONDS)
+
 
 def get_company_profile() -> CompanyProfile:
-    profile = CompanyProfile.objects.first()
-    if profile:
-        return profile
-    return CompanyProfile.objects.create()
+    profile = _profile_cache.get("profile")
+    if profile is not None and profile.updated_at == _company_profile_version():
+        # Callers get their own copy, so a caller that mutates it cannot corrupt the shared one.
+        return copy(profile)
+
+    profile = CompanyProfile.objects.first() or CompanyProfile.objects.create()
+    if connection.in_atomic_block:
+        # Only share rows that are known to be committed.
+        transaction.on_commit(partial(_cache_company_profile, profile))
+    else:
+        _cache_company_profile(profile)
+    return copy(profile)
 
 
 def get_base_currency() -> str:
     profile = get_company_profile()
     return (profile.base_currency or "KWD").upper()
+
+
+def clear_company_profile_cache():
+    _profile_cache.clear()
+    cache.delete(COMPANY_PROFILE_VERSION_CACHE_KEY)
+
+
+def warm_company_profile_cache() -> CompanyProfile | None:
+    clear_company_profile_cache()
+    try:
+        return get_company_profile()
+    except DatabaseError:
+        return None
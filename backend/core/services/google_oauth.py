@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token as google_id_token
+
+
+def verify_google_id_token(raw_token: str, client_id: str) -> dict:
+    return google_id_token.verify_oauth2_token(raw_token, google_requests.Request(), client_id)
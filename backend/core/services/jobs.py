@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+import traceback
+from collections.abc import Callable
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import PermissionDenied, ValidationError
+
+from core.models import Job
+
+JobHandler = Callable[[Job, dict], object]
+
+_job_handlers: dict[str, JobHandler] = {}
+
+# Raised for bad input or access; running the job again would fail the same way.
+NON_RETRYABLE_ERRORS = (ValidationError, PermissionDenied, CommandError)
+
+
+def register_job(name: str):
+    def decorator(handler: JobHandler) -> JobHandler:
+        _job_handlers[name] = handler
+        return handler
+
+    return decorator
+
+
+def get_job_handler(name: str) -> JobHandler | None:
+    return _job_handlers.get(name)
+
+
+def enqueue_job(name: str, *, payload: dict | None = None, created_by=None, max_attempts: int | None = None, run_at=None) -> Job:
+    if name not in _job_handlers:
+        raise ValueError(f"No job handler registered for {name!r}.")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=created_by if getattr(created_by, "is_authenticated", False) else None,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next_job(worker_id: str, *, names: list[str] | None = None) -> Job | None:
+    queryset = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=timezone.now())
+    if names:
+        queryset = queryset.filter(name__in=names)
+    queryset = queryset.order_by("run_at", "id")
+
+    # Without SKIP LOCKED (SQLite) the status-guarded update alone decides which worker wins.
+    row_locking = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic() if row_locking else nullcontext():
+        if row_locking:
+            queryset = queryset.select_for_update(skip_locked=True)
+        job = queryset.first()
+        if job is None:
+            return None
+
+        started_at = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            locked_by=worker_id,
+            started_at=started_at,
+            heartbeat_at=started_at,
+            attempts=job.attempts + 1,
+            updated_at=started_at,
+        )
+        if not claimed:
+            return None
+    job.refresh_from_db()
+    return job
+
+
+def report_progress(job: Job, progress: int, message: str = ""):
+    job.progress = max(0, min(int(progress), 100))
+    job.progress_message = message[:255]
+    job.heartbeat_at = timezone.now()
+    Job.objects.filter(pk=job.pk).update(
+        progress=job.progress,
+        progress_message=job.progress_message,
+        heartbeat_at=job.heartbeat_at,
+        updated_at=job.heartbeat_at,
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def job_error_detail(exc: Exception) -> str:
+    if isinstance(exc, (ValidationError, PermissionDenied)):
+        return json.dumps(exc.detail)
+    return str(exc)
+
+
+def run_job(job: Job) -> Job:
+    handler = get_job_handler(job.name)
+    try:
+        if handler is None:
+            raise LookupError(f"No job handler registered for {job.name!r}.")
+        result = handler(job, job.payload)
+    except NON_RETRYABLE_ERRORS as exc:
+        job.error = job_error_detail(exc)[-4000:]
+        job.status = Job.Status.FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+        return job
+    except Exception:
+        job.error = traceback.format_exc()[-4000:]
+        job.finished_at = timezone.now()
+        if handler is not None and job.attempts < job.max_attempts:
+            job.status = Job.Status.QUEUED
+            job.run_at = job.finished_at + retry_delay(job.attempts)
+            job.locked_by = ""
+        else:
+            job.status = Job.Status.FAILED
+        job.save(update_fields=["status", "error", "finished_at", "run_at", "locked_by", "updated_at"])
+        return job
+
+    job.status = Job.Status.SUCCEEDED
+    job.result = result
+    job.error = ""
+    job.progress = 100
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "progress", "finished_at", "updated_at"])
+    return job
+
+
+def requeue_stale_jobs(stale_after: timedelta) -> dict:
+    now = timezone.now()
+    cutoff = now - stale_after
+    # A job is stale once its worker stops heartbeating; jobs claimed before heartbeats existed fall back to started_at.
+    stale = Job.objects.filter(status=Job.Status.RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    requeued = stale.filter(attempts__lt=F("max_attempts")).update(
+        status=Job.Status.QUEUED,
+        locked_by="",
+        run_at=now,
+        updated_at=now,
+    )
+    # Out of attempts: the job keeps taking its worker down, so stop retrying it.
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED,
+        error=f"Worker stopped heartbeating for more than {int(stale_after.total_seconds())} seconds.",
+        locked_by="",
+        finished_at=now,
+        updated_at=now,
+    )
+    return {"requeued": requeued, "failed": failed}
+
+
+def cancel_job(job: Job) -> bool:
+    cancelled = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+        status=Job.Status.CANCELLED,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+    job.refresh_from_db()
+    return bool(cancelled)
+
+
+def run_worker(
+    *,
+    worker_id: str | None = None,
+    poll_interval: float = 1.0,
+    names: list[str] | None = None,
+    drain: bool = False,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> int:
+    worker_id = worker_id or default_worker_id()
+    processed = 0
+    while not should_stop():
+        close_old_connections()
+        job = claim_next_job(worker_id, names=names)
+        if job is None:
+            if drain:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, connections
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_deadline: ContextVar[float | None] = ContextVar("report_deadline", default=None)
+_in_report_pool: ContextVar[bool] = ContextVar("in_report_pool", default=False)
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class ReportTimeout(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Report computation exceeded its time budget."
+    default_code = "report_timeout"
+
+
+def remaining_budget() -> float | None:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def budget_exhausted() -> bool:
+    remaining = remaining_budget()
+    return remaining is not None and remaining <= 0
+
+
+def check_report_budget():
+    if budget_exhausted():
+        raise ReportTimeout()
+
+
+def _set_statement_timeout(db_connection, remaining: float | None):
+    if db_connection.vendor != "postgresql":
+        return
+    with db_connection.cursor() as cursor:
+        if remaining is None:
+            cursor.execute("RESET statement_timeout")
+        else:
+            cursor.execute("SET statement_timeout = %s", [max(int(remaining * 1000), 1)])
+
+
+@contextmanager
+def report_time_budget(seconds: float | None = None):
+    seconds = settings.REPORT_TIME_BUDGET_SECONDS if seconds is None else seconds
+    if not seconds or _deadline.get() is not None:
+        yield
+        return
+
+    token = _deadline.set(time.monotonic() + seconds)
+    # PostgreSQL cancels the running statement server-side once the budget is spent.
+    _set_statement_timeout(connection, seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+        try:
+            _set_statement_timeout(connection, None)
+        except DatabaseError:
+            pass
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(settings.REPORT_THREAD_POOL_SIZE, 1),
+                thread_name_prefix="report-query",
+            )
+        return _executor
+
+
+def _run_in_pool(func: Callable):
+    _in_report_pool.set(True)
+    close_old_connections()
+    try:
+        check_report_budget()
+        _set_statement_timeout(connection, remaining_budget())
+        return func()
+    finally:
+        try:
+            _set_statement_timeout(connection, None)
+        except DatabaseError:
+            pass
+        close_old_connections()
+
+
+def _can_run_concurrently() -> bool:
+    # Nested fan-out inside a pool thread could exhaust the pool, and pool threads use their own
+    # connections, so they would not see uncommitted rows of an open transaction.
+    if not settings.REPORT_CONCURRENT_QUERIES or _in_report_pool.get():
+        return False
+    return not any(
+        db_connection.in_atomic_block for db_connection in connections.all(initialized_only=True)
+    )
+
+
+def run_concurrently(*funcs: Callable) -> list:
+    if len(funcs) < 2 or not _can_run_concurrently():
+        results = []
+        for func in funcs:
+            check_report_budget()
+            results.append(func())
+        return results
+
+    executor = _get_executor()
+    futures = [executor.submit(copy_context().run, _run_in_pool, func) for func in funcs]
+    done, pending = wait(futures, timeout=remaining_budget())
+    if pending:
+        for future in pending:
+            future.cancel()
+        raise ReportTimeout()
+    return [future.result() for future in futures]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.models import SearchEntry
+
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+REBUILD_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    model: type
+    fields: tuple[str, ...]
+
+    @property
+    def local_fields(self) -> set[str]:
+        return {path.split("__", 1)[0] for path in self.fields}
+
+    @property
+    def related_paths(self) -> list[str]:
+        return sorted({path.rsplit("__", 1)[0] for path in self.fields if "__" in path})
+
+    def related_fields(self) -> dict[str, set[str]]:
+        # Relation path -> fields read from the model at the end of it.
+        related: dict[str, set[str]] = {}
+        for path in self.fields:
+            if "__" in path:
+                relation, field_name = path.rsplit("__", 1)
+                related.setdefault(relation, set()).add(field_name)
+        return related
+
+    def build_body(self, instance) -> str:
+        values = []
+        for path in self.fields:
+            value = instance
+            for attr in path.split("__"):
+                value = getattr(value, attr, None)
+                if value is None:
+                    break
+            if value not in (None, ""):
+                values.append(str(value))
+        return " ".join(values)
+
+
+@dataclass(frozen=True)
+class RelatedSearchSource:
+    index: SearchIndex
+    relation: str
+    field_names: frozenset[str]
+
+
+_search_indexes: dict[type, SearchIndex] = {}
+_related_sources: dict[type, list[RelatedSearchSource]] = {}
+
+
+def _relation_model(model, relation: str):
+    for name in relation.split("__"):
+        model = model._meta.get_field(name).related_model
+    return model
+
+
+def register_search_index(model, *, fields):
+    index = SearchIndex(model=model, fields=tuple(fields))
+    _search_indexes[model] = index
+    post_save.connect(_index_on_save, sender=model, dispatch_uid=f"core_search_index_save_{model._meta.label_lower}")
+    post_delete.connect(_remove_on_delete, sender=model, dispatch_uid=f"core_search_index_delete_{model._meta.label_lower}")
+    for relation, field_names in index.related_fields().items():
+        related_model = _relation_model(model, relation)
+        _related_sources.setdefault(related_model, []).append(
+            RelatedSearchSource(index=index, relation=relation, field_names=frozenset(field_names))
+        )
+        uid = related_model._meta.label_lower
+        pre_save.connect(_remember_related_values, sender=related_model, dispatch_uid=f"core_search_related_pre_save_{uid}")
+        post_save.connect(_reindex_related_on_save, sender=related_model, dispatch_uid=f"core_search_related_save_{uid}")
+    return index
+
+
+def get_search_index(model) -> SearchIndex | None:
+    return _search_indexes.get(model)
+
+
+def registered_search_indexes() -> list[SearchIndex]:
+    return list(_search_indexes.values())
+
+
+def index_instance(instance):
+    index = _search_indexes[type(instance)]
+    SearchEntry.objects.update_or_create(
+        content_type=ContentType.objects.get_for_model(type(instance)),
+        object_id=instance.pk,
+        defaults={"body": index.build_body(instance)},
+    )
+
+
+def _index_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & _search_indexes[sender].local_fields:
+        return
+    index_instance(instance)
+
+
+def _remove_on_delete(sender, instance, **kwargs):
+    SearchEntry.objects.filter(content_type=ContentType.objects.get_for_model(sender), object_id=instance.pk).delete()
+
+
+def _watched_field_names(sender) -> set[str]:
+    return {name for source in _related_sources[sender] for name in source.field_names}
+
+
+def _remember_related_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._search_previous_values = None
+    if raw or instance.pk is None:
+        return
+    names = _watched_field_names(sender)
+    if update_fields is not None and not names & set(update_fields):
+        return
+    instance._search_previous_values = sender._default_manager.filter(pk=instance.pk).values(*names).first()
+
+
+def _reindex_related_on_save(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, "_search_previous_values", None)
+    if raw or previous is None:
+        return
+    # Entries embed values from this row, so a rename has to rewrite the entries of every dependent row.
+    for source in _related_sources[sender]:
+        if all(previous[name] == getattr(instance, name) for name in source.field_names):
+            continue
+        _write_entries(source.index, source.index.model._default_manager.filter(**{source.relation: instance}), replace=True)
+
+
+def _write_entries(index: SearchIndex, queryset, *, replace: bool) -> int:
+    content_type = ContentType.objects.get_for_model(index.model)
+    indexed = 0
+    batch = []
+    instances = queryset.select_related(*index.related_paths).order_by("pk").iterator(chunk_size=REBUILD_BATCH_SIZE)
+    for instance in instances:
+        batch.append(SearchEntry(content_type=content_type, object_id=instance.pk, body=index.build_body(instance)))
+        if len(batch) >= REBUILD_BATCH_SIZE:
+            indexed += _flush_entries(content_type, batch, replace=replace)
+            batch = []
+    if batch:
+        indexed += _flush_entries(content_type, batch, replace=replace)
+    return indexed
+
+
+def _flush_entries(content_type, entries: list[SearchEntry], *, replace: bool) -> int:
+    if replace:
+        SearchEntry.objects.filter(content_type=content_type, object_id__in=[entry.object_id for entry in entries]).delete()
+    SearchEntry.objects.bulk_create(entries)
+    return len(entries)
+
+
+def rebuild_search_index(model) -> int:
+    index = _search_indexes[model]
+    SearchEntry.objects.filter(content_type=ContentType.objects.get_for_model(model)).delete()
+    return _write_entries(index, model._default_manager.all(), replace=False)
+
+
+def search_tokens(term: str) -> list[str]:
+    return SEARCH_TOKEN_PATTERN.findall(term.lower())
+
+
+def _match_clause(vendor: str, tokens: list[str]) -> tuple[list[str], list[str], str, str] | None:
+    # Returns (extra tables, match conditions, rank expression, query); every token is a prefix match and all must be present.
+    if vendor == "postgresql":
+        vector = "to_tsvector('simple', core_searchentry.body)"
+        query = "to_tsquery('simple', %s)"
+        return [], [f"{vector} @@ {query}"], f"ts_rank({vector}, {query})", " & ".join(f"{token}:*" for token in tokens)
+    if vendor == "sqlite":
+        return (
+            ["core_searchentry_fts"],
+            ["core_searchentry_fts.rowid = core_searchentry.id", "core_searchentry_fts MATCH %s"],
+            "-bm25(core_searchentry_fts)",
+            " ".join(f'"{token}"*' for token in tokens),
+        )
+    if vendor == "mysql":
+        match = "MATCH(core_searchentry.body) AGAINST (%s IN BOOLEAN MODE)"
+        return [], [match], match, " ".join(f"+{token}*" for token in tokens)
+    return None
+
+
+def full_text_search(queryset, term: str, *, rank: bool = True):
+    model = queryset.model
+    tokens = search_tokens(term)
+    if model not in _search_indexes or not tokens:
+        return None
+    connection = connections[queryset.db]
+    clause = _match_clause(connection.vendor, tokens)
+    if clause is None:
+        return None
+
+    tables, conditions, rank_expression, query = clause
+    outer_pk = f"{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name(model._meta.pk.column)}"
+    content_type_condition = "core_searchentry.content_type_id = %s"
+    if connection.vendor == "sqlite":
+        # Unary plus keeps SQLite from driving the join off the content-type index and re-running MATCH per row.
+        content_type_condition = f"+{content_type_condition}"
+    # The unique (content_type, object_id) constraint guarantees the join yields at most one entry per row.
+    queryset = queryset.extra(
+        tables=["core_searchentry", *tables],
+        where=[content_type_condition, f"core_searchentry.object_id = {outer_pk}", *conditions],
+        params=[ContentType.objects.get_for_model(model).pk, *[query] * sum(condition.count("%s") for condition in conditions)],
+    )
+    if not rank:
+        return queryset
+    return queryset.extra(
+        select={"search_rank": rank_expression},
+        select_params=[query] * rank_expression.count("%s"),
+    ).order_by("-search_rank", "-pk")
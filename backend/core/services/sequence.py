@@ -18,6 +18,17 @@ DEFAULT_SEQUENCE_CONFIG = {
 
 
 def next_sequence(key: str, *, prefix: str | None = None, padding: int | None = None, suffix: str | None = None) -> str:
+    return next_sequences(key, 1, prefix=prefix, padding=padding, suffix=suffix)[0]
+
+
+def next_sequences(
+    key: str,
+    count: int,
+    *,
+    prefix: str | None = None,
+    padding: int | None = None,
+    suffix: str | None = None,
+) -> list[str]:
     config = DEFAULT_SEQUENCE_CONFIG.get(key, {})
     default_prefix = prefix if prefix is not None else config.get("prefix", "")
     default_padding = padding if padding is not None else config.get("padding", 4)
@@ -46,9 +57,11 @@ def next_sequence(key: str, *, prefix: str | None = None, padding: int | None =
             if updated:
                 sequence.save(update_fields=["prefix", "padding", "suffix", "updated_at"])
 
-        current_number = sequence.next_number
-        sequence.next_number = current_number + 1
+        first_number = sequence.next_number
+        sequence.next_number = first_number + count
         sequence.save(update_fields=["next_number", "updated_at"])
 
-    padded = str(current_number).zfill(sequence.padding)
-    return f"{sequence.prefix}{padded}{sequence.suffix}"
+    return [
+        f"{sequence.prefix}{str(number).zfill(sequence.padding)}{sequence.suffix}"
+        for number in range(first_number, first_number + count)
+    ]
@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .authentication import forget_user_auth_version
+from .models import CompanyProfile, Role, User
+from .services.company_profile import clear_company_profile_cache
+
+ROLE_CLAIM_FIELDS = ("role_id", "is_superuser", "is_staff", "is_active", "is_customer")
+
+
+def _bump_role_users_auth_version(role):
+    user_ids = list(User.objects.filter(role=role).values_list("id", flat=True))
+    if user_ids:
+        User.objects.filter(id__in=user_ids).update(auth_version=F("auth_version") + 1)
+        forget_user_auth_version(*user_ids)
+
+
+@receiver(pre_save, sender=User, dispatch_uid="core_detect_role_claim_change")
+def detect_role_claim_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._role_claims_changed = False
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & {field.removesuffix("_id") for field in ROLE_CLAIM_FIELDS}:
+        return
+
+    previous = User.objects.filter(pk=instance.pk).values(*ROLE_CLAIM_FIELDS).first()
+    if previous is not None:
+        instance._role_claims_changed = any(previous[field] != getattr(instance, field) for field in ROLE_CLAIM_FIELDS)
+
+
+@receiver(post_save, sender=User, dispatch_uid="core_bump_user_auth_version")
+def bump_user_auth_version(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created or not getattr(instance, "_role_claims_changed", False):
+        return
+    User.objects.filter(pk=instance.pk).update(auth_version=F("auth_version") + 1)
+    instance.auth_version = User.objects.filter(pk=instance.pk).values_list("auth_version", flat=True).first()
+    instance._role_claims_changed = False
+    forget_user_auth_version(instance.pk)
+
+
+@receiver(pre_save, sender=Role, dispatch_uid="core_bump_role_auth_version")
+def bump_role_auth_version(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = Role.objects.filter(pk=instance.pk).values("slug", "name").first()
+    if previous and (previous["slug"] != instance.slug or previous["name"] != instance.name):
+        _bump_role_users_auth_version(instance)
+
+
+@receiver(pre_delete, sender=Role, dispatch_uid="core_revoke_deleted_role_claims")
+def revoke_deleted_role_claims(sender, instance, **kwargs):
+    _bump_role_users_auth_version(instance)
+
+
+@receiver(post_save, sender=CompanyProfile, dispatch_uid="core_clear_company_profile_cache_on_save")
+@receiver(post_delete, sender=CompanyProfile, dispatch_uid="core_clear_company_profile_cache_on_delete")
+def clear_company_profile_cache_on_change(sender, **kwargs):
+    clear_company_profile_cache()
+    # Cleared again after commit, in case another process re-cached the old version before this change committed.
+    transaction.on_commit(clear_company_profile_cache)
@@ -1,8 +1,53 @@
-﻿from django.urls import reverse
+﻿import gzip
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.test import RequestFactory, modify_settings, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APITestCase
 
-from .models import Role, User
+from finance.models import JournalLine
+from .bulk import bulk_upsert
+from .compression import CompressionMiddleware, brotli
+from .management.commands.benchmark_startup import HEAVY_STARTUP_MODULES, loaded_heavy_modules, parse_importtime, probe_startup_modules
+from .models import AuditLog, CompanyProfile, Job, Role, User
+from .pagination import estimate_queryset_count
+from .renderers import FastJSONRenderer
+from .profiling import LatencyHistogram, registry as profiling_registry
+from .services.company_profile import (
+    COMPANY_PROFILE_VERSION_CACHE_KEY,
+    clear_company_profile_cache,
+    get_base_currency,
+    get_company_profile,
+)
+from .services.jobs import claim_next_job, enqueue_job, register_job, report_progress, requeue_stale_jobs, run_job, run_worker
+
+
+@register_job("core.tests.echo")
+def _echo_job(job, payload):
+    return {"echo": payload["value"]}
+
+
+@register_job("core.tests.broken")
+def _broken_job(job, payload):
+    raise RuntimeError("boom")
+
+
+@register_job("core.tests.invalid")
+def _invalid_job(job, payload):
+    raise ValidationError({"year": "Fiscal year is already closed."})
 
 
 class TestCoreSmoke(APITestCase):
@@ -45,3 +90,314 @@ class TestCompanyProfile(APITestCase):
         self.assertEqual(update_response.status_code, status.HTTP_200_OK)
         self.assertEqual(update_response.data["name"], "Acme Construction")
         self.assertEqual(update_response.data["tax_number"], "TAX-123")
+
+    def test_company_profile_is_cached_until_updated(self):
+        self.addCleanup(clear_company_profile_cache)
+        clear_company_profile_cache()
+        with self.captureOnCommitCallbacks(execute=True):
+            get_company_profile()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_base_currency(), "KWD")
+
+        update_response = self.client.patch("/api/v1/core/company-profile/", {"base_currency": "usd"}, format="json")
+        self.assertEqual(update_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_base_currency(), "USD")
+
+        get_company_profile().base_currency = "XXX"
+        self.assertEqual(get_base_currency(), "USD")
+
+        # Another process saving the profile only leaves a new version behind in the shared cache.
+        profile = get_company_profile()
+        CompanyProfile.objects.filter(pk=profile.pk).update(base_currency="EUR", updated_at=timezone.now())
+        cache.delete(COMPANY_PROFILE_VERSION_CACHE_KEY)
+        self.assertEqual(get_base_currency(), "EUR")
+
+
+@override_settings(JWT_STATELESS_ROLE_CLAIMS=True)
+class TestStatelessRoleClaims(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.accountant_role = Role.objects.create(name="Accountant", slug="accountant")
+        self.customer_role = Role.objects.create(name="Customer", slug="customer")
+        self.user = User.objects.create_user(username="claims", password="pass1234", role=self.accountant_role)
+
+    def _obtain_tokens(self):
+        response = self.client.post(
+            "/api/auth/token/",
+            {"username": "claims", "password": "pass1234"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_role_permission_uses_token_claims_without_user_query(self):
+        tokens = self._obtain_tokens()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        self.assertEqual(self.client.get("/api/v1/core/customers/").status_code, status.HTTP_200_OK)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/core/customers/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('FROM "core_user"' in query["sql"] for query in queries.captured_queries))
+
+    def test_role_change_requires_token_refresh(self):
+        tokens = self._obtain_tokens()
+        self.user.role = self.customer_role
+        self.user.save()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        response = self.client.get("/api/v1/core/customers/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        refresh_response = self.client.post("/api/auth/token/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(refresh_response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh_response.data['access']}")
+        response = self.client.get("/api/v1/core/customers/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@modify_settings(MIDDLEWARE={"prepend": "core.profiling.RequestProfilingMiddleware"})
+@override_settings(REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_SLOW_QUERY_SAMPLES=2, REQUEST_PROFILING_DUMP_DIR="")
+class TestRequestProfiling(APITestCase):
+    def setUp(self):
+        profiling_registry.reset()
+        self.addCleanup(profiling_registry.reset)
+        self.admin = User.objects.create_user(username="profiler", password="pass1234", is_staff=True)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_profiling_endpoint_reports_per_action_latency_and_queries(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get("/api/v1/core/sequences/").status_code, status.HTTP_200_OK)
+
+        response = self.client.get("/api/v1/core/profiling/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data["views"]["core.views.SequenceViewSet:list"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertGreater(stats["avg_queries"], 0)
+        self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertLessEqual(len(stats["slow_queries"]), 2)
+        self.assertTrue(stats["slow_queries"][0]["sql"])
+
+    def test_profiling_endpoint_is_admin_only(self):
+        self.client.force_authenticate(user=User.objects.create_user(username="plain", password="pass1234"))
+        response = self.client.get("/api/v1/core/profiling/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_histogram_percentiles_use_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for value in [1.0] * 98 + [500.0, 900.0]:
+            histogram.record(value)
+        self.assertLessEqual(histogram.percentile(50), 1.25)
+        self.assertGreaterEqual(histogram.percentile(99), 400)
+        self.assertEqual(histogram.percentile(100), 900.0)
+
+
+class TestLoadDataCommands(APITestCase):
+    def _generate(self, prefix: str):
+        call_command(
+            "generate_load_data",
+            prefix=prefix,
+            seed=7,
+            projects=2,
+            customers=3,
+            items=3,
+            invoices=5,
+            journal_entries=10,
+            gl_entries=10,
+            stdout=StringIO(),
+        )
+        return JournalLine.objects.filter(entry__entry_number__startswith=f"{prefix}-").aggregate(
+            debit=Sum("debit"), credit=Sum("credit")
+        )
+
+    def test_generate_load_data_is_deterministic_and_balanced(self):
+        first_totals = self._generate("LA")
+        second_totals = self._generate("LB")
+
+        self.assertEqual(first_totals, second_totals)
+        self.assertEqual(first_totals["debit"], first_totals["credit"])
+        self.assertEqual(JournalLine.objects.filter(entry__entry_number__startswith="LA-").count(), 40)
+
+    def test_benchmark_reports_emits_json_results(self):
+        self._generate("LC")
+        output = StringIO()
+        call_command("benchmark_reports", iterations=1, only="finance.trial_balance,erp_v2.kpis", stdout=output)
+
+        payload = json.loads(output.getvalue())
+        self.assertEqual([result["name"] for result in payload["results"]], ["finance.trial_balance", "erp_v2.kpis"])
+        self.assertTrue(all("median_ms" in result for result in payload["results"]))
+
+
+class TestStartupImports(APITestCase):
+    def test_heavy_integrations_are_not_imported_at_startup(self):
+        modules = probe_startup_modules()
+
+        self.assertIn("finance.views", modules)
+        self.assertIn("core.views", modules)
+        self.assertEqual(loaded_heavy_modules(modules), [])
+
+    def test_parse_importtime_reports_nesting(self):
+        output = "\n".join(
+            [
+                "import time: self [us] | cumulative | imported package",
+                "import time:       120 |        120 |   openpyxl.styles",
+                "import time:       300 |        420 | openpyxl",
+            ]
+        )
+
+        modules = parse_importtime(output)
+
+        self.assertEqual([(module["module"], module["depth"]) for module in modules], [("openpyxl.styles", 1), ("openpyxl", 0)])
+        self.assertEqual(loaded_heavy_modules(module["module"] for module in modules), [HEAVY_STARTUP_MODULES[0]])
+
+
+class TestJobQueue(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="job-owner", password="pass1234")
+        self.other_user = User.objects.create_user(username="job-other", password="pass1234")
+
+    def test_worker_runs_queued_jobs_and_exposes_status(self):
+        job = enqueue_job("core.tests.echo", payload={"value": 7}, created_by=self.user)
+
+        self.assertEqual(run_worker(drain=True), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"echo": 7})
+        self.assertEqual(job.progress, 100)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(f"/api/v1/core/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], Job.Status.SUCCEEDED)
+
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(f"/api/v1/core/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(JOB_RETRY_BACKOFF_SECONDS=60)
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        job = enqueue_job("core.tests.broken", max_attempts=2)
+
+        run_job(claim_next_job("worker-1"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn("boom", job.error)
+        self.assertIsNone(claim_next_job("worker-1"))
+
+        Job.objects.filter(pk=job.pk).update(run_at=job.created_at)
+        run_job(claim_next_job("worker-1"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_validation_errors_fail_the_job_without_retrying(self):
+        job = enqueue_job("core.tests.invalid", max_attempts=3)
+
+        run_job(claim_next_job("worker-1"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(json.loads(job.error), {"year": "Fiscal year is already closed."})
+        self.assertIsNone(claim_next_job("worker-1"))
+
+    def test_stale_jobs_are_detected_by_heartbeat_and_stop_after_max_attempts(self):
+        long_running = enqueue_job("core.tests.echo", payload={"value": 1}, max_attempts=2)
+        crashed = enqueue_job("core.tests.echo", payload={"value": 2}, max_attempts=2)
+        exhausted = enqueue_job("core.tests.echo", payload={"value": 3}, max_attempts=1)
+        for job in (long_running, crashed, exhausted):
+            claim_next_job("worker-1")
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Job.objects.update(started_at=an_hour_ago, heartbeat_at=an_hour_ago)
+        report_progress(long_running, 50, "Still working")
+
+        self.assertEqual(requeue_stale_jobs(timedelta(minutes=10)), {"requeued": 1, "failed": 1})
+        statuses = dict(Job.objects.values_list("pk", "status"))
+        self.assertEqual(statuses[long_running.pk], Job.Status.RUNNING)
+        self.assertEqual(statuses[crashed.pk], Job.Status.QUEUED)
+        self.assertEqual(statuses[exhausted.pk], Job.Status.FAILED)
+        self.assertIn("heartbeat", Job.objects.get(pk=exhausted.pk).error)
+
+    def test_cancel_only_applies_to_queued_jobs(self):
+        job = enqueue_job("core.tests.echo", payload={"value": 1}, created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(f"/api/v1/core/jobs/{job.id}/cancel/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], Job.Status.CANCELLED)
+
+        response = self.client.post(f"/api/v1/core/jobs/{job.id}/cancel/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(run_worker(drain=True), 0)
+
+
+class TestHighVolumePagination(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="page-admin", email="page-admin@example.com", password="pass1234")
+        self.client.force_authenticate(user=self.admin)
+        AuditLog.objects.bulk_create(
+            [AuditLog(action=AuditLog.Action.UPDATE, model_name="Job", object_id=str(index)) for index in range(25)]
+        )
+
+    def test_cursor_pagination_walks_all_rows_without_count(self):
+        first_page = self.client.get("/api/v1/core/audit-logs/", {"pagination": "cursor"})
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", first_page.data)
+        self.assertEqual(len(first_page.data["results"]), 20)
+
+        with CaptureQueriesContext(connection) as queries:
+            second_page = self.client.get(first_page.data["next"])
+        self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries.captured_queries))
+        self.assertEqual(len(second_page.data["results"]), 5)
+        self.assertIsNone(second_page.data["next"])
+
+        seen_ids = [row["id"] for row in first_page.data["results"] + second_page.data["results"]]
+        self.assertEqual(len(set(seen_ids)), 25)
+
+    def test_estimated_count_falls_back_to_exact_count_without_planner_statistics(self):
+        response = self.client.get("/api/v1/core/audit-logs/", {"count": "estimated"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 25)
+        if connection.vendor != "postgresql":
+            self.assertIsNone(estimate_queryset_count(AuditLog.objects.all()))
+            self.assertNotIn("count_is_estimated", response.data)
+
+    def test_bulk_upsert_names_a_conflict_target_only_where_supported(self):
+        Role.objects.create(name="Site Engineer", slug="site-engineer")
+        bulk_upsert(Role, [Role(name="Site Engineer", slug="site-engineer", description="Updated")], unique_fields=["slug"], update_fields=["description"])
+        self.assertEqual(Role.objects.get(slug="site-engineer").description, "Updated")
+
+        with patch.object(connection.features, "supports_update_conflicts_with_target", False), patch.object(
+            Role._default_manager, "bulk_create"
+        ) as bulk_create:
+            bulk_upsert(Role, [], unique_fields=["slug"], update_fields=["description"])
+        self.assertNotIn("unique_fields", bulk_create.call_args.kwargs)
+        self.assertTrue(bulk_create.call_args.kwargs["update_conflicts"])
+
+
+class TestResponseEncoding(APITestCase):
+    def test_fast_renderer_emits_decimals_as_exact_strings(self):
+        content = FastJSONRenderer().render({"amount": Decimal("1234.50"), "day": date(2026, 1, 31), "rows": [1, 2]})
+        self.assertEqual(json.loads(content), {"amount": "1234.50", "day": "2026-01-31", "rows": [1, 2]})
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+    def test_compression_is_negotiated_and_respects_threshold(self):
+        body = json.dumps([{"account": "1110", "debit": "100.00"}] * 200).encode()
+        middleware = CompressionMiddleware(lambda request: HttpResponse(body, content_type="application/json"))
+        factory = RequestFactory()
+
+        response = middleware(factory.get("/", HTTP_ACCEPT_ENCODING="gzip;q=1.0, br;q=0"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), body)
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+        if brotli is not None:
+            response = middleware(factory.get("/", HTTP_ACCEPT_ENCODING="gzip, br"))
+            self.assertEqual(response["Content-Encoding"], "br")
+            self.assertEqual(brotli.decompress(response.content), body)
+
+        self.assertFalse(middleware(factory.get("/")).has_header("Content-Encoding"))
+        small = CompressionMiddleware(lambda request: HttpResponse(b"{}", content_type="application/json"))
+        self.assertFalse(small(factory.get("/", HTTP_ACCEPT_ENCODING="gzip")).has_header("Content-Encoding"))
@@ -7,6 +7,8 @@ from .views import (
     CustomerViewSet,
     DocumentViewSet,
     HealthCheckView,
+    JobViewSet,
+    ProfilingStatsView,
     RoleViewSet,
     SequenceViewSet,
     UserViewSet,
@@ -19,9 +21,11 @@ router.register("audit-logs", AuditLogViewSet, basename="audit-log")
 router.register("customers", CustomerViewSet, basename="customer")
 router.register("sequences", SequenceViewSet, basename="sequence")
 router.register("documents", DocumentViewSet, basename="document")
+router.register("jobs", JobViewSet, basename="job")
 
 urlpatterns = [
     path("health/", HealthCheckView.as_view(), name="health"),
+    path("profiling/", ProfilingStatsView.as_view(), name="profiling-stats"),
     path(
         "company-profile/",
         CompanyProfileViewSet.as_view({"get": "list", "patch": "update"}),
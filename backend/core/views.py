@@ -1,6 +1,9 @@
-﻿from django.utils.timezone import now
+﻿import os
+
+from django.utils.timezone import now
 from rest_framework import mixins, status, viewsets
 from django.conf import settings
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
@@ -9,18 +12,22 @@ from rest_framework.views import APIView
 
 from core.access import ActionBasedRolePermission, ROLE_ACCOUNTANT, ROLE_ADMIN, ROLE_PROJECT_MANAGER
 from core.audit import AuditLogMixin
+from core.pagination import HighVolumePagination
 from core.auth import RoleAwareTokenObtainPairSerializer
-from .models import AuditLog, Customer, Document, ExternalAuthAccount, Role, Sequence, User
+from core.profiling import registry as profiling_registry
+from .models import AuditLog, CompanyProfile, Customer, Document, ExternalAuthAccount, Job, Role, Sequence, User
 from .serializers import (
     AuditLogSerializer,
     CompanyProfileSerializer,
     CustomerSerializer,
     DocumentSerializer,
+    JobSerializer,
     RoleSerializer,
     SequenceSerializer,
     UserSerializer,
 )
 from .services.company_profile import get_company_profile
+from .services.jobs import cancel_job
 from .services.sequence import next_sequence
 
 
@@ -37,6 +44,23 @@ class HealthCheckView(APIView):
         )
 
 
+class ProfilingStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "enabled": settings.REQUEST_PROFILING_ENABLED,
+                "pid": os.getpid(),
+                "views": profiling_registry.summary(),
+            }
+        )
+
+    def delete(self, request):
+        profiling_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class RoleViewSet(AuditLogMixin, viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
@@ -85,11 +109,34 @@ class AuditLogViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     queryset = AuditLog.objects.select_related("user").all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = HighVolumePagination
+    cursor_ordering = ("-created_at", "-id")
     search_fields = ["model_name", "object_id", "user__username"]
     filterset_fields = ["action", "model_name"]
     ordering_fields = ["created_at"]
 
 
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Job.objects.select_related("created_by").all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ["name", "status"]
+    ordering_fields = ["created_at", "run_at"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.user.is_staff or self.request.user.is_superuser:
+            return queryset
+        return queryset.filter(created_by=self.request.user)
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None):
+        job = self.get_object()
+        if not cancel_job(job):
+            raise ValidationError({"status": "Only queued jobs can be cancelled."})
+        return Response(self.get_serializer(job).data)
+
+
 class CompanyProfileViewSet(viewsets.ViewSet):
     permission_classes = [ActionBasedRolePermission]
     action_role_map = {
@@ -111,7 +158,8 @@ class CompanyProfileViewSet(viewsets.ViewSet):
         return Response(CompanyProfileSerializer(instance).data)
 
     def update(self, request, pk=None):
-        instance = self._get_instance()
+        # A fresh row rather than the cached copy, so the write starts from the committed values.
+        instance = CompanyProfile.objects.get(pk=self._get_instance().pk)
         serializer = CompanyProfileSerializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -266,10 +314,9 @@ class GoogleOAuthView(APIView):
             raise ValidationError({"google_oauth": "GOOGLE_OAUTH_CLIENT_ID is not configured."})
 
         try:
-            from google.auth.transport import requests as google_requests
-            from google.oauth2 import id_token as google_id_token
+            from core.services.google_oauth import verify_google_id_token
 
-            payload = google_id_token.verify_oauth2_token(raw_token, google_requests.Request(), client_id)
+            payload = verify_google_id_token(raw_token, client_id)
         except ImportError as exc:
             raise ValidationError({"google_oauth": "google-auth library is not installed."}) from exc
         except ValueError as exc:
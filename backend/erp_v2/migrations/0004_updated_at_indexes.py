@@ -0,0 +1,67 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('erp_v2', '0003_bankstatementline_matched_entry_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='costcenter',
+            index=models.Index(fields=['updated_at'], name='erp_v2_cost_updated_184ddd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='glaccount',
+            index=models.Index(fields=['updated_at'], name='erp_v2_glac_updated_67c7ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='glentry',
+            index=models.Index(fields=['updated_at'], name='erp_v2_glen_updated_dce4b9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='glentryline',
+            index=models.Index(fields=['updated_at'], name='erp_v2_glen_updated_78a919_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mastercustomer',
+            index=models.Index(fields=['updated_at'], name='erp_v2_mast_updated_0666bd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='masteritem',
+            index=models.Index(fields=['updated_at'], name='erp_v2_mast_updated_228bc4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mastervendor',
+            index=models.Index(fields=['updated_at'], name='erp_v2_mast_updated_8399d9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseinvoice',
+            index=models.Index(fields=['updated_at'], name='erp_v2_purc_updated_ac5acc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesinvoice',
+            index=models.Index(fields=['updated_at'], name='erp_v2_sale_updated_d17a67_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesorder',
+            index=models.Index(fields=['updated_at'], name='erp_v2_sale_updated_181935_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salesquotation',
+            index=models.Index(fields=['updated_at'], name='erp_v2_sale_updated_4618b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='treasurypayment',
+            index=models.Index(fields=['updated_at'], name='erp_v2_trea_updated_3144e9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='treasuryreceipt',
+            index=models.Index(fields=['updated_at'], name='erp_v2_trea_updated_6f61d1_idx'),
+        ),
+    ]
@@ -25,6 +25,7 @@ class GLAccount(TimeStampedModel):
 
     class Meta:
         ordering = ["code"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -38,6 +39,7 @@ class CostCenter(TimeStampedModel):
 
     class Meta:
         ordering = ["code"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -53,6 +55,7 @@ class MasterCustomer(TimeStampedModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return self.name
@@ -67,6 +70,7 @@ class MasterVendor(TimeStampedModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return self.name
@@ -84,6 +88,7 @@ class MasterItem(TimeStampedModel):
 
     class Meta:
         ordering = ["sku"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self):
         return f"{self.sku} - {self.name}"
@@ -128,6 +133,9 @@ class SalesQuotation(TimeStampedModel):
     quotation_date = models.DateField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class SalesQuotationLine(TimeStampedModel):
     quotation = models.ForeignKey(SalesQuotation, on_delete=models.CASCADE, related_name="lines")
@@ -148,6 +156,9 @@ class SalesOrder(TimeStampedModel):
     quotation = models.ForeignKey(SalesQuotation, on_delete=models.SET_NULL, null=True, blank=True, related_name="orders")
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class SalesOrderLine(TimeStampedModel):
     order = models.ForeignKey(SalesOrder, on_delete=models.CASCADE, related_name="lines")
@@ -195,6 +206,9 @@ class SalesInvoice(TimeStampedModel):
         related_name="erp_v2_posted_sales_invoices",
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class SalesInvoiceLine(TimeStampedModel):
     invoice = models.ForeignKey(SalesInvoice, on_delete=models.CASCADE, related_name="lines")
@@ -270,6 +284,9 @@ class PurchaseInvoice(TimeStampedModel):
         related_name="erp_v2_posted_purchase_invoices",
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class PurchaseInvoiceLine(TimeStampedModel):
     invoice = models.ForeignKey(PurchaseInvoice, on_delete=models.CASCADE, related_name="lines")
@@ -291,6 +308,9 @@ class TreasuryReceipt(TimeStampedModel):
     channel = models.CharField(max_length=20, choices=Channel.choices, default=Channel.CASH)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class TreasuryPayment(TimeStampedModel):
     class Channel(models.TextChoices):
@@ -305,6 +325,9 @@ class TreasuryPayment(TimeStampedModel):
     channel = models.CharField(max_length=20, choices=Channel.choices, default=Channel.CASH)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class TreasuryCheque(TimeStampedModel):
     class Direction(models.TextChoices):
@@ -339,6 +362,9 @@ class GLEntry(TimeStampedModel):
     posted_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="erp_v2_posted_gl_entries")
     posted_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["updated_at"])]
+
 
 class GLEntryLine(TimeStampedModel):
     entry = models.ForeignKey(GLEntry, on_delete=models.CASCADE, related_name="lines")
@@ -357,6 +383,7 @@ class GLEntryLine(TimeStampedModel):
                 name="erp_v2_gl_line_one_side",
             )
         ]
+        indexes = [models.Index(fields=["updated_at"])]
 
 
 class PostingRule(TimeStampedModel):
@@ -0,0 +1,4 @@
+from core.services.search import register_search_index
+from .models import SalesInvoice
+
+register_search_index(SalesInvoice, fields=["invoice_number", "customer__name"])
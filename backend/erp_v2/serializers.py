@@ -2,6 +2,8 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from core.bulk import BulkCreateListSerializer
+from core.fieldsets import SparseFieldsetSerializerMixin
 from core.services.sequence import next_sequence
 
 from .models import (
@@ -89,6 +91,7 @@ class SalesQuotationLineSerializer(serializers.ModelSerializer):
     class Meta:
         model = SalesQuotationLine
         exclude = ["quotation"]
+        list_serializer_class = BulkCreateListSerializer
 
 
 class SalesQuotationSerializer(serializers.ModelSerializer):
@@ -353,7 +356,7 @@ class GLEntryLineSerializer(serializers.ModelSerializer):
         exclude = ["entry"]
 
 
-class GLEntrySerializer(serializers.ModelSerializer):
+class GLEntrySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     lines = GLEntryLineSerializer(many=True)
 
     class Meta:
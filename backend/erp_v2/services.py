@@ -7,10 +7,11 @@ from datetime import date, timedelta
 from decimal import Decimal
 
 from django.db import models, transaction
-from django.db.models import Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from core.services.report_runner import run_concurrently
 from core.services.sequence import next_sequence
 from finance.models import FiscalPeriod
 
@@ -889,36 +890,62 @@ def build_profitability(*, dimension: str, start_date: date | None = None, end_d
 
 
 def build_kpis():
-    sales_posted_total = (
-        SalesInvoice.objects.filter(status__in=[SalesInvoice.Status.POSTED, SalesInvoice.Status.PARTIALLY_PAID, SalesInvoice.Status.PAID]).aggregate(
-            total=Sum("total_amount")
-        )["total"]
-        or Decimal("0.00")
-    )
-    purchase_posted_total = (
-        PurchaseInvoice.objects.filter(status__in=[PurchaseInvoice.Status.POSTED, PurchaseInvoice.Status.PARTIALLY_PAID, PurchaseInvoice.Status.PAID]).aggregate(
-            total=Sum("total_amount")
-        )["total"]
-        or Decimal("0.00")
+    sales_posted_statuses = [SalesInvoice.Status.POSTED, SalesInvoice.Status.PARTIALLY_PAID, SalesInvoice.Status.PAID]
+    purchase_posted_statuses = [PurchaseInvoice.Status.POSTED, PurchaseInvoice.Status.PARTIALLY_PAID, PurchaseInvoice.Status.PAID]
+    (
+        customers,
+        vendors,
+        items,
+        quotations,
+        orders,
+        sales,
+        purchases,
+        receipts_total,
+        payments_total,
+    ) = run_concurrently(
+        MasterCustomer.objects.count,
+        MasterVendor.objects.count,
+        MasterItem.objects.count,
+        SalesQuotation.objects.count,
+        SalesOrder.objects.count,
+        lambda: SalesInvoice.objects.aggregate(
+            count=Count("id"),
+            posted_total=Sum("total_amount", filter=Q(status__in=sales_posted_statuses)),
+        ),
+        lambda: PurchaseInvoice.objects.aggregate(
+            count=Count("id"),
+            posted_total=Sum("total_amount", filter=Q(status__in=purchase_posted_statuses)),
+        ),
+        lambda: TreasuryReceipt.objects.aggregate(total=Sum("amount"))["total"],
+        lambda: TreasuryPayment.objects.aggregate(total=Sum("amount"))["total"],
     )
     return {
         "masters": {
-            "customers": MasterCustomer.objects.count(),
-            "vendors": MasterVendor.objects.count(),
-            "items": MasterItem.objects.count(),
+            "customers": customers,
+            "vendors": vendors,
+            "items": items,
         },
         "sales": {
-            "quotations": SalesQuotation.objects.count(),
-            "orders": SalesOrder.objects.count(),
-            "invoices": SalesInvoice.objects.count(),
-            "posted_total": sales_posted_total,
+            "quotations": quotations,
+            "orders": orders,
+            "invoices": sales["count"],
+            "posted_total": sales["posted_total"] or Decimal("0.00"),
         },
         "procurement": {
-            "purchase_invoices": PurchaseInvoice.objects.count(),
-            "posted_total": purchase_posted_total,
+            "purchase_invoices": purchases["count"],
+            "posted_total": purchases["posted_total"] or Decimal("0.00"),
         },
         "treasury": {
-            "receipts_total": TreasuryReceipt.objects.aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
-            "payments_total": TreasuryPayment.objects.aggregate(total=Sum("amount"))["total"] or Decimal("0.00"),
+            "receipts_total": receipts_total or Decimal("0.00"),
+            "payments_total": payments_total or Decimal("0.00"),
         },
     }
+
+
+def build_dashboard(*, start_date: date | None = None, end_date: date | None = None, as_of_date: date | None = None):
+    balance_sheet, income_statement, kpis = run_concurrently(
+        lambda: build_balance_sheet(as_of_date=as_of_date or end_date),
+        lambda: build_income_statement(start_date=start_date, end_date=end_date),
+        build_kpis,
+    )
+    return {"balance_sheet": balance_sheet, "income_statement": income_statement, "kpis": kpis}
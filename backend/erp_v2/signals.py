@@ -0,0 +1,33 @@
+from core.conditional import track_model_versions
+
+from .models import (
+    CostCenter,
+    GLAccount,
+    GLEntry,
+    GLEntryLine,
+    MasterCustomer,
+    MasterItem,
+    MasterVendor,
+    PurchaseInvoice,
+    SalesInvoice,
+    SalesOrder,
+    SalesQuotation,
+    TreasuryPayment,
+    TreasuryReceipt,
+)
+
+track_model_versions(
+    CostCenter,
+    GLAccount,
+    GLEntry,
+    GLEntryLine,
+    MasterCustomer,
+    MasterItem,
+    MasterVendor,
+    PurchaseInvoice,
+    SalesInvoice,
+    SalesOrder,
+    SalesQuotation,
+    TreasuryPayment,
+    TreasuryReceipt,
+)
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
+import time
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TransactionTestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-from erp_v2.models import GLEntry, GLEntryLine, InventoryLocation, InventoryMovement, MasterCustomer, MasterItem, MasterVendor, SalesInvoice
-from erp_v2.services import ensure_default_accounts
+from erp_v2.models import GLAccount, GLEntry, GLEntryLine, InventoryLocation, InventoryMovement, MasterCustomer, MasterItem, MasterVendor, SalesInvoice
+from erp_v2.services import build_balance_sheet, ensure_default_accounts
 from finance.models import FiscalPeriod
 
 
@@ -41,6 +44,80 @@ class TestErpV2Api(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["status"], "ok")
 
+    def test_dashboard_combines_statements_and_kpis(self):
+        response = self.client.get("/api/v2/reports/dashboard/", {"end_date": "2026-01-31"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"balance_sheet", "income_statement", "kpis"})
+        self.assertIn("is_balanced", response.data["balance_sheet"]["totals"])
+
+    def test_bulk_add_quotation_lines(self):
+        customer = MasterCustomer.objects.create(code="CUST-BULK", name="Bulk Customer")
+        item = MasterItem.objects.create(sku="SKU-BULK", name="Bulk Item", track_inventory=False)
+        quotation = self.client.post(
+            "/api/v2/sales/quotations/",
+            {"customer": customer.id, "quotation_date": str(date.today())},
+            format="json",
+        )
+        self.assertEqual(quotation.status_code, status.HTTP_201_CREATED)
+
+        invalid = self.client.post(
+            f"/api/v2/sales/quotations/{quotation.data['id']}/lines/bulk/",
+            [{"item": item.id, "quantity": "1.000", "unit_price": "5.00"}, {"item": item.id, "quantity": "x"}],
+            format="json",
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(invalid.data["items"][1]), {"quantity", "unit_price"})
+
+        response = self.client.post(
+            f"/api/v2/sales/quotations/{quotation.data['id']}/lines/bulk/",
+            [{"item": item.id, "quantity": f"{index + 1}.000", "unit_price": "5.00"} for index in range(5)],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["lines"]), 5)
+
+    def test_gl_account_list_answers_matching_etag_with_304(self):
+        first = self.client.get("/api/v2/finance/accounts/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+
+        with patch("erp_v2.views.GLAccountViewSet.get_serializer") as get_serializer:
+            cached = self.client.get("/api/v2/finance/accounts/", HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+        get_serializer.assert_not_called()
+
+        other_page = self.client.get("/api/v2/finance/accounts/", {"search": "cash"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_page.status_code, status.HTTP_200_OK)
+
+        GLAccount.objects.create(code="9999", name="Etag Probe", account_type=GLAccount.AccountType.EXPENSE)
+        changed = self.client.get("/api/v2/finance/accounts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_kpis_etag_follows_declared_models(self):
+        etag = self.client.get("/api/v2/reports/kpis/")["ETag"]
+        with patch("erp_v2.views.build_kpis") as build_kpis:
+            cached = self.client.get("/api/v2/reports/kpis/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        build_kpis.assert_not_called()
+
+        MasterVendor.objects.create(code="VEN-ETAG", name="Etag Vendor")
+        refreshed = self.client.get("/api/v2/reports/kpis/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+        self.assertEqual(refreshed.data["masters"]["vendors"], 1)
+
+    @override_settings(REPORT_TIME_BUDGET_SECONDS=0.05)
+    def test_report_exceeding_time_budget_returns_503(self):
+        def slow_balance_sheet(**kwargs):
+            time.sleep(0.1)
+            return build_balance_sheet(**kwargs)
+
+        with patch("erp_v2.services.build_balance_sheet", side_effect=slow_balance_sheet):
+            response = self.client.get("/api/v2/reports/dashboard/")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["detail"].code, "report_timeout")
+
     def test_kpis_endpoint(self):
         response = self.client.get("/api/v2/reports/kpis/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -347,3 +424,27 @@ class TestErpV2Api(APITestCase):
         with patch.dict("os.environ", {"POSTING_V2_MODE": "strict"}):
             blocked = self.client.post(f"/api/v2/sales/invoices/{invoice.data['id']}/post/", {}, format="json")
         self.assertEqual(blocked.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TestAsyncReports(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            username="erpv2-async",
+            email="erpv2-async@example.com",
+            password="pass1234",
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"}
+        MasterCustomer.objects.create(code="CUS-ASYNC", name="Async Customer")
+
+    def test_async_report_matches_sync_report(self):
+        response = self.client.get("/api/v2/reports/async/kpis/", **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["masters"]["customers"], 1)
+
+        sync_response = self.client.get("/api/v2/reports/kpis/", **self.auth)
+        self.assertEqual(response.json(), sync_response.json())
+
+    def test_async_report_requires_authentication_and_known_report(self):
+        self.assertEqual(self.client.get("/api/v2/reports/async/kpis/").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/api/v2/reports/async/unknown/", **self.auth)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
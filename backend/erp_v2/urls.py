@@ -2,6 +2,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    AsyncReportsView,
     BankReconciliationSessionViewSet,
     BankStatementViewSet,
     CostCenterViewSet,
@@ -57,5 +58,6 @@ router.register("reports", ReportsViewSet, basename="erp-v2-report")
 urlpatterns = [
     path("health/", health_view, name="erp-v2-health"),
     path("sales/pos/checkout/", POSCheckoutView.as_view(), name="erp-v2-pos-checkout"),
+    path("reports/async/<str:report>/", AsyncReportsView.as_view(), name="erp-v2-report-async"),
     path("", include(router.urls)),
 ]
@@ -10,6 +10,11 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError
 
+from core.bulk import run_bulk_create, validate_bulk_payload
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetViewMixin
+from core.pagination import HighVolumePagination
+from core.reporting import AsyncReportView, ReportTimeBudgetMixin
 from core.services.sequence import next_sequence
 from core.access import (
     ActionBasedRolePermission,
@@ -26,6 +31,7 @@ from .models import (
     BankStatement,
     CostCenter,
     GLEntry,
+    GLEntryLine,
     GLAccount,
     InventoryAdjustment,
     InventoryCountSession,
@@ -66,6 +72,7 @@ from .serializers import (
     PostingRuleSerializer,
     SalesInvoiceSerializer,
     SalesOrderSerializer,
+    SalesQuotationLineSerializer,
     SalesQuotationSerializer,
     TreasuryChequeSerializer,
     TreasuryPaymentSerializer,
@@ -78,6 +85,7 @@ from .services import (
     build_ap_aging,
     build_ar_aging,
     build_balance_sheet,
+    build_dashboard,
     build_income_statement,
     build_kpis,
     build_profitability,
@@ -94,6 +102,18 @@ READ_ROLES = {ROLE_ADMIN, ROLE_ACCOUNTANT, ROLE_PROJECT_MANAGER, ROLE_SITE_SUPER
 MANAGE_ROLES = {ROLE_ADMIN, ROLE_ACCOUNTANT}
 TREASURY_ROLES = {ROLE_ADMIN, ROLE_ACCOUNTANT, ROLE_CASHIER}
 STOCK_ROLES = {ROLE_ADMIN, ROLE_ACCOUNTANT, ROLE_STOREKEEPER}
+GL_REPORT_MODELS = (GLEntry, GLEntryLine, GLAccount)
+KPI_REPORT_MODELS = (
+    MasterCustomer,
+    MasterVendor,
+    MasterItem,
+    SalesQuotation,
+    SalesOrder,
+    SalesInvoice,
+    PurchaseInvoice,
+    TreasuryReceipt,
+    TreasuryPayment,
+)
 
 
 def _next_doc_number(sequence_key: str, prefix: str) -> str:
@@ -118,15 +138,17 @@ class BaseModelViewSet(viewsets.ModelViewSet):
     }
 
 
-class GLAccountViewSet(BaseModelViewSet):
+class GLAccountViewSet(ConditionalGetMixin, BaseModelViewSet):
     queryset = GLAccount.objects.all().order_by("code")
+    conditional_models = {"list": (GLAccount,), "retrieve": (GLAccount,)}
     serializer_class = GLAccountSerializer
     search_fields = ["code", "name"]
     ordering_fields = ["code", "name", "account_type"]
 
 
-class CostCenterViewSet(BaseModelViewSet):
+class CostCenterViewSet(ConditionalGetMixin, BaseModelViewSet):
     queryset = CostCenter.objects.all().order_by("code")
+    conditional_models = {"list": (CostCenter,), "retrieve": (CostCenter,)}
     serializer_class = CostCenterSerializer
     search_fields = ["code", "name"]
     ordering_fields = ["code", "name"]
@@ -164,6 +186,8 @@ class InventoryMovementViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = InventoryMovement.objects.select_related("item", "location").order_by("-movement_date", "-id")
     serializer_class = InventoryMovementSerializer
     permission_classes = [ActionBasedRolePermission]
+    pagination_class = HighVolumePagination
+    cursor_ordering = ("-id",)
     action_role_map = {"list": READ_ROLES, "retrieve": READ_ROLES}
     filterset_fields = ["item", "location", "movement_type", "movement_date"]
     search_fields = ["reference_type", "reference_id"]
@@ -216,6 +240,13 @@ class SalesQuotationViewSet(BaseModelViewSet):
     search_fields = ["quotation_number", "customer__name"]
     ordering_fields = ["quotation_date", "quotation_number"]
 
+    @action(detail=True, methods=["post"], url_path="lines/bulk")
+    def bulk_lines(self, request, pk=None):
+        quotation = self.get_object()
+        serializer = validate_bulk_payload(SalesQuotationLineSerializer, request.data, context=self.get_serializer_context())
+        run_bulk_create(lambda: serializer.save(quotation=quotation))
+        return Response(self.get_serializer(self.get_queryset().get(pk=quotation.pk)).data, status=status.HTTP_201_CREATED)
+
 
 class SalesOrderViewSet(BaseModelViewSet):
     queryset = SalesOrder.objects.select_related("customer", "quotation").prefetch_related("lines").order_by("-order_date", "-id")
@@ -525,9 +556,11 @@ class BankReconciliationSessionViewSet(BaseModelViewSet):
         return Response(self.get_serializer(session).data)
 
 
-class GLEntryViewSet(BaseModelViewSet):
+class GLEntryViewSet(SparseFieldsetViewMixin, BaseModelViewSet):
     queryset = GLEntry.objects.prefetch_related("lines", "lines__account").order_by("-entry_date", "-id")
     serializer_class = GLEntrySerializer
+    pagination_class = HighVolumePagination
+    cursor_ordering = ("-id",)
     filterset_fields = ["status", "entry_date", "source_type"]
     ordering_fields = ["entry_date", "entry_number"]
 
@@ -560,22 +593,35 @@ class PostingRuleViewSet(BaseModelViewSet):
     ordering_fields = ["source_type", "name"]
 
 
-class ReportsViewSet(viewsets.ViewSet):
+def _parse_report_date(value, field_name):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        raise ValidationError({field_name: "Invalid date format. Use YYYY-MM-DD."})
+
+
+class ReportsViewSet(ConditionalGetMixin, ReportTimeBudgetMixin, viewsets.ViewSet):
     permission_classes = [ActionBasedRolePermission]
     action_role_map = {"*": READ_ROLES}
-
-    def _parse_date(self, value, field_name):
-        if not value:
-            return None
-        try:
-            return date.fromisoformat(str(value))
-        except ValueError:
-            raise ValidationError({field_name: "Invalid date format. Use YYYY-MM-DD."})
+    conditional_models = {
+        "trial_balance": GL_REPORT_MODELS,
+        "income_statement": GL_REPORT_MODELS,
+        "balance_sheet": GL_REPORT_MODELS,
+        "profitability_customers": (*GL_REPORT_MODELS, MasterCustomer),
+        "profitability_items": (*GL_REPORT_MODELS, MasterItem),
+        "profitability_cost_centers": (*GL_REPORT_MODELS, CostCenter),
+        "ar_aging": (SalesInvoice, MasterCustomer),
+        "ap_aging": (PurchaseInvoice, MasterVendor),
+        "kpis": KPI_REPORT_MODELS,
+        "dashboard": (*GL_REPORT_MODELS, *KPI_REPORT_MODELS),
+    }
 
     @action(detail=False, methods=["get"], url_path="trial-balance")
     def trial_balance(self, request):
-        start_date = self._parse_date(request.query_params.get("start_date"), "start_date")
-        end_date = self._parse_date(request.query_params.get("end_date"), "end_date")
+        start_date = _parse_report_date(request.query_params.get("start_date"), "start_date")
+        end_date = _parse_report_date(request.query_params.get("end_date"), "end_date")
         return Response(build_trial_balance(start_date=start_date, end_date=end_date))
 
     @action(detail=False, methods=["get"], url_path="kpis")
@@ -584,39 +630,69 @@ class ReportsViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=["get"], url_path="income-statement")
     def income_statement(self, request):
-        start_date = self._parse_date(request.query_params.get("start_date"), "start_date")
-        end_date = self._parse_date(request.query_params.get("end_date"), "end_date")
+        start_date = _parse_report_date(request.query_params.get("start_date"), "start_date")
+        end_date = _parse_report_date(request.query_params.get("end_date"), "end_date")
         return Response(build_income_statement(start_date=start_date, end_date=end_date))
 
     @action(detail=False, methods=["get"], url_path="balance-sheet")
     def balance_sheet(self, request):
-        as_of_date = self._parse_date(request.query_params.get("as_of_date"), "as_of_date")
+        as_of_date = _parse_report_date(request.query_params.get("as_of_date"), "as_of_date")
         return Response(build_balance_sheet(as_of_date=as_of_date))
 
     @action(detail=False, methods=["get"], url_path="ar-aging")
     def ar_aging(self, request):
-        as_of_date = self._parse_date(request.query_params.get("as_of_date"), "as_of_date")
+        as_of_date = _parse_report_date(request.query_params.get("as_of_date"), "as_of_date")
         return Response(build_ar_aging(as_of_date=as_of_date))
 
     @action(detail=False, methods=["get"], url_path="ap-aging")
     def ap_aging(self, request):
-        as_of_date = self._parse_date(request.query_params.get("as_of_date"), "as_of_date")
+        as_of_date = _parse_report_date(request.query_params.get("as_of_date"), "as_of_date")
         return Response(build_ap_aging(as_of_date=as_of_date))
 
     @action(detail=False, methods=["get"], url_path="profitability/customers")
     def profitability_customers(self, request):
-        start_date = self._parse_date(request.query_params.get("start_date"), "start_date")
-        end_date = self._parse_date(request.query_params.get("end_date"), "end_date")
+        start_date = _parse_report_date(request.query_params.get("start_date"), "start_date")
+        end_date = _parse_report_date(request.query_params.get("end_date"), "end_date")
         return Response(build_profitability(dimension="customers", start_date=start_date, end_date=end_date))
 
     @action(detail=False, methods=["get"], url_path="profitability/items")
     def profitability_items(self, request):
-        start_date = self._parse_date(request.query_params.get("start_date"), "start_date")
-        end_date = self._parse_date(request.query_params.get("end_date"), "end_date")
+        start_date = _parse_report_date(request.query_params.get("start_date"), "start_date")
+        end_date = _parse_report_date(request.query_params.get("end_date"), "end_date")
         return Response(build_profitability(dimension="items", start_date=start_date, end_date=end_date))
 
     @action(detail=False, methods=["get"], url_path="profitability/cost-centers")
     def profitability_cost_centers(self, request):
-        start_date = self._parse_date(request.query_params.get("start_date"), "start_date")
-        end_date = self._parse_date(request.query_params.get("end_date"), "end_date")
+        start_date = _parse_report_date(request.query_params.get("start_date"), "start_date")
+        end_date = _parse_report_date(request.query_params.get("end_date"), "end_date")
         return Response(build_profitability(dimension="cost-centers", start_date=start_date, end_date=end_date))
+
+    @action(detail=False, methods=["get"], url_path="dashboard")
+    def dashboard(self, request):
+        return Response(build_dashboard(**_report_kwargs(request, "dashboard")))
+
+
+def _report_kwargs(request, report: str) -> dict:
+    return {
+        field_name: _parse_report_date(request.query_params.get(field_name), field_name)
+        for field_name in ASYNC_REPORTS[report][1]
+    }
+
+
+ASYNC_REPORTS = {
+    "trial_balance": (build_trial_balance, ("start_date", "end_date")),
+    "income_statement": (build_income_statement, ("start_date", "end_date")),
+    "balance_sheet": (build_balance_sheet, ("as_of_date",)),
+    "ar_aging": (build_ar_aging, ("as_of_date",)),
+    "ap_aging": (build_ap_aging, ("as_of_date",)),
+    "kpis": (build_kpis, ()),
+    "dashboard": (build_dashboard, ("start_date", "end_date", "as_of_date")),
+}
+
+
+class AsyncReportsView(AsyncReportView):
+    action_role_map = ReportsViewSet.action_role_map
+    reports = {name: builder for name, (builder, _) in ASYNC_REPORTS.items()}
+
+    def get_report_kwargs(self, request, report: str) -> dict:
+        return _report_kwargs(request, report)
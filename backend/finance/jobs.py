@@ -0,0 +1,57 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils.dateparse import parse_date
+
+from core.renderers import to_json_compatible
+from core.services.jobs import register_job, report_progress
+from .services.reporting import (
+    build_balance_sheet,
+    build_general_journal,
+    build_general_ledger,
+    build_income_statement,
+    build_trial_balance,
+)
+from .services.year_close import close_fiscal_year
+
+REPORT_JOB = "finance.report"
+RECURRING_ENTRIES_JOB = "finance.run_recurring_entries"
+YEAR_CLOSE_JOB = "finance.year_close"
+
+REPORT_BUILDERS = {
+    "trial_balance": build_trial_balance,
+    "general_journal": build_general_journal,
+    "general_ledger": build_general_ledger,
+    "balance_sheet": build_balance_sheet,
+    "income_statement": build_income_statement,
+}
+DATE_PARAMS = {"start_date", "end_date", "as_of_date"}
+
+
+@register_job(REPORT_JOB)
+def run_report_job(job, payload):
+    builder = REPORT_BUILDERS[payload["report"]]
+    params = {
+        key: parse_date(value) if key in DATE_PARAMS and value else value
+        for key, value in payload.get("params", {}).items()
+    }
+    report_progress(job, 10, f"Building {payload['report']}")
+    # Store the report exactly as the synchronous endpoint would render it.
+    return to_json_compatible(builder(**params))
+
+
+def run_recurring_entries(as_of_date: str | None) -> dict:
+    output = StringIO()
+    call_command("run_recurring_entries", as_of_date=as_of_date, stdout=output)
+    return {"as_of_date": as_of_date, "output": output.getvalue().strip()}
+
+
+@register_job(RECURRING_ENTRIES_JOB)
+def run_recurring_entries_job(job, payload):
+    return run_recurring_entries(payload.get("as_of_date"))
+
+
+@register_job(YEAR_CLOSE_JOB)
+def run_year_close_job(job, payload):
+    report_progress(job, 10, f"Closing fiscal year {payload['year']}")
+    return to_json_compatible(close_fiscal_year(payload["year"], job.created_by))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from finance.services.invoice_payments import find_invoice_balance_mismatches, fix_invoice_balances
+
+
+class Command(BaseCommand):
+    help = "Compare invoice paid amounts against confirmed payments and optionally repair drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rewrite drifted paid amounts from the confirmed payment totals.",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = find_invoice_balance_mismatches()
+        for mismatch in mismatches:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{mismatch['invoice_number']}: paid_amount {mismatch['paid_amount']} != confirmed payments {mismatch['expected']}"
+                )
+            )
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All invoice paid amounts match confirmed payments."))
+            return
+        if not options["fix"]:
+            self.stdout.write(self.style.WARNING(f"Found {len(mismatches)} drifted invoices; rerun with --fix to repair."))
+            return
+
+        with transaction.atomic():
+            fixed = fix_invoice_balances(mismatches)
+        self.stdout.write(self.style.SUCCESS(f"Repaired {fixed} invoice paid amounts."))
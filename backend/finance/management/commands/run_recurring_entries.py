@@ -7,8 +7,9 @@ from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
+from core.services.company_profile import get_base_currency
 from finance.models import JournalEntry, JournalEntryRecurringDetail, JournalLine, RecurringEntryTemplate
-from finance.services.posting_engine import BASE_CURRENCY, PostingEngine, quantize_money
+from finance.services.posting_engine import PostingEngine, quantize_money
 
 
 def add_months(base_date: date, months: int) -> date:
@@ -63,6 +64,7 @@ class Command(BaseCommand):
             .order_by("next_run_date", "template_code")
         )
 
+        base_currency = get_base_currency()
         created_count = 0
 
         for template in templates:
@@ -106,8 +108,8 @@ class Command(BaseCommand):
                         "description": line.description,
                         "debit": debit,
                         "credit": credit,
-                        "debit_foreign": amount_foreign if template.currency != BASE_CURRENCY and debit > 0 else None,
-                        "credit_foreign": amount_foreign if template.currency != BASE_CURRENCY and credit > 0 else None,
+                        "debit_foreign": amount_foreign if template.currency != base_currency and debit > 0 else None,
+                        "credit_foreign": amount_foreign if template.currency != base_currency and credit > 0 else None,
                         "project": template.project,
                     }
                 )
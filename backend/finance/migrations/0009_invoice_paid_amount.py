@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:20
+
+import django.db.models.expressions
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_invoice_paid_amounts(apps, schema_editor):
+    Invoice = apps.get_model("finance", "Invoice")
+    Payment = apps.get_model("finance", "Payment")
+
+    rows = Payment.objects.filter(status="confirmed").order_by().values("invoice_id").annotate(confirmed_total=Sum("amount"))
+    invoices = [Invoice(pk=row["invoice_id"], paid_amount=row["confirmed_total"]) for row in rows]
+    Invoice.objects.bulk_update(invoices, ["paid_amount"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0008_invoice_customer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.RunPython(backfill_invoice_paid_amounts, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='invoice',
+            name='outstanding_amount',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('total_amount'), '-', models.F('paid_amount')), output_field=models.DecimalField(decimal_places=2, max_digits=14)),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['invoice_type', 'outstanding_amount'], name='finance_inv_invoice_3826eb_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0009_invoice_paid_amount'),
+        ('projects', '0006_project_cost_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['updated_at'], name='finance_acc_updated_e10baa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['updated_at'], name='finance_jou_updated_99dc55_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalline',
+            index=models.Index(fields=['updated_at'], name='finance_jou_updated_35ab76_idx'),
+        ),
+    ]
@@ -40,6 +40,7 @@ class Account(TimeStampedModel):
 
     class Meta:
         ordering = ["code"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.name}"
@@ -231,6 +232,7 @@ class JournalEntry(TimeStampedModel):
             models.Index(fields=["status", "entry_date"]),
             models.Index(fields=["entry_class", "entry_date"]),
             models.Index(fields=["source_module", "source_event"]),
+            models.Index(fields=["updated_at"]),
         ]
 
     def __str__(self) -> str:
@@ -283,6 +285,7 @@ class JournalLine(TimeStampedModel):
                 name="finance_journal_line_one_side_non_zero",
             )
         ]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return f"{self.entry.entry_number} - {self.account.code}"
@@ -683,6 +686,13 @@ class Invoice(TimeStampedModel):
     subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
     tax_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
     total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    # Sum of confirmed payments, kept current by finance.signals; reconcile_invoice_balances checks it.
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    outstanding_amount = models.GeneratedField(
+        expression=models.F("total_amount") - models.F("paid_amount"),
+        output_field=models.DecimalField(max_digits=14, decimal_places=2),
+        db_persist=True,
+    )
     notes = models.TextField(blank=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -719,6 +729,9 @@ class Invoice(TimeStampedModel):
 
     class Meta:
         ordering = ["-issue_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["invoice_type", "outstanding_amount"]),
+        ]
 
     def __str__(self) -> str:
         return self.invoice_number
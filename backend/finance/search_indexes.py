@@ -0,0 +1,8 @@
+from core.services.search import register_search_index
+from .models import Invoice, JournalEntry
+
+register_search_index(
+    JournalEntry,
+    fields=["entry_number", "description", "project__code", "source_module", "source_event"],
+)
+register_search_index(Invoice, fields=["invoice_number", "partner_name", "project__code", "cost_code__code"])
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from core.fieldsets import SparseFieldsetSerializerMixin
 from projects.models import Project
 from .models import (
     Account,
@@ -71,7 +72,7 @@ class JournalLineSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]
 
 
-class JournalEntrySerializer(serializers.ModelSerializer):
+class JournalEntrySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     lines = JournalLineSerializer(many=True)
 
     class Meta:
@@ -156,6 +157,30 @@ class JournalEntrySerializer(serializers.ModelSerializer):
         return instance
 
 
+class JournalEntryListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = JournalEntry
+        fields = [
+            "id",
+            "entry_number",
+            "entry_date",
+            "description",
+            "status",
+            "entry_class",
+            "source_module",
+            "source_event",
+            "currency",
+            "period",
+            "project",
+            "posted_at",
+            "created_at",
+        ]
+        read_only_fields = fields
+        expandable_fields = {
+            "lines": (JournalLineSerializer, {"many": True, "read_only": True}),
+        }
+
+
 class FiscalPeriodSerializer(serializers.ModelSerializer):
     class Meta:
         model = FiscalPeriod
@@ -459,6 +484,7 @@ class InvoiceItemSerializer(serializers.ModelSerializer):
 
 class InvoiceSerializer(serializers.ModelSerializer):
     items = InvoiceItemSerializer(many=True, required=False)
+    outstanding_amount = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
 
     class Meta:
         model = Invoice
@@ -477,6 +503,8 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "subtotal",
             "tax_amount",
             "total_amount",
+            "paid_amount",
+            "outstanding_amount",
             "notes",
             "created_by",
             "submitted_at",
@@ -501,6 +529,7 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "subtotal",
             "tax_amount",
             "total_amount",
+            "paid_amount",
             "submitted_at",
             "submitted_by",
             "approved_at",
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+HEADER_FILL_COLOR = "F1F5F9"
+
+
+def build_workbook(headers: list[str], rows, *, sheet_title: str, title: str = "", subtitle: str = "") -> bytes:
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = sheet_title
+
+    header_row_index = 1
+    if title:
+        sheet["A1"] = title
+        sheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
+        sheet["A1"].font = Font(size=14, bold=True)
+        sheet["A1"].alignment = Alignment(horizontal="center")
+
+        sheet["A2"] = subtitle
+        sheet.merge_cells(start_row=2, start_column=1, end_row=2, end_column=len(headers))
+        sheet["A2"].alignment = Alignment(horizontal="center")
+        header_row_index = 3
+
+    sheet.append(headers)
+    header_fill = PatternFill("solid", fgColor=HEADER_FILL_COLOR)
+    for col_idx in range(1, len(headers) + 1):
+        cell = sheet.cell(row=header_row_index, column=col_idx)
+        cell.font = Font(bold=True)
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal="center")
+        sheet.column_dimensions[cell.column_letter].width = 18
+
+    for row in rows:
+        sheet.append(row)
+
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def open_active_sheet(upload):
+    return load_workbook(upload, data_only=True).active
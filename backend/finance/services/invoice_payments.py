@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from finance.models import Invoice, Payment
+
+ZERO = Decimal("0.00")
+PAYABLE_INVOICE_STATUSES = {
+    Invoice.InvoiceStatus.ISSUED,
+    Invoice.InvoiceStatus.PARTIALLY_PAID,
+    Invoice.InvoiceStatus.PAID,
+}
+
+
+def confirmed_contribution(invoice_id, status, amount) -> dict[int, Decimal]:
+    if invoice_id is None or status != Payment.Status.CONFIRMED or not amount:
+        return {}
+    return {invoice_id: amount}
+
+
+def apply_invoice_paid_deltas(deltas: dict[int, Decimal]):
+    now = timezone.now()
+    for invoice_id, delta in deltas.items():
+        if delta:
+            # An increment, so concurrent confirmations on the same invoice cannot overwrite each other.
+            Invoice.objects.filter(pk=invoice_id).update(paid_amount=F("paid_amount") + delta, updated_at=now)
+
+
+def payment_change_deltas(previous: dict[int, Decimal], current: dict[int, Decimal]) -> dict[int, Decimal]:
+    deltas: dict[int, Decimal] = defaultdict(lambda: ZERO)
+    for invoice_id, amount in previous.items():
+        deltas[invoice_id] -= amount
+    for invoice_id, amount in current.items():
+        deltas[invoice_id] += amount
+    return dict(deltas)
+
+
+def sync_invoice_payment_status(invoice: Invoice) -> None:
+    invoice.refresh_from_db(fields=["paid_amount", "outstanding_amount", "status"])
+    if invoice.status not in PAYABLE_INVOICE_STATUSES:
+        return
+
+    if invoice.paid_amount >= invoice.total_amount and invoice.total_amount > ZERO:
+        new_status = Invoice.InvoiceStatus.PAID
+    elif invoice.paid_amount > ZERO:
+        new_status = Invoice.InvoiceStatus.PARTIALLY_PAID
+    else:
+        new_status = Invoice.InvoiceStatus.ISSUED
+
+    if invoice.status != new_status:
+        invoice.status = new_status
+        invoice.save(update_fields=["status", "updated_at"])
+
+
+def confirmed_payment_totals() -> dict[int, Decimal]:
+    rows = (
+        Payment.objects.filter(status=Payment.Status.CONFIRMED)
+        .order_by()
+        .values("invoice_id")
+        .annotate(confirmed_total=Sum("amount"))
+    )
+    return {row["invoice_id"]: row["confirmed_total"] for row in rows}
+
+
+def find_invoice_balance_mismatches() -> list[dict]:
+    totals = confirmed_payment_totals()
+    mismatches = []
+    invoices = Invoice.objects.order_by("pk").values_list("pk", "invoice_number", "paid_amount")
+    for invoice_id, invoice_number, paid_amount in invoices.iterator(chunk_size=2000):
+        expected = totals.get(invoice_id, ZERO)
+        if paid_amount != expected:
+            mismatches.append({"invoice_id": invoice_id, "invoice_number": invoice_number, "paid_amount": paid_amount, "expected": expected})
+    return mismatches
+
+
+def fix_invoice_balances(mismatches: list[dict]) -> int:
+    apply_invoice_paid_deltas({mismatch["invoice_id"]: mismatch["expected"] - mismatch["paid_amount"] for mismatch in mismatches})
+    return len(mismatches)
@@ -38,6 +38,15 @@ def _next_auto_entry_number(prefix: str = "AUTO") -> str:
     return candidate
 
 
+def next_related_entry_number(prefix: str, base_entry_number: str) -> str:
+    candidate = f"{prefix}-{base_entry_number}"
+    counter = 1
+    while JournalEntry.objects.filter(entry_number=candidate).exists():
+        candidate = f"{prefix}-{base_entry_number}-{counter:02d}"
+        counter += 1
+    return candidate
+
+
 class PostingEngine:
     @classmethod
     def resolve_period(cls, entry_date: date) -> FiscalPeriod | None:
@@ -6,6 +6,7 @@ from typing import Any
 
 from django.db.models import Sum
 
+from core.services.report_runner import run_concurrently
 from finance.models import Account, JournalEntry, JournalLine
 
 
@@ -38,8 +39,10 @@ def _aggregate_by_account(queryset):
 def build_trial_balance(*, start_date: date, end_date: date, project_id: int | None = None) -> dict[str, Any]:
     lines_qs = posted_lines_queryset(project_id=project_id)
 
-    opening_map = _aggregate_by_account(lines_qs.filter(entry__entry_date__lt=start_date))
-    period_map = _aggregate_by_account(lines_qs.filter(entry__entry_date__gte=start_date, entry__entry_date__lte=end_date))
+    opening_map, period_map = run_concurrently(
+        lambda: _aggregate_by_account(lines_qs.filter(entry__entry_date__lt=start_date)),
+        lambda: _aggregate_by_account(lines_qs.filter(entry__entry_date__gte=start_date, entry__entry_date__lte=end_date)),
+    )
 
     account_ids = set(opening_map.keys()) | set(period_map.keys())
     account_map = {account.id: account for account in Account.objects.filter(id__in=account_ids).order_by("code")}
@@ -159,13 +162,15 @@ def build_general_journal(*, start_date: date, end_date: date, project_id: int |
 
 def build_general_ledger(*, start_date: date, end_date: date, project_id: int | None = None) -> dict[str, Any]:
     lines_qs = posted_lines_queryset(project_id=project_id)
-    opening_map = _aggregate_by_account(lines_qs.filter(entry__entry_date__lt=start_date))
-
-    period_lines = (
+    period_lines_qs = (
         lines_qs.filter(entry__entry_date__gte=start_date, entry__entry_date__lte=end_date)
         .select_related("entry", "account")
         .order_by("account__code", "entry__entry_date", "entry__entry_number", "id")
     )
+    opening_map, period_lines = run_concurrently(
+        lambda: _aggregate_by_account(lines_qs.filter(entry__entry_date__lt=start_date)),
+        lambda: list(period_lines_qs),
+    )
 
     grouped: dict[int, dict[str, Any]] = {}
 
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from finance.models import Account, FiscalPeriod, JournalEntry, JournalLine
+from finance.services.posting_engine import next_related_entry_number
+
+
+@transaction.atomic
+def close_fiscal_year(fiscal_year: int, user) -> dict:
+    retained_earnings_account = (
+        Account.objects.filter(code="3300").first()
+        or Account.objects.filter(account_type=Account.AccountType.EQUITY).order_by("code").first()
+    )
+    if not retained_earnings_account:
+        raise ValidationError(
+            {"account": "Retained earnings account not found. Configure equity account code 3300 or any equity account."}
+        )
+
+    year_lines = JournalLine.objects.filter(
+        entry__status=JournalEntry.Status.POSTED,
+        entry__entry_date__year=fiscal_year,
+        account__account_type__in=[Account.AccountType.REVENUE, Account.AccountType.EXPENSE],
+    )
+    aggregated = year_lines.values("account_id", "account__account_type").annotate(
+        debit=Sum("debit"),
+        credit=Sum("credit"),
+    )
+    if not aggregated:
+        return {"detail": f"No temporary balances found for fiscal year {fiscal_year}."}
+
+    entry_lines = []
+    total_debit = Decimal("0.00")
+    total_credit = Decimal("0.00")
+    net_income = Decimal("0.00")
+
+    for row in aggregated:
+        account_id = row["account_id"]
+        account_type = row["account__account_type"]
+        debit = row["debit"] or Decimal("0.00")
+        credit = row["credit"] or Decimal("0.00")
+
+        if account_type == Account.AccountType.REVENUE:
+            balance = credit - debit
+            if balance == Decimal("0.00"):
+                continue
+            entry_lines.append(
+                {
+                    "account_id": account_id,
+                    "description": f"Close revenue account {account_id}",
+                    "debit": balance if balance > 0 else Decimal("0.00"),
+                    "credit": -balance if balance < 0 else Decimal("0.00"),
+                }
+            )
+            net_income += balance
+        else:
+            balance = debit - credit
+            if balance == Decimal("0.00"):
+                continue
+            entry_lines.append(
+                {
+                    "account_id": account_id,
+                    "description": f"Close expense account {account_id}",
+                    "debit": Decimal("0.00") if balance > 0 else -balance,
+                    "credit": balance if balance > 0 else Decimal("0.00"),
+                }
+            )
+            net_income -= balance
+
+    if net_income >= Decimal("0.00"):
+        retained_debit = Decimal("0.00")
+        retained_credit = net_income
+    else:
+        retained_debit = -net_income
+        retained_credit = Decimal("0.00")
+
+    entry_lines.append(
+        {
+            "account_id": retained_earnings_account.id,
+            "description": f"Transfer net result {fiscal_year}",
+            "debit": retained_debit,
+            "credit": retained_credit,
+        }
+    )
+
+    for line in entry_lines:
+        total_debit += line["debit"]
+        total_credit += line["credit"]
+    if total_debit != total_credit:
+        raise ValidationError(
+            {"year_close": f"Year close entry is not balanced ({total_debit} debit vs {total_credit} credit)."}
+        )
+
+    closing_entry = JournalEntry.objects.create(
+        entry_number=next_related_entry_number("CLS", str(fiscal_year)),
+        entry_date=date(fiscal_year, 12, 31),
+        description=f"Year closing entry for {fiscal_year}",
+        status=JournalEntry.Status.POSTED,
+        entry_class=JournalEntry.EntryClass.CLOSING,
+        currency="KWD",
+        fx_rate_to_base=Decimal("1.00000000"),
+        period=FiscalPeriod.objects.filter(year=fiscal_year, month=12).first(),
+        posted_at=timezone.now(),
+        posted_by=user,
+        created_by=user,
+    )
+    for line in entry_lines:
+        JournalLine.objects.create(
+            entry=closing_entry,
+            account_id=line["account_id"],
+            description=line["description"],
+            debit=line["debit"],
+            credit=line["credit"],
+        )
+
+    return {
+        "entry_id": closing_entry.id,
+        "entry_number": closing_entry.entry_number,
+        "fiscal_year": fiscal_year,
+        "net_income_transferred": net_income,
+    }
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.conditional import track_model_versions
+
+from .models import Account, JournalEntry, JournalLine, Payment
+from .services.invoice_payments import apply_invoice_paid_deltas, confirmed_contribution, payment_change_deltas
+
+PAID_AMOUNT_FIELDS = {"invoice", "status", "amount"}
+
+track_model_versions(Account, JournalEntry, JournalLine)
+
+
+@receiver(pre_save, sender=Payment, dispatch_uid="finance_payment_remember_paid_contribution")
+def remember_paid_contribution(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_paid_contribution = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not PAID_AMOUNT_FIELDS & set(update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list("invoice_id", "status", "amount").first()
+    instance._previous_paid_contribution = confirmed_contribution(*previous) if previous else {}
+
+
+@receiver(post_save, sender=Payment, dispatch_uid="finance_payment_apply_paid_amount")
+def apply_paid_amount_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_previous_paid_contribution", None)
+    if previous is None and not created:
+        return
+    current = confirmed_contribution(instance.invoice_id, instance.status, instance.amount)
+    apply_invoice_paid_deltas(payment_change_deltas(previous or {}, current))
+
+
+@receiver(post_delete, sender=Payment, dispatch_uid="finance_payment_apply_paid_amount_on_delete")
+def apply_paid_amount_on_delete(sender, instance, **kwargs):
+    apply_invoice_paid_deltas(payment_change_deltas(confirmed_contribution(instance.invoice_id, instance.status, instance.amount), {}))
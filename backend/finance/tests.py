@@ -1,13 +1,19 @@
 from datetime import date
-from io import BytesIO
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from openpyxl import Workbook
 
-from core.models import Role
-from .models import Account, Invoice
+from core.models import Job, Role, SearchEntry
+from core.services.jobs import run_worker
+from .models import Account, Invoice, JournalEntry, Payment
 from projects.models import CostCode, Project, ProjectCostRecord
 
 
@@ -155,6 +161,12 @@ class TestFinanceApi(APITestCase):
         invoice_after_first_payment = self.client.get(f"/api/v1/finance/invoices/{invoice_id}/")
         self.assertEqual(invoice_after_first_payment.status_code, status.HTTP_200_OK)
         self.assertEqual(invoice_after_first_payment.data["status"], "partially_paid")
+        self.assertEqual(invoice_after_first_payment.data["paid_amount"], "500.00")
+        self.assertEqual(invoice_after_first_payment.data["outstanding_amount"], "650.00")
+
+        approve_again = self.client.post(f"/api/v1/finance/payments/{payment_one_id}/approve/", {}, format="json")
+        self.assertEqual(approve_again.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Invoice.objects.get(pk=invoice_id).paid_amount, Decimal("500.00"))
 
         self.client.force_authenticate(user=self.user)
         payment_two_payload = {
@@ -181,6 +193,55 @@ class TestFinanceApi(APITestCase):
         invoice_after_second_payment = self.client.get(f"/api/v1/finance/invoices/{invoice_id}/")
         self.assertEqual(invoice_after_second_payment.status_code, status.HTTP_200_OK)
         self.assertEqual(invoice_after_second_payment.data["status"], "paid")
+        self.assertEqual(invoice_after_second_payment.data["paid_amount"], "1150.00")
+        self.assertEqual(invoice_after_second_payment.data["outstanding_amount"], "0.00")
+
+    def test_reconcile_invoice_balances_repairs_drift(self):
+        paid = Invoice.objects.create(
+            invoice_number="INV-REC-1",
+            invoice_type=Invoice.InvoiceType.CUSTOMER,
+            partner_name="ACME",
+            issue_date=date.today(),
+            total_amount=Decimal("300.00"),
+            status=Invoice.InvoiceStatus.ISSUED,
+            created_by=self.user,
+        )
+        open_invoice = Invoice.objects.create(
+            invoice_number="INV-REC-2",
+            invoice_type=Invoice.InvoiceType.CUSTOMER,
+            partner_name="ACME",
+            issue_date=date.today(),
+            total_amount=Decimal("200.00"),
+            status=Invoice.InvoiceStatus.ISSUED,
+            created_by=self.user,
+        )
+        Payment.objects.create(
+            invoice=paid,
+            payment_date=date.today(),
+            amount=Decimal("300.00"),
+            method=Payment.Method.CASH,
+            status=Payment.Status.CONFIRMED,
+        )
+        Payment.objects.create(invoice=open_invoice, payment_date=date.today(), amount=Decimal("50.00"), method=Payment.Method.CASH)
+        paid.refresh_from_db()
+        self.assertEqual(paid.paid_amount, Decimal("300.00"))
+        self.assertEqual(paid.outstanding_amount, Decimal("0.00"))
+
+        response = self.client.get("/api/v1/finance/invoices/", {"outstanding": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["invoice_number"] for row in response.data["results"]], ["INV-REC-2"])
+
+        Invoice.objects.filter(pk=paid.pk).update(paid_amount=Decimal("120.00"))
+        output = StringIO()
+        call_command("reconcile_invoice_balances", stdout=output)
+        self.assertIn("INV-REC-1", output.getvalue())
+        paid.refresh_from_db()
+        self.assertEqual(paid.paid_amount, Decimal("120.00"))
+
+        call_command("reconcile_invoice_balances", fix=True, stdout=StringIO())
+        paid.refresh_from_db()
+        self.assertEqual(paid.paid_amount, Decimal("300.00"))
+        self.assertEqual(paid.outstanding_amount, Decimal("0.00"))
 
     def test_supplier_invoice_approval_creates_project_actual_cost_record(self):
         project = Project.objects.create(
@@ -738,6 +799,165 @@ class TestFinanceApi(APITestCase):
         )
         self.assertEqual(create_entry.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_journal_entry_list_supports_compact_and_sparse_fieldsets(self):
+        self.client.post(
+            "/api/v1/finance/journal-entries/",
+            {
+                "entry_number": "JE-SPARSE-001",
+                "entry_date": str(date.today()),
+                "description": "Sparse entry",
+                "lines": [
+                    {"account": self.account1.id, "debit": "50.00", "credit": "0.00"},
+                    {"account": self.account2.id, "debit": "0.00", "credit": "50.00"},
+                ],
+            },
+            format="json",
+        )
+
+        compact = self.client.get("/api/v1/finance/journal-entries/", {"compact": "true"})
+        self.assertEqual(compact.status_code, status.HTTP_200_OK)
+        self.assertNotIn("lines", compact.data["results"][0])
+        self.assertEqual(compact.data["results"][0]["entry_number"], "JE-SPARSE-001")
+
+        expanded = self.client.get("/api/v1/finance/journal-entries/", {"compact": "true", "expand": "lines"})
+        self.assertEqual(len(expanded.data["results"][0]["lines"]), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            sparse = self.client.get("/api/v1/finance/journal-entries/", {"fields": "entry_number,status"})
+        self.assertEqual(set(sparse.data["results"][0]), {"id", "entry_number", "status"})
+        self.assertFalse(any("finance_journalline" in query["sql"] for query in queries.captured_queries))
+
+    def test_journal_entry_search_uses_full_text_index(self):
+        descriptions = {
+            "JE-FTS-001": "Concrete pour for tower foundation",
+            "JE-FTS-002": "Steel delivery",
+            "JE-FTS-003": "Concrete curing, concrete testing",
+        }
+        for entry_number, description in descriptions.items():
+            response = self.client.post(
+                "/api/v1/finance/journal-entries/",
+                {
+                    "entry_number": entry_number,
+                    "entry_date": str(date.today()),
+                    "description": description,
+                    "lines": [
+                        {"account": self.account1.id, "debit": "10.00", "credit": "0.00"},
+                        {"account": self.account2.id, "debit": "0.00", "credit": "10.00"},
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as queries:
+            ranked = self.client.get("/api/v1/finance/journal-entries/", {"search": "concr"})
+        self.assertEqual([row["entry_number"] for row in ranked.data["results"]], ["JE-FTS-003", "JE-FTS-001"])
+        self.assertTrue(any("core_searchentry_fts" in query["sql"] for query in queries.captured_queries))
+
+        ordered = self.client.get("/api/v1/finance/journal-entries/", {"search": "concrete", "ordering": "entry_number"})
+        self.assertEqual([row["entry_number"] for row in ordered.data["results"]], ["JE-FTS-001", "JE-FTS-003"])
+
+        steel = JournalEntry.objects.get(entry_number="JE-FTS-002")
+        steel.description = "Concrete additives"
+        steel.save()
+        self.assertEqual(self.client.get("/api/v1/finance/journal-entries/", {"search": "concrete additives"}).data["count"], 1)
+
+        steel.delete()
+        self.assertFalse(SearchEntry.objects.filter(object_id=steel.pk, body__contains="additives").exists())
+
+    def test_search_entries_follow_renamed_related_rows(self):
+        project = Project.objects.create(code="TOWERA", name="Tower A", client_name="ACME", created_by=self.user)
+        Invoice.objects.create(
+            invoice_number="INV-FTS-1",
+            invoice_type=Invoice.InvoiceType.CUSTOMER,
+            partner_name="ACME",
+            issue_date=date.today(),
+            project=project,
+            created_by=self.user,
+        )
+        self.assertEqual(self.client.get("/api/v1/finance/invoices/", {"search": "towera"}).data["count"], 1)
+
+        project.code = "TOWERB"
+        project.save()
+        self.assertEqual(self.client.get("/api/v1/finance/invoices/", {"search": "towera"}).data["count"], 0)
+        self.assertEqual(self.client.get("/api/v1/finance/invoices/", {"search": "towerb"}).data["count"], 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            project.save(update_fields=["name", "updated_at"])
+        self.assertFalse(any("core_searchentry" in query["sql"] for query in queries.captured_queries))
+
+    def test_async_report_returns_job_and_worker_stores_result(self):
+        self.client.force_authenticate(user=self.approver)
+        response = self.client.get(
+            "/api/v1/finance/reports/trial-balance/",
+            {"async": "true", "start_date": "2026-01-01", "end_date": "2026-01-31"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], Job.Status.QUEUED)
+        job = Job.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.payload["params"]["start_date"], "2026-01-01")
+
+        run_worker(drain=True)
+
+        job_response = self.client.get(response.data["status_url"])
+        self.assertEqual(job_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(job_response.data["status"], Job.Status.SUCCEEDED)
+        sync_response = self.client.get(
+            "/api/v1/finance/reports/trial-balance/",
+            {"start_date": "2026-01-01", "end_date": "2026-01-31"},
+        )
+        self.assertEqual(job_response.data["result"]["totals"], sync_response.json()["totals"])
+
+    def test_year_close_and_recurring_entries_can_run_as_jobs(self):
+        Account.objects.create(code="3300", name="Retained Earnings", account_type="equity")
+        entry = JournalEntry.objects.create(
+            entry_number="JE-CLOSE-1",
+            entry_date=date(2025, 6, 30),
+            description="Sale",
+            status=JournalEntry.Status.POSTED,
+        )
+        entry.lines.create(account=self.account1, debit=Decimal("400.00"), credit=Decimal("0.00"))
+        entry.lines.create(account=self.account2, debit=Decimal("0.00"), credit=Decimal("400.00"))
+        self.client.force_authenticate(user=self.approver)
+
+        close_response = self.client.post("/api/v1/finance/year-close/2025/run/?async=true", {}, format="json")
+        recurring_response = self.client.post(
+            "/api/v1/finance/recurring-templates/run-due/?async=true",
+            {"as_of_date": "2025-12-31"},
+            format="json",
+        )
+        self.assertEqual(close_response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(recurring_response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(JournalEntry.objects.filter(entry_class=JournalEntry.EntryClass.CLOSING).exists())
+
+        run_worker(drain=True)
+
+        close_job = Job.objects.get(pk=close_response.data["job_id"])
+        self.assertEqual(close_job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(close_job.result["entry_number"], "CLS-2025")
+        self.assertEqual(close_job.result["net_income_transferred"], "400.00")
+        closing_entry = JournalEntry.objects.get(entry_number="CLS-2025")
+        self.assertEqual(closing_entry.created_by, self.approver)
+        recurring_job = Job.objects.get(pk=recurring_response.data["job_id"])
+        self.assertEqual(recurring_job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(recurring_job.result["as_of_date"], "2025-12-31")
+
+
+    def test_trial_balance_revalidates_with_etag(self):
+        self.client.force_authenticate(user=self.approver)
+        params = {"start_date": "2026-01-01", "end_date": "2026-01-31"}
+        first = self.client.get("/api/v1/finance/reports/trial-balance/", params)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        builder = Mock()
+        with patch.dict("finance.views.REPORT_BUILDERS", {"trial_balance": builder}):
+            cached = self.client.get("/api/v1/finance/reports/trial-balance/", params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        builder.assert_not_called()
+
+        Account.objects.create(code="9900", name="Suspense", account_type="asset")
+        changed = self.client.get("/api/v1/finance/reports/trial-balance/", params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
 
 class TestJournalEntryExcel(APITestCase):
     def setUp(self):
@@ -9,6 +9,7 @@ from .views import (
     CustomerInvoiceViewSet,
     CustomerPaymentViewSet,
     ExchangeRateViewSet,
+    FinanceAsyncReportsView,
     FinanceReportsViewSet,
     FiscalPeriodViewSet,
     InvoiceViewSet,
@@ -46,6 +47,7 @@ portal_router.register("payments", CustomerPaymentViewSet, basename="portal-paym
 
 urlpatterns = [
     path("portal/", include(portal_router.urls)),
+    path("reports/async/<str:report>/", FinanceAsyncReportsView.as_view(), name="finance-report-async"),
     path(
         "print-settings/",
         PrintSettingsViewSet.as_view({"get": "list", "patch": "update"}),
@@ -1,15 +1,13 @@
 from datetime import date, datetime
-from io import BytesIO
 from decimal import Decimal
 
 from django.db import transaction
 from django.db.models import Sum
 from django.http import HttpResponse
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.dateparse import parse_date
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Alignment, Font, PatternFill
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
@@ -24,6 +22,11 @@ from core.access import (
     RowLevelScopeMixin,
 )
 from core.audit import AuditLogMixin
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import SparseFieldsetViewMixin, query_flag
+from core.pagination import HighVolumePagination
+from core.reporting import AsyncReportView, ReportTimeBudgetMixin
+from core.services.jobs import enqueue_job
 from projects.models import Project, ProjectCostRecord
 from projects.services import settle_project_cost_records_by_source, sync_project_cost_records_by_source
 from .models import (
@@ -52,6 +55,7 @@ from .serializers import (
     ExchangeRateSerializer,
     FiscalPeriodSerializer,
     InvoiceSerializer,
+    JournalEntryListSerializer,
     JournalEntrySerializer,
     PaymentSerializer,
     PostingRuleSerializer,
@@ -60,15 +64,11 @@ from .serializers import (
     RecurringEntryTemplateSerializer,
     RevenueRecognitionEntrySerializer,
 )
-from .services.posting_engine import PostingEngine
+from .jobs import RECURRING_ENTRIES_JOB, REPORT_BUILDERS, REPORT_JOB, YEAR_CLOSE_JOB, run_recurring_entries
+from .services.invoice_payments import sync_invoice_payment_status
+from .services.posting_engine import PostingEngine, next_related_entry_number
 from .services.printing import get_print_settings, next_invoice_number
-from .services.reporting import (
-    build_balance_sheet,
-    build_general_journal,
-    build_general_ledger,
-    build_income_statement,
-    build_trial_balance,
-)
+from .services.year_close import close_fiscal_year
 from payments.serializers import PaymentAllocationDetailSerializer
 from payments.models import PaymentAllocation
 
@@ -89,28 +89,21 @@ def _is_finance_approver(user) -> bool:
     return bool(role and role.slug in FINANCE_APPROVER_ROLE_SLUGS)
 
 
-def _sync_invoice_payment_status(invoice: Invoice) -> None:
-    if invoice.status not in {
-        Invoice.InvoiceStatus.ISSUED,
-        Invoice.InvoiceStatus.PARTIALLY_PAID,
-        Invoice.InvoiceStatus.PAID,
-    }:
-        return
+def _filter_outstanding_invoices(request, queryset):
+    if query_flag(request, "outstanding"):
+        return queryset.filter(outstanding_amount__gt=Decimal("0.00"))
+    return queryset
 
-    confirmed_total = (
-        invoice.payments.filter(status=Payment.Status.CONFIRMED).aggregate(total=Sum("amount"))["total"]
-        or Decimal("0.00")
-    )
-    if confirmed_total >= invoice.total_amount and invoice.total_amount > Decimal("0.00"):
-        new_status = Invoice.InvoiceStatus.PAID
-    elif confirmed_total > Decimal("0.00"):
-        new_status = Invoice.InvoiceStatus.PARTIALLY_PAID
-    else:
-        new_status = Invoice.InvoiceStatus.ISSUED
 
-    if invoice.status != new_status:
-        invoice.status = new_status
-        invoice.save(update_fields=["status", "updated_at"])
+def _job_accepted_response(request, job):
+    return Response(
+        {
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": request.build_absolute_uri(reverse("job-detail", kwargs={"pk": job.pk})),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
 
 
 def _assert_project_open(project):
@@ -174,15 +167,6 @@ def _next_progress_invoice_number(billing_number: str) -> str:
     return candidate
 
 
-def _next_related_entry_number(prefix: str, base_entry_number: str) -> str:
-    candidate = f"{prefix}-{base_entry_number}"
-    counter = 1
-    while JournalEntry.objects.filter(entry_number=candidate).exists():
-        candidate = f"{prefix}-{base_entry_number}-{counter:02d}"
-        counter += 1
-    return candidate
-
-
 def _parse_date_param(value: str | None, *, field_name: str) -> date | None:
     if not value:
         return None
@@ -316,7 +300,7 @@ class AccountViewSet(AuditLogMixin, viewsets.ModelViewSet):
     ordering_fields = ["code", "name", "created_at"]
 
 
-class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
+class JournalEntryViewSet(SparseFieldsetViewMixin, AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = JournalEntry.objects.prefetch_related("lines").select_related(
         "project",
         "created_by",
@@ -326,8 +310,12 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
         "correction_root",
     )
     serializer_class = JournalEntrySerializer
+    list_serializer_class = JournalEntryListSerializer
     permission_classes = [ActionBasedRolePermission]
+    pagination_class = HighVolumePagination
+    cursor_ordering = ("-created_at", "-id")
     user_scope_fields = ("created_by", "project__created_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": FINANCE_READ_ROLES,
         "retrieve": FINANCE_READ_ROLES,
@@ -400,7 +388,7 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
 
         with transaction.atomic():
             reversal = JournalEntry.objects.create(
-                entry_number=_next_related_entry_number("REV", entry.entry_number),
+                entry_number=next_related_entry_number("REV", entry.entry_number),
                 entry_date=timezone.localdate(),
                 description=f"Reversal of {entry.entry_number}",
                 status=JournalEntry.Status.POSTED,
@@ -464,7 +452,7 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
                 reversal_payload = None
 
             correction_entry = JournalEntry.objects.create(
-                entry_number=_next_related_entry_number("COR", entry.entry_number),
+                entry_number=next_related_entry_number("COR", entry.entry_number),
                 entry_date=timezone.localdate(),
                 description=request.data.get("description") or f"Correction of {entry.entry_number}",
                 status=JournalEntry.Status.POSTED,
@@ -539,58 +527,36 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
             "line_description",
         ]
 
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Journal Entries"
-
-        title_text = "Journal Entries Export"
-        sheet["A1"] = title_text
-        sheet.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
-        sheet["A1"].font = Font(size=14, bold=True)
-        sheet["A1"].alignment = Alignment(horizontal="center")
-
-        sheet["A2"] = f"Generated at: {timezone.now().strftime('%Y-%m-%d %H:%M')}"
-        sheet.merge_cells(start_row=2, start_column=1, end_row=2, end_column=len(headers))
-        sheet["A2"].alignment = Alignment(horizontal="center")
-
-        header_row_index = 3
-        sheet.append(headers)
-        header_fill = PatternFill("solid", fgColor="F1F5F9")
-        for col_idx in range(1, len(headers) + 1):
-            cell = sheet.cell(row=header_row_index, column=col_idx)
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-            sheet.column_dimensions[cell.column_letter].width = 18
-
-        for entry in queryset.order_by("entry_date", "entry_number", "id"):
-            for line in entry.lines.all():
-                sheet.append(
-                    [
-                        entry.entry_number,
-                        entry.entry_date.isoformat(),
-                        entry.entry_class,
-                        entry.description,
-                        entry.currency,
-                        str(entry.fx_rate_to_base),
-                        entry.project_id or "",
-                        line.account.code,
-                        line.account_id,
-                        str(line.debit),
-                        str(line.credit),
-                        line.description,
-                    ]
-                )
+        rows = (
+            [
+                entry.entry_number,
+                entry.entry_date.isoformat(),
+                entry.entry_class,
+                entry.description,
+                entry.currency,
+                str(entry.fx_rate_to_base),
+                entry.project_id or "",
+                line.account.code,
+                line.account_id,
+                str(line.debit),
+                str(line.credit),
+                line.description,
+            ]
+            for entry in queryset.order_by("entry_date", "entry_number", "id")
+            for line in entry.lines.all()
+        )
 
-        output = BytesIO()
-        workbook.save(output)
-        output.seek(0)
+        from finance.services.excel import XLSX_CONTENT_TYPE, build_workbook
 
-        filename = f"journal-entries-{timezone.localdate().strftime('%Y%m%d')}.xlsx"
-        response = HttpResponse(
-            output.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        content = build_workbook(
+            headers,
+            rows,
+            sheet_title="Journal Entries",
+            title="Journal Entries Export",
+            subtitle=f"Generated at: {timezone.now().strftime('%Y-%m-%d %H:%M')}",
         )
+        filename = f"journal-entries-{timezone.localdate().strftime('%Y%m%d')}.xlsx"
+        response = HttpResponse(content, content_type=XLSX_CONTENT_TYPE)
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
@@ -611,26 +577,11 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
             "line_description",
         ]
 
-        workbook = Workbook()
-        sheet = workbook.active
-        sheet.title = "Journal Entries"
-        sheet.append(headers)
-        header_fill = PatternFill("solid", fgColor="F1F5F9")
-        for col_idx in range(1, len(headers) + 1):
-            cell = sheet.cell(row=1, column=col_idx)
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal="center")
-            sheet.column_dimensions[cell.column_letter].width = 18
-
-        output = BytesIO()
-        workbook.save(output)
-        output.seek(0)
+        from finance.services.excel import XLSX_CONTENT_TYPE, build_workbook
+
+        content = build_workbook(headers, [], sheet_title="Journal Entries")
         filename = "journal-entries-template.xlsx"
-        response = HttpResponse(
-            output.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        response = HttpResponse(content, content_type=XLSX_CONTENT_TYPE)
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
         return response
 
@@ -640,12 +591,13 @@ class JournalEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
         if not upload:
             raise ValidationError({"file": "Excel file (.xlsx) is required."})
 
+        from finance.services.excel import open_active_sheet
+
         try:
-            workbook = load_workbook(upload, data_only=True)
+            sheet = open_active_sheet(upload)
         except Exception:
             raise ValidationError({"file": "Unable to read the Excel file."})
 
-        sheet = workbook.active
         header_row_index = None
         header_map: dict[str, int] = {}
 
@@ -845,6 +797,7 @@ class InvoiceViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     serializer_class = InvoiceSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("created_by", "project__created_by", "submitted_by", "approved_by", "rejected_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": FINANCE_READ_ROLES,
         "retrieve": FINANCE_READ_ROLES,
@@ -858,10 +811,10 @@ class InvoiceViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     }
     filterset_fields = ["invoice_type", "status", "project", "cost_code", "customer", "issue_date", "partner_name"]
     search_fields = ["invoice_number", "partner_name", "project__code", "cost_code__code"]
-    ordering_fields = ["issue_date", "created_at", "invoice_number", "total_amount"]
+    ordering_fields = ["issue_date", "created_at", "invoice_number", "total_amount", "outstanding_amount"]
 
     def get_queryset(self):
-        return self.apply_row_level_scope(super().get_queryset())
+        return _filter_outstanding_invoices(self.request, self.apply_row_level_scope(super().get_queryset()))
 
     def perform_create(self, serializer):
         instance = serializer.save(created_by=self.request.user)
@@ -1009,6 +962,7 @@ class ProgressBillingViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelVi
     serializer_class = ProgressBillingSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by", "created_by", "submitted_by", "approved_by", "rejected_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": FINANCE_READ_ROLES,
         "retrieve": FINANCE_READ_ROLES,
@@ -1255,6 +1209,7 @@ class RevenueRecognitionEntryViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets
     serializer_class = RevenueRecognitionEntrySerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by", "created_by", "submitted_by", "approved_by", "rejected_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": FINANCE_READ_ROLES,
         "retrieve": FINANCE_READ_ROLES,
@@ -1461,6 +1416,7 @@ class PaymentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         "invoice__created_by",
         "invoice__project__created_by",
     )
+    project_scope_fields = ("invoice__project",)
     action_role_map = {
         "list": FINANCE_READ_ROLES,
         "retrieve": FINANCE_READ_ROLES,
@@ -1528,33 +1484,40 @@ class PaymentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         if payment.invoice.status not in {Invoice.InvoiceStatus.ISSUED, Invoice.InvoiceStatus.PARTIALLY_PAID}:
             raise ValidationError({"invoice": "Payment can be approved only for issued invoices."})
 
-        payment.status = Payment.Status.CONFIRMED
-        payment.approved_at = timezone.now()
-        payment.approved_by = request.user
-        payment.rejected_at = None
-        payment.rejected_by = None
-        payment.rejection_reason = ""
-        payment.save(
-            update_fields=[
-                "status",
-                "approved_at",
-                "approved_by",
-                "rejected_at",
-                "rejected_by",
-                "rejection_reason",
-                "updated_at",
-            ]
-        )
-        _sync_invoice_payment_status(payment.invoice)
-        _auto_post_operational_event(
-            source_module="finance.payment",
-            source_event="approved",
-            source_object=payment,
-            entry_date=payment.payment_date,
-            description=f"Auto-posting for approved payment {payment.id}",
-            posted_by=request.user,
-            idempotency_key=f"finance.payment:{payment.id}:approved",
-        )
+        with transaction.atomic():
+            # The invoice paid_amount counter is incremented from this status change, so a second
+            # concurrent approval must wait here and then see the payment as already confirmed.
+            payment = Payment.objects.select_for_update().select_related("invoice").get(id=payment.id)
+            if payment.status != Payment.Status.PENDING:
+                raise ValidationError({"status": "Only pending payments can be approved."})
+
+            payment.status = Payment.Status.CONFIRMED
+            payment.approved_at = timezone.now()
+            payment.approved_by = request.user
+            payment.rejected_at = None
+            payment.rejected_by = None
+            payment.rejection_reason = ""
+            payment.save(
+                update_fields=[
+                    "status",
+                    "approved_at",
+                    "approved_by",
+                    "rejected_at",
+                    "rejected_by",
+                    "rejection_reason",
+                    "updated_at",
+                ]
+            )
+            sync_invoice_payment_status(payment.invoice)
+            _auto_post_operational_event(
+                source_module="finance.payment",
+                source_event="approved",
+                source_object=payment,
+                entry_date=payment.payment_date,
+                description=f"Auto-posting for approved payment {payment.id}",
+                posted_by=request.user,
+                idempotency_key=f"finance.payment:{payment.id}:approved",
+            )
         return Response(self.get_serializer(payment).data)
 
     @action(detail=True, methods=["post"])
@@ -1572,23 +1535,28 @@ class PaymentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         if not reason:
             raise ValidationError({"reason": "A rejection reason is required."})
 
-        payment.status = Payment.Status.FAILED
-        payment.approved_at = None
-        payment.approved_by = None
-        payment.rejected_at = timezone.now()
-        payment.rejected_by = request.user
-        payment.rejection_reason = reason
-        payment.save(
-            update_fields=[
-                "status",
-                "approved_at",
-                "approved_by",
-                "rejected_at",
-                "rejected_by",
-                "rejection_reason",
-                "updated_at",
-            ]
-        )
+        with transaction.atomic():
+            payment = Payment.objects.select_for_update().get(id=payment.id)
+            if payment.status != Payment.Status.PENDING:
+                raise ValidationError({"status": "Only pending payments can be rejected."})
+
+            payment.status = Payment.Status.FAILED
+            payment.approved_at = None
+            payment.approved_by = None
+            payment.rejected_at = timezone.now()
+            payment.rejected_by = request.user
+            payment.rejection_reason = reason
+            payment.save(
+                update_fields=[
+                    "status",
+                    "approved_at",
+                    "approved_by",
+                    "rejected_at",
+                    "rejected_by",
+                    "rejection_reason",
+                    "updated_at",
+                ]
+            )
         return Response(self.get_serializer(payment).data)
 
 
@@ -1709,10 +1677,10 @@ class CustomerInvoiceViewSet(RowLevelScopeMixin, mixins.ListModelMixin, mixins.R
     global_scope_role_slugs = ()
     filterset_fields = ["status", "issue_date", "due_date"]
     search_fields = ["invoice_number", "partner_name"]
-    ordering_fields = ["issue_date", "created_at", "invoice_number"]
+    ordering_fields = ["issue_date", "created_at", "invoice_number", "outstanding_amount"]
 
     def get_queryset(self):
-        return self.apply_row_level_scope(super().get_queryset())
+        return _filter_outstanding_invoices(self.request, self.apply_row_level_scope(super().get_queryset()))
 
     @action(detail=True, methods=["get"])
     def payments(self, request, pk=None):
@@ -1779,6 +1747,7 @@ class RecurringEntryTemplateViewSet(AuditLogMixin, viewsets.ModelViewSet):
         "update": FINANCE_SETUP_ROLES,
         "partial_update": FINANCE_SETUP_ROLES,
         "destroy": {ROLE_ADMIN, ROLE_ACCOUNTANT},
+        "run_due": FINANCE_SETUP_ROLES,
     }
     filterset_fields = ["frequency", "is_active", "auto_post", "project", "next_run_date"]
     search_fields = ["template_code", "name", "description"]
@@ -1788,6 +1757,15 @@ class RecurringEntryTemplateViewSet(AuditLogMixin, viewsets.ModelViewSet):
         instance = serializer.save(created_by=self.request.user)
         self.log_action(action="create", instance=instance, changes=serializer.validated_data)
 
+    @action(detail=False, methods=["post"], url_path="run-due")
+    def run_due(self, request):
+        as_of_date = _parse_date_param(request.data.get("as_of_date"), field_name="as_of_date")
+        payload = {"as_of_date": as_of_date.isoformat() if as_of_date else None}
+        if query_flag(request, "async"):
+            job = enqueue_job(RECURRING_ENTRIES_JOB, payload=payload, created_by=request.user)
+            return _job_accepted_response(request, job)
+        return Response(run_recurring_entries(payload["as_of_date"]))
+
 
 class BankAccountViewSet(AuditLogMixin, viewsets.ModelViewSet):
     queryset = BankAccount.objects.select_related("gl_account").all()
@@ -1850,16 +1828,7 @@ class BankReconciliationSessionViewSet(AuditLogMixin, viewsets.ModelViewSet):
         self.log_action(action="create", instance=instance, changes=serializer.validated_data)
 
 
-class FinanceReportsViewSet(viewsets.ViewSet):
-    permission_classes = [ActionBasedRolePermission]
-    action_role_map = {
-        "trial_balance": FINANCE_READ_ROLES,
-        "general_journal": FINANCE_READ_ROLES,
-        "general_ledger": FINANCE_READ_ROLES,
-        "balance_sheet": FINANCE_READ_ROLES,
-        "income_statement": FINANCE_READ_ROLES,
-    }
-
+class FinanceReportParamsMixin:
     def _resolve_start_end_dates(self, request):
         start_date = _parse_date_param(request.query_params.get("start_date"), field_name="start_date")
         end_date = _parse_date_param(request.query_params.get("end_date"), field_name="end_date")
@@ -1880,37 +1849,73 @@ class FinanceReportsViewSet(viewsets.ViewSet):
         except (TypeError, ValueError):
             raise ValidationError({"project": "project must be an integer id."})
 
+    def get_report_kwargs(self, request, report: str) -> dict:
+        project_id = self._resolve_project_id(request)
+        if report == "balance_sheet":
+            as_of_date = _parse_date_param(request.query_params.get("as_of_date"), field_name="as_of_date")
+            return {"as_of_date": as_of_date or timezone.localdate(), "project_id": project_id}
+        start_date, end_date = self._resolve_start_end_dates(request)
+        return {"start_date": start_date, "end_date": end_date, "project_id": project_id}
+
+
+FINANCE_REPORT_MODELS = (JournalEntry, JournalLine, Account)
+
+
+class FinanceReportsViewSet(ConditionalGetMixin, FinanceReportParamsMixin, ReportTimeBudgetMixin, viewsets.ViewSet):
+    permission_classes = [ActionBasedRolePermission]
+    action_role_map = {
+        "trial_balance": FINANCE_READ_ROLES,
+        "general_journal": FINANCE_READ_ROLES,
+        "general_ledger": FINANCE_READ_ROLES,
+        "balance_sheet": FINANCE_READ_ROLES,
+        "income_statement": FINANCE_READ_ROLES,
+    }
+    conditional_models = {
+        "trial_balance": FINANCE_REPORT_MODELS,
+        "general_journal": FINANCE_REPORT_MODELS,
+        "general_ledger": FINANCE_REPORT_MODELS,
+        "balance_sheet": FINANCE_REPORT_MODELS,
+        "income_statement": FINANCE_REPORT_MODELS,
+    }
+
+    def _report_response(self, request, report: str):
+        params = self.get_report_kwargs(request, report)
+        if not query_flag(request, "async"):
+            return Response(REPORT_BUILDERS[report](**params))
+        job = enqueue_job(
+            REPORT_JOB,
+            payload={
+                "report": report,
+                "params": {key: value.isoformat() if isinstance(value, date) else value for key, value in params.items()},
+            },
+            created_by=request.user,
+        )
+        return _job_accepted_response(request, job)
+
     @action(detail=False, methods=["get"], url_path="trial-balance")
     def trial_balance(self, request):
-        start_date, end_date = self._resolve_start_end_dates(request)
-        project_id = self._resolve_project_id(request)
-        return Response(build_trial_balance(start_date=start_date, end_date=end_date, project_id=project_id))
+        return self._report_response(request, "trial_balance")
 
     @action(detail=False, methods=["get"], url_path="general-journal")
     def general_journal(self, request):
-        start_date, end_date = self._resolve_start_end_dates(request)
-        project_id = self._resolve_project_id(request)
-        return Response(build_general_journal(start_date=start_date, end_date=end_date, project_id=project_id))
+        return self._report_response(request, "general_journal")
 
     @action(detail=False, methods=["get"], url_path="general-ledger")
     def general_ledger(self, request):
-        start_date, end_date = self._resolve_start_end_dates(request)
-        project_id = self._resolve_project_id(request)
-        return Response(build_general_ledger(start_date=start_date, end_date=end_date, project_id=project_id))
+        return self._report_response(request, "general_ledger")
 
     @action(detail=False, methods=["get"], url_path="balance-sheet")
     def balance_sheet(self, request):
-        as_of_date = _parse_date_param(request.query_params.get("as_of_date"), field_name="as_of_date")
-        if not as_of_date:
-            as_of_date = timezone.localdate()
-        project_id = self._resolve_project_id(request)
-        return Response(build_balance_sheet(as_of_date=as_of_date, project_id=project_id))
+        return self._report_response(request, "balance_sheet")
 
     @action(detail=False, methods=["get"], url_path="income-statement")
     def income_statement(self, request):
-        start_date, end_date = self._resolve_start_end_dates(request)
-        project_id = self._resolve_project_id(request)
-        return Response(build_income_statement(start_date=start_date, end_date=end_date, project_id=project_id))
+        return self._report_response(request, "income_statement")
+
+
+class FinanceAsyncReportsView(FinanceReportParamsMixin, AsyncReportView):
+    action_role_map = FinanceReportsViewSet.action_role_map
+    reports = REPORT_BUILDERS
 
 
 class YearCloseViewSet(viewsets.ViewSet):
@@ -1926,116 +1931,8 @@ class YearCloseViewSet(viewsets.ViewSet):
         except (TypeError, ValueError):
             raise ValidationError({"year": "Year must be a 4-digit number."})
 
-        retained_earnings_account = (
-            Account.objects.filter(code="3300").first()
-            or Account.objects.filter(account_type=Account.AccountType.EQUITY).order_by("code").first()
-        )
-        if not retained_earnings_account:
-            raise ValidationError(
-                {"account": "Retained earnings account not found. Configure equity account code 3300 or any equity account."}
-            )
-
-        year_lines = JournalLine.objects.filter(
-            entry__status=JournalEntry.Status.POSTED,
-            entry__entry_date__year=fiscal_year,
-            account__account_type__in=[Account.AccountType.REVENUE, Account.AccountType.EXPENSE],
-        )
-        aggregated = year_lines.values("account_id", "account__account_type").annotate(
-            debit=Sum("debit"),
-            credit=Sum("credit"),
-        )
-        if not aggregated:
-            return Response({"detail": f"No temporary balances found for fiscal year {fiscal_year}."})
-
-        entry_lines = []
-        total_debit = Decimal("0.00")
-        total_credit = Decimal("0.00")
-        net_income = Decimal("0.00")
-
-        for row in aggregated:
-            account_id = row["account_id"]
-            account_type = row["account__account_type"]
-            debit = row["debit"] or Decimal("0.00")
-            credit = row["credit"] or Decimal("0.00")
-
-            if account_type == Account.AccountType.REVENUE:
-                balance = credit - debit
-                if balance == Decimal("0.00"):
-                    continue
-                entry_lines.append(
-                    {
-                        "account_id": account_id,
-                        "description": f"Close revenue account {account_id}",
-                        "debit": balance if balance > 0 else Decimal("0.00"),
-                        "credit": -balance if balance < 0 else Decimal("0.00"),
-                    }
-                )
-                net_income += balance
-            else:
-                balance = debit - credit
-                if balance == Decimal("0.00"):
-                    continue
-                entry_lines.append(
-                    {
-                        "account_id": account_id,
-                        "description": f"Close expense account {account_id}",
-                        "debit": Decimal("0.00") if balance > 0 else -balance,
-                        "credit": balance if balance > 0 else Decimal("0.00"),
-                    }
-                )
-                net_income -= balance
-
-        if net_income >= Decimal("0.00"):
-            retained_debit = Decimal("0.00")
-            retained_credit = net_income
-        else:
-            retained_debit = -net_income
-            retained_credit = Decimal("0.00")
-
-        entry_lines.append(
-            {
-                "account_id": retained_earnings_account.id,
-                "description": f"Transfer net result {fiscal_year}",
-                "debit": retained_debit,
-                "credit": retained_credit,
-            }
-        )
-
-        for line in entry_lines:
-            total_debit += line["debit"]
-            total_credit += line["credit"]
-        if total_debit != total_credit:
-            raise ValidationError(
-                {"year_close": f"Year close entry is not balanced ({total_debit} debit vs {total_credit} credit)."}
-            )
-
-        closing_entry = JournalEntry.objects.create(
-            entry_number=_next_related_entry_number("CLS", str(fiscal_year)),
-            entry_date=date(fiscal_year, 12, 31),
-            description=f"Year closing entry for {fiscal_year}",
-            status=JournalEntry.Status.POSTED,
-            entry_class=JournalEntry.EntryClass.CLOSING,
-            currency="KWD",
-            fx_rate_to_base=Decimal("1.00000000"),
-            period=FiscalPeriod.objects.filter(year=fiscal_year, month=12).first(),
-            posted_at=timezone.now(),
-            posted_by=request.user,
-            created_by=request.user,
-        )
-        for line in entry_lines:
-            JournalLine.objects.create(
-                entry=closing_entry,
-                account_id=line["account_id"],
-                description=line["description"],
-                debit=line["debit"],
-                credit=line["credit"],
-            )
+        if query_flag(request, "async"):
+            job = enqueue_job(YEAR_CLOSE_JOB, payload={"year": fiscal_year}, created_by=request.user)
+            return _job_accepted_response(request, job)
+        return Response(close_fiscal_year(fiscal_year, request.user))
 
-        return Response(
-            {
-                "entry_id": closing_entry.id,
-                "entry_number": closing_entry.entry_number,
-                "fiscal_year": fiscal_year,
-                "net_income_transferred": net_income,
-            }
-        )
@@ -12,8 +12,8 @@ class PaymentIntentAdmin(admin.ModelAdmin):
 
 @admin.register(PaymentWebhookLog)
 class PaymentWebhookLogAdmin(admin.ModelAdmin):
-    list_display = ("provider", "event_type", "event_id", "processed", "created_at")
-    search_fields = ("event_id", "event_type")
+    list_display = ("provider", "event_type", "event_id", "intent_id", "processed", "attempts", "failed_at", "created_at")
+    search_fields = ("event_id", "event_type", "intent_id")
     list_filter = ("provider", "processed")
 
 
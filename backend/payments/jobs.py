@@ -0,0 +1,9 @@
+from core.services.jobs import register_job
+from .services.webhooks import process_pending_webhooks
+
+PROCESS_WEBHOOKS_JOB = "payments.process_webhooks"
+
+
+@register_job(PROCESS_WEBHOOKS_JOB)
+def run_process_webhooks_job(job, payload):
+    return process_pending_webhooks(batch_size=payload.get("batch_size"))
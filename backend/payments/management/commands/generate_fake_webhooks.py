@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import random
+import time
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from payments.models import PaymentIntent
+from payments.services.webhooks import process_pending_webhooks
+
+FAKE_WEBHOOK_SECRET = "whsec_local_fake"
+
+
+def sign_webhook_payload(payload: bytes, secret: str, timestamp: int) -> str:
+    # Same scheme as Stripe-Signature: HMAC-SHA256 over "<timestamp>.<payload>".
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def fake_intent_event(event_id: str, event_type: str, intent: PaymentIntent, created: int) -> bytes:
+    cents = int(intent.amount * 100)
+    return json.dumps(
+        {
+            "id": event_id,
+            "object": "event",
+            "type": event_type,
+            "created": created,
+            "data": {
+                "object": {
+                    "id": intent.provider_intent_id,
+                    "object": "payment_intent",
+                    "amount": cents,
+                    "amount_received": cents if event_type == "payment_intent.succeeded" else 0,
+                }
+            },
+        }
+    ).encode()
+
+
+class Command(BaseCommand):
+    help = "Replay signed fake Stripe webhook events through the intake endpoint and report throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=1000)
+        parser.add_argument("--intents", type=int, default=100)
+        parser.add_argument("--duplicate-ratio", dest="duplicate_ratio", type=float, default=0.1)
+        parser.add_argument("--secret", default="", help="Webhook secret to sign with (defaults to STRIPE_WEBHOOK_SECRET or a local fake).")
+        parser.add_argument("--run-id", dest="run_id", default="", help="Suffix for generated event and intent ids.")
+        parser.add_argument("--process", action="store_true", help="Drain the webhook worker afterwards and time it.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options["events"] < 1 or options["intents"] < 1:
+            raise CommandError("--events and --intents must be positive.")
+        rng = random.Random(options["seed"])
+        run_id = options["run_id"] or timezone.now().strftime("%Y%m%d%H%M%S")
+        secret = options["secret"] or settings.STRIPE_WEBHOOK_SECRET or FAKE_WEBHOOK_SECRET
+        intents = self._ensure_intents(run_id, options["intents"])
+
+        # Each intent fails a few times before it succeeds, so ordering per intent matters to the worker.
+        events = []
+        for index in range(options["events"]):
+            intent = intents[index % len(intents)]
+            is_last = index + len(intents) >= options["events"]
+            event_type = "payment_intent.succeeded" if is_last else "payment_intent.payment_failed"
+            events.append((f"evt_fake_{run_id}_{index}", event_type, intent))
+
+        host = next((host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")), "localhost")
+        client = Client(HTTP_HOST=host)
+        url = reverse("stripe-webhook")
+        statuses = Counter()
+        sent = 0
+        started = time.perf_counter()
+        with override_settings(STRIPE_WEBHOOK_SECRET=secret):
+            for position, (event_id, event_type, intent) in enumerate(events):
+                deliveries = [(event_id, event_type, intent)]
+                if position and rng.random() < options["duplicate_ratio"]:
+                    deliveries.append(events[rng.randrange(position)])
+                for delivery in deliveries:
+                    timestamp = int(time.time())
+                    payload = fake_intent_event(delivery[0], delivery[1], delivery[2], timestamp)
+                    response = client.post(
+                        url,
+                        data=payload,
+                        content_type="application/json",
+                        HTTP_STRIPE_SIGNATURE=sign_webhook_payload(payload, secret, timestamp),
+                    )
+                    statuses[response.status_code] += 1
+                    sent += 1
+        intake_seconds = time.perf_counter() - started
+
+        result = {
+            "run_id": run_id,
+            "deliveries": sent,
+            "unique_events": len(events),
+            "status_codes": dict(statuses),
+            "intake_seconds": round(intake_seconds, 3),
+            "intake_per_second": round(sent / intake_seconds, 1) if intake_seconds else None,
+        }
+        if options["process"]:
+            processed = 0
+            started = time.perf_counter()
+            while True:
+                counts = process_pending_webhooks()
+                processed += counts["processed"]
+                if not counts["processed"] and not counts["failed"]:
+                    break
+            process_seconds = time.perf_counter() - started
+            result.update(
+                {
+                    "processed": processed,
+                    "process_seconds": round(process_seconds, 3),
+                    "process_per_second": round(processed / process_seconds, 1) if process_seconds else None,
+                    "succeeded_intents": PaymentIntent.objects.filter(
+                        pk__in=[intent.pk for intent in intents], status=PaymentIntent.Status.SUCCEEDED
+                    ).count(),
+                }
+            )
+        self.stdout.write(json.dumps(result, indent=2))
+
+    def _ensure_intents(self, run_id: str, count: int) -> list[PaymentIntent]:
+        intent_ids = [f"pi_fake_{run_id}_{index}" for index in range(count)]
+        existing = set(PaymentIntent.objects.filter(provider_intent_id__in=intent_ids).values_list("provider_intent_id", flat=True))
+        PaymentIntent.objects.bulk_create(
+            [
+                PaymentIntent(provider_intent_id=intent_id, amount=Decimal("100.00"), metadata={"fake_run": run_id})
+                for intent_id in intent_ids
+                if intent_id not in existing
+            ],
+            batch_size=settings.BULK_CREATE_BATCH_SIZE,
+        )
+        intents = {intent.provider_intent_id: intent for intent in PaymentIntent.objects.filter(provider_intent_id__in=intent_ids)}
+        return [intents[intent_id] for intent_id in intent_ids]
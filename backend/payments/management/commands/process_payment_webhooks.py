@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from payments.services.webhooks import process_pending_webhooks
+
+
+class Command(BaseCommand):
+    help = "Process stored payment webhook events in arrival order per intent, retrying failures with backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", dest="batch_size", type=int, default=None)
+        parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=1.0)
+        parser.add_argument("--drain", action="store_true", help="Exit once no event is ready to process.")
+
+    def handle(self, *args, **options):
+        totals = {"processed": 0, "failed": 0, "deferred": 0}
+        try:
+            while True:
+                close_old_connections()
+                counts = process_pending_webhooks(batch_size=options["batch_size"])
+                for key, value in counts.items():
+                    totals[key] += value
+                if counts["processed"] or counts["failed"]:
+                    continue
+                if options["drain"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {totals['processed']} webhook events ({totals['failed']} failed attempts, {totals['deferred']} deferred)."
+            )
+        )
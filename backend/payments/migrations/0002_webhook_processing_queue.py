@@ -0,0 +1,56 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+def backfill_intent_ids(apps, schema_editor):
+    PaymentWebhookLog = apps.get_model("payments", "PaymentWebhookLog")
+    logs = []
+    for log in PaymentWebhookLog.objects.filter(event_type__startswith="payment_intent.").only("id", "payload"):
+        log.intent_id = str(((log.payload or {}).get("data") or {}).get("object", {}).get("id") or "")
+        logs.append(log)
+    PaymentWebhookLog.objects.bulk_update(logs, ["intent_id"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentwebhooklog',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='paymentwebhooklog',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='paymentwebhooklog',
+            name='intent_id',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='paymentwebhooklog',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='paymentwebhooklog',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='paymentwebhooklog',
+            index=models.Index(fields=['processed', 'failed_at', 'id'], name='payments_pa_process_65bb45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentwebhooklog',
+            index=models.Index(fields=['intent_id'], name='payments_pa_intent__262917_idx'),
+        ),
+        migrations.RunPython(backfill_intent_ids, migrations.RunPython.noop),
+    ]
@@ -67,11 +67,20 @@ class PaymentWebhookLog(TimeStampedModel):
     event_type = models.CharField(max_length=120)
     payload = models.JSONField(default=dict, blank=True)
     signature = models.CharField(max_length=255, blank=True)
+    intent_id = models.CharField(max_length=120, blank=True)
     processed = models.BooleanField(default=False)
     processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["processed", "failed_at", "id"]),
+            models.Index(fields=["intent_id"]),
+        ]
         constraints = [
             models.UniqueConstraint(fields=["provider", "event_id"], name="payments_webhook_unique_provider_event")
         ]
@@ -46,8 +46,13 @@ class PaymentWebhookLogSerializer(serializers.ModelSerializer):
             "event_type",
             "payload",
             "signature",
+            "intent_id",
             "processed",
             "processed_at",
+            "attempts",
+            "next_attempt_at",
+            "last_error",
+            "failed_at",
             "created_at",
         ]
         read_only_fields = ["created_at"]
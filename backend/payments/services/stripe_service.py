@@ -40,4 +40,9 @@ def construct_webhook_event(payload: bytes, signature: str):
         import stripe
     except ImportError as exc:  # pragma: no cover
         raise ValidationError({"stripe": "stripe library is not installed."}) from exc
-    return stripe.Webhook.construct_event(payload, signature, webhook_secret)
+    try:
+        return stripe.Webhook.construct_event(payload, signature, webhook_secret)
+    except ValueError as exc:
+        raise ValidationError({"payload": "Invalid webhook payload."}) from exc
+    except stripe.SignatureVerificationError as exc:
+        raise ValidationError({"signature": "Invalid webhook signature."}) from exc
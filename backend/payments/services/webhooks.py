@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import traceback
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from finance.models import Payment
+from finance.services.invoice_payments import sync_invoice_payment_status
+from payments.models import PaymentAllocation, PaymentIntent, PaymentWebhookLog
+from real_estate.models import Installment
+
+INTENT_EVENT_PREFIX = "payment_intent."
+
+
+def event_intent_id(event_type: str, event_object: dict) -> str:
+    if event_type.startswith(INTENT_EVENT_PREFIX):
+        return str(event_object.get("id") or "")
+    return ""
+
+
+def record_webhook_event(*, event_id: str, event_type: str, payload: dict, signature: str) -> bool:
+    event_object = (payload.get("data") or {}).get("object") or {}
+    try:
+        with transaction.atomic():
+            PaymentWebhookLog.objects.create(
+                provider=PaymentIntent.Provider.STRIPE,
+                event_id=event_id,
+                event_type=event_type,
+                intent_id=event_intent_id(event_type, event_object),
+                payload=payload,
+                signature=signature,
+            )
+    except IntegrityError:
+        # Stripe redelivers events; the unique (provider, event_id) constraint keeps the first copy.
+        return False
+    return True
+
+
+def handle_payment_intent_succeeded(intent_payload: dict):
+    intent_id = intent_payload.get("id")
+    amount_received = Decimal(str(intent_payload.get("amount_received", 0))) / Decimal("100")
+    intent = PaymentIntent.objects.select_for_update().filter(provider_intent_id=intent_id).first()
+    if not intent:
+        return
+    intent.status = PaymentIntent.Status.SUCCEEDED
+    intent.save(update_fields=["status", "updated_at"])
+
+    invoice = intent.invoice
+    installment = intent.installment
+
+    if invoice:
+        payment, created = Payment.objects.get_or_create(
+            invoice=invoice,
+            reference_no=intent_id,
+            defaults={
+                "payment_date": timezone.localdate(),
+                "amount": amount_received or intent.amount,
+                "method": Payment.Method.CARD,
+                "status": Payment.Status.CONFIRMED,
+            },
+        )
+        if created:
+            PaymentAllocation.objects.create(
+                payment=payment,
+                invoice=invoice,
+                installment=installment,
+                amount=payment.amount,
+            )
+        sync_invoice_payment_status(invoice)
+
+    if installment:
+        installment.paid_amount = installment.amount
+        installment.paid_at = timezone.now()
+        installment.status = Installment.Status.PAID
+        installment.save(update_fields=["paid_amount", "paid_at", "status", "updated_at"])
+
+
+def handle_payment_intent_failed(intent_payload: dict):
+    intent = PaymentIntent.objects.filter(provider_intent_id=intent_payload.get("id")).first()
+    if not intent:
+        return
+    intent.status = PaymentIntent.Status.FAILED
+    intent.save(update_fields=["status", "updated_at"])
+
+
+WEBHOOK_HANDLERS = {
+    "payment_intent.succeeded": handle_payment_intent_succeeded,
+    "payment_intent.payment_failed": handle_payment_intent_failed,
+}
+
+
+def webhook_retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.PAYMENTS_WEBHOOK_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0))
+
+
+def process_webhook_log(log: PaymentWebhookLog) -> bool:
+    handler = WEBHOOK_HANDLERS.get(log.event_type)
+    log.attempts += 1
+    try:
+        with transaction.atomic():
+            if handler is not None:
+                handler((log.payload.get("data") or {}).get("object") or {})
+            log.processed = True
+            log.processed_at = timezone.now()
+            log.next_attempt_at = None
+            log.last_error = ""
+            log.save(update_fields=["processed", "processed_at", "attempts", "next_attempt_at", "last_error", "updated_at"])
+    except Exception:
+        log.last_error = traceback.format_exc()[-4000:]
+        if log.attempts >= settings.PAYMENTS_WEBHOOK_MAX_ATTEMPTS:
+            log.failed_at = timezone.now()
+            log.next_attempt_at = None
+        else:
+            log.next_attempt_at = timezone.now() + webhook_retry_delay(log.attempts)
+        log.save(update_fields=["attempts", "next_attempt_at", "last_error", "failed_at", "updated_at"])
+        return False
+    return True
+
+
+def process_pending_webhooks(*, batch_size: int | None = None) -> dict:
+    now = timezone.now()
+    pending = PaymentWebhookLog.objects.filter(processed=False, failed_at__isnull=True)
+    waiting = pending.filter(next_attempt_at__gt=now).exclude(intent_id="")
+    # Events for one intent are applied in arrival order, so an event waiting on a retry holds back the ones behind it.
+    ready = (
+        pending.filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+        .exclude(intent_id__in=waiting.values("intent_id"))
+        .order_by("id")
+    )
+    blocked_intents: set[str] = set()
+    counts = {"processed": 0, "failed": 0, "deferred": 0}
+    candidates = list(ready.values_list("id", "intent_id")[: batch_size or settings.PAYMENTS_WEBHOOK_BATCH_SIZE])
+    for log_id, intent_id in candidates:
+        if intent_id in blocked_intents:
+            counts["deferred"] += 1
+            continue
+        with transaction.atomic():
+            # Another worker may hold or have finished this event since the candidate scan; the lock decides who runs it.
+            log = PaymentWebhookLog.objects.select_for_update(skip_locked=True).filter(pk=log_id).first()
+            if log is None or log.processed or log.failed_at is not None:
+                if log is None and intent_id:
+                    blocked_intents.add(intent_id)
+                continue
+            if log.next_attempt_at and log.next_attempt_at > timezone.now():
+                if intent_id:
+                    blocked_intents.add(intent_id)
+                continue
+            if process_webhook_log(log):
+                counts["processed"] += 1
+                continue
+        counts["failed"] += 1
+        if intent_id and log.failed_at is None:
+            blocked_intents.add(intent_id)
+    return counts
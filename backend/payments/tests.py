@@ -0,0 +1,143 @@
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from finance.models import Invoice, Payment
+from .management.commands.generate_fake_webhooks import fake_intent_event, sign_webhook_payload
+from .models import PaymentIntent, PaymentWebhookLog
+from .services.webhooks import process_pending_webhooks, record_webhook_event
+
+WEBHOOK_SECRET = "whsec_test_secret"
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET, PAYMENTS_WEBHOOK_MAX_ATTEMPTS=2)
+class TestStripeWebhooks(APITestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="pay-user", password="pass1234")
+        self.invoice = Invoice.objects.create(
+            invoice_number="INV-PAY-1",
+            invoice_type=Invoice.InvoiceType.CUSTOMER,
+            partner_name="ACME",
+            issue_date=date.today(),
+            total_amount=Decimal("100.00"),
+            status=Invoice.InvoiceStatus.ISSUED,
+            created_by=self.user,
+        )
+        self.intent = PaymentIntent.objects.create(provider_intent_id="pi_one", amount=Decimal("100.00"), invoice=self.invoice)
+        self.other_intent = PaymentIntent.objects.create(provider_intent_id="pi_two", amount=Decimal("40.00"))
+
+    def post_event(self, payload: bytes, signature: str | None = None):
+        timestamp = int(time.time())
+        return self.client.post(
+            reverse("stripe-webhook"),
+            data=payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature or sign_webhook_payload(payload, WEBHOOK_SECRET, timestamp),
+        )
+
+    def record(self, event_id: str, event_type: str, intent: PaymentIntent) -> PaymentWebhookLog:
+        payload = json.loads(fake_intent_event(event_id, event_type, intent, int(time.time())))
+        record_webhook_event(event_id=event_id, event_type=event_type, payload=payload, signature="")
+        return PaymentWebhookLog.objects.get(event_id=event_id)
+
+    def make_due(self, log: PaymentWebhookLog):
+        PaymentWebhookLog.objects.filter(pk=log.pk).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    def test_duplicate_event_is_stored_once_and_applied_once(self):
+        payload = fake_intent_event("evt_dup", "payment_intent.succeeded", self.intent, int(time.time()))
+        self.assertEqual(self.post_event(payload).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.post_event(payload).status_code, status.HTTP_200_OK)
+        self.assertEqual(PaymentWebhookLog.objects.filter(event_id="evt_dup").count(), 1)
+
+        self.assertEqual(process_pending_webhooks()["processed"], 1)
+        payment = Payment.objects.get(reference_no="pi_one")
+        self.assertEqual(payment.status, Payment.Status.CONFIRMED)
+        self.intent.refresh_from_db()
+        self.assertEqual(self.intent.status, PaymentIntent.Status.SUCCEEDED)
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.paid_amount, Decimal("100.00"))
+
+    def test_bad_signature_or_payload_is_rejected(self):
+        payload = fake_intent_event("evt_bad", "payment_intent.succeeded", self.intent, int(time.time()))
+        response = self.post_event(payload, signature=f"t={int(time.time())},v1=deadbeef")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("signature", response.data)
+
+        response = self.post_event(b"not json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("payload", response.data)
+        self.assertFalse(PaymentWebhookLog.objects.exists())
+
+    def test_failing_handler_backs_off_then_gives_up(self):
+        log = self.record("evt_fail", "payment_intent.succeeded", self.intent)
+        handler = Mock(side_effect=RuntimeError("ledger unavailable"))
+        with patch.dict("payments.services.webhooks.WEBHOOK_HANDLERS", {"payment_intent.succeeded": handler}):
+            self.assertEqual(process_pending_webhooks()["failed"], 1)
+            log.refresh_from_db()
+            self.assertEqual(log.attempts, 1)
+            self.assertGreater(log.next_attempt_at, timezone.now())
+            self.assertIsNone(log.failed_at)
+            self.assertIn("ledger unavailable", log.last_error)
+
+            self.assertEqual(process_pending_webhooks(), {"processed": 0, "failed": 0, "deferred": 0})
+
+            self.make_due(log)
+            self.assertEqual(process_pending_webhooks()["failed"], 1)
+        log.refresh_from_db()
+        self.assertEqual(log.attempts, 2)
+        self.assertIsNotNone(log.failed_at)
+        self.assertIsNone(log.next_attempt_at)
+        self.assertFalse(log.processed)
+        self.assertEqual(handler.call_count, 2)
+        self.assertFalse(Payment.objects.exists())
+
+    def test_failed_event_holds_back_later_events_for_its_intent(self):
+        first = self.record("evt_1", "payment_intent.payment_failed", self.intent)
+        later = self.record("evt_2", "payment_intent.succeeded", self.intent)
+        other = self.record("evt_3", "payment_intent.payment_failed", self.other_intent)
+        handler = Mock(side_effect=RuntimeError("try again"))
+        with patch.dict("payments.services.webhooks.WEBHOOK_HANDLERS", {"payment_intent.payment_failed": handler}):
+            counts = process_pending_webhooks()
+        self.assertEqual(counts, {"processed": 0, "failed": 2, "deferred": 1})
+
+        self.make_due(other)
+        counts = process_pending_webhooks()
+        self.assertEqual(counts, {"processed": 1, "failed": 0, "deferred": 0})
+        later.refresh_from_db()
+        self.assertFalse(later.processed)
+
+        self.make_due(first)
+        self.assertEqual(process_pending_webhooks()["processed"], 2)
+        later.refresh_from_db()
+        self.assertTrue(later.processed)
+        self.intent.refresh_from_db()
+        self.assertEqual(self.intent.status, PaymentIntent.Status.SUCCEEDED)
+
+    def test_log_locked_by_another_worker_is_skipped_and_blocks_its_intent(self):
+        locked = self.record("evt_locked", "payment_intent.payment_failed", self.intent)
+        later = self.record("evt_after_locked", "payment_intent.succeeded", self.intent)
+        other = self.record("evt_other", "payment_intent.payment_failed", self.other_intent)
+        select_for_update = PaymentWebhookLog.objects.select_for_update
+
+        def skip_locked_row(**kwargs):
+            # SQLite has no row locks, so stand in for another worker holding evt_locked.
+            return select_for_update(**kwargs).exclude(pk=locked.pk)
+
+        with patch.object(PaymentWebhookLog.objects, "select_for_update", side_effect=skip_locked_row):
+            counts = process_pending_webhooks()
+        self.assertEqual(counts, {"processed": 1, "failed": 0, "deferred": 1})
+        for log, processed in ((locked, False), (later, False), (other, True)):
+            log.refresh_from_db()
+            self.assertEqual(log.processed, processed)
+            self.assertEqual(log.attempts, int(processed))
+
+        self.assertEqual(process_pending_webhooks()["processed"], 2)
@@ -1,7 +1,5 @@
 from decimal import Decimal
 
-from django.db import transaction
-from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -12,11 +10,12 @@ from rest_framework.exceptions import ValidationError
 from core.access import RowLevelScopeMixin
 from core.audit import AuditLogMixin
 from core.services.company_profile import get_company_profile
-from finance.models import Invoice, InvoiceItem, Payment
+from finance.models import Invoice, InvoiceItem
 from finance.services.printing import next_invoice_number
-from payments.models import PaymentAllocation, PaymentIntent, PaymentWebhookLog
+from payments.models import PaymentAllocation, PaymentIntent
 from payments.serializers import PaymentAllocationSerializer, PaymentIntentSerializer
 from payments.services.stripe_service import construct_webhook_event, create_payment_intent
+from payments.services.webhooks import record_webhook_event
 from real_estate.models import Installment
 
 
@@ -69,22 +68,6 @@ def _ensure_installment_invoice(installment: Installment) -> Invoice:
     return invoice
 
 
-def _update_invoice_status(invoice: Invoice):
-    paid_total = (
-        invoice.payments.filter(status=Payment.Status.CONFIRMED).aggregate(total=Sum("amount"))["total"]
-        or Decimal("0.00")
-    )
-    if paid_total >= invoice.total_amount:
-        new_status = Invoice.InvoiceStatus.PAID
-    elif paid_total > Decimal("0.00"):
-        new_status = Invoice.InvoiceStatus.PARTIALLY_PAID
-    else:
-        new_status = invoice.status
-    if new_status != invoice.status:
-        invoice.status = new_status
-        invoice.save(update_fields=["status", "updated_at"])
-
-
 class PaymentIntentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = PaymentIntent.objects.select_related("invoice", "installment", "customer", "created_by").all()
     serializer_class = PaymentIntentSerializer
@@ -178,71 +161,8 @@ class StripeWebhookView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        payload = request.body
         signature = request.META.get("HTTP_STRIPE_SIGNATURE", "")
-
-        event = construct_webhook_event(payload, signature)
-        log = PaymentWebhookLog.objects.create(
-            provider=PaymentIntent.Provider.STRIPE,
-            event_id=event.id,
-            event_type=event.type,
-            payload=event.to_dict(),
-            signature=signature,
-        )
-
-        if event.type == "payment_intent.succeeded":
-            self._handle_payment_intent_success(event.data["object"])
-        elif event.type == "payment_intent.payment_failed":
-            self._handle_payment_intent_failed(event.data["object"])
-
-        log.processed = True
-        log.processed_at = timezone.now()
-        log.save(update_fields=["processed", "processed_at", "updated_at"])
+        event = construct_webhook_event(request.body, signature)
+        # Processing happens in process_payment_webhooks so Stripe gets its 200 as soon as the event is stored.
+        record_webhook_event(event_id=event.id, event_type=event.type, payload=event.to_dict(), signature=signature)
         return Response(status=status.HTTP_200_OK)
-
-    def _handle_payment_intent_success(self, intent_payload):
-        intent_id = intent_payload.get("id")
-        amount_received = Decimal(str(intent_payload.get("amount_received", 0))) / Decimal("100")
-        with transaction.atomic():
-            intent = PaymentIntent.objects.select_for_update().filter(provider_intent_id=intent_id).first()
-            if not intent:
-                return
-            intent.status = PaymentIntent.Status.SUCCEEDED
-            intent.save(update_fields=["status", "updated_at"])
-
-            invoice = intent.invoice
-            installment = intent.installment
-
-            if invoice:
-                payment, created = Payment.objects.get_or_create(
-                    invoice=invoice,
-                    reference_no=intent_id,
-                    defaults={
-                        "payment_date": timezone.localdate(),
-                        "amount": amount_received or intent.amount,
-                        "method": Payment.Method.CARD,
-                        "status": Payment.Status.CONFIRMED,
-                    },
-                )
-                if created:
-                    PaymentAllocation.objects.create(
-                        payment=payment,
-                        invoice=invoice,
-                        installment=installment,
-                        amount=payment.amount,
-                    )
-                _update_invoice_status(invoice)
-
-            if installment:
-                installment.paid_amount = installment.amount
-                installment.paid_at = timezone.now()
-                installment.status = Installment.Status.PAID
-                installment.save(update_fields=["paid_amount", "paid_at", "status", "updated_at"])
-
-    def _handle_payment_intent_failed(self, intent_payload):
-        intent_id = intent_payload.get("id")
-        intent = PaymentIntent.objects.filter(provider_intent_id=intent_id).first()
-        if not intent:
-            return
-        intent.status = PaymentIntent.Status.FAILED
-        intent.save(update_fields=["status", "updated_at"])
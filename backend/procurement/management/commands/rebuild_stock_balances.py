@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from procurement.services import rebuild_stock_balances
+
+
+class Command(BaseCommand):
+    help = "Rebuild the material x warehouse on-hand balances from the stock transaction history"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            balance_count = rebuild_stock_balances()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {balance_count} stock balances."))
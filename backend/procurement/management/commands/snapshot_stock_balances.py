@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from procurement.services import take_stock_snapshot
+
+
+class Command(BaseCommand):
+    help = "Store the on-hand stock per material and warehouse as of a date (defaults to yesterday) for as-of reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", dest="snapshot_date", default=None, help="Snapshot date in YYYY-MM-DD format.")
+
+    def handle(self, *args, **options):
+        if options["snapshot_date"]:
+            snapshot_date = datetime.strptime(options["snapshot_date"], "%Y-%m-%d").date()
+        else:
+            snapshot_date = timezone.localdate() - timedelta(days=1)
+        with transaction.atomic():
+            location_count = take_stock_snapshot(snapshot_date)
+        self.stdout.write(self.style.SUCCESS(f"Stored {location_count} stock snapshots for {snapshot_date}."))
@@ -0,0 +1,71 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:50
+
+import django.db.models.deletion
+from decimal import ROUND_HALF_UP, Decimal
+from django.db import migrations, models
+
+
+def backfill_stock_balances(apps, schema_editor):
+    StockTransaction = apps.get_model("procurement", "StockTransaction")
+    MaterialStockBalance = apps.get_model("procurement", "MaterialStockBalance")
+
+    totals = {}
+    for material_id, warehouse_id, transaction_type, quantity, unit_cost in StockTransaction.objects.values_list(
+        "material_id", "warehouse_id", "transaction_type", "quantity", "unit_cost"
+    ).iterator(chunk_size=2000):
+        signed_quantity = -quantity if transaction_type == "out" else quantity
+        location = totals.setdefault((material_id, warehouse_id), [Decimal("0.000"), Decimal("0.00")])
+        location[0] += signed_quantity
+        location[1] += (signed_quantity * unit_cost).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    MaterialStockBalance.objects.bulk_create(
+        [
+            MaterialStockBalance(material_id=material_id, warehouse_id=warehouse_id, quantity=quantity, value=value)
+            for (material_id, warehouse_id), (quantity, value) in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('procurement', '0005_alter_purchaseorder_currency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialStockBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('quantity', models.DecimalField(decimal_places=3, default=Decimal('0.000'), max_digits=16)),
+                ('value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_balances', to='procurement.material')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_balances', to='procurement.warehouse')),
+            ],
+            options={
+                'ordering': ['material', 'warehouse'],
+                'constraints': [models.UniqueConstraint(fields=('material', 'warehouse'), name='procurement_stock_balance_unique_location')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MaterialStockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('snapshot_date', models.DateField()),
+                ('quantity', models.DecimalField(decimal_places=3, default=Decimal('0.000'), max_digits=16)),
+                ('value', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('material', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='procurement.material')),
+                ('warehouse', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='procurement.warehouse')),
+            ],
+            options={
+                'ordering': ['-snapshot_date', 'material', 'warehouse'],
+                'indexes': [models.Index(fields=['snapshot_date'], name='procurement_snapsho_da1fed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('material', 'warehouse', 'snapshot_date'), name='procurement_stock_snapshot_unique_location_date')],
+            },
+        ),
+        migrations.RunPython(backfill_stock_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('procurement', '0006_stock_balances'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['updated_at'], name='procurement_updated_247685_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['updated_at'], name='procurement_updated_c93b83_idx'),
+        ),
+    ]
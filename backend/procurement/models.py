@@ -18,6 +18,7 @@ class Supplier(TimeStampedModel):
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return f"{self.code} - {self.name}"
@@ -51,6 +52,7 @@ class Material(TimeStampedModel):
 
     class Meta:
         ordering = ["sku"]
+        indexes = [models.Index(fields=["updated_at"])]
 
     def __str__(self) -> str:
         return f"{self.sku} - {self.name}"
@@ -264,3 +266,42 @@ class StockTransaction(TimeStampedModel):
         indexes = [
             models.Index(fields=["material", "warehouse", "transaction_date"]),
         ]
+
+
+class MaterialStockBalance(TimeStampedModel):
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name="stock_balances")
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name="stock_balances")
+    quantity = models.DecimalField(max_digits=16, decimal_places=3, default=Decimal("0.000"))
+    value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        ordering = ["material", "warehouse"]
+        constraints = [
+            models.UniqueConstraint(fields=["material", "warehouse"], name="procurement_stock_balance_unique_location")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.material.sku} @ {self.warehouse.code}: {self.quantity}"
+
+
+class MaterialStockSnapshot(TimeStampedModel):
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name="stock_snapshots")
+    warehouse = models.ForeignKey(Warehouse, on_delete=models.CASCADE, related_name="stock_snapshots")
+    snapshot_date = models.DateField()
+    quantity = models.DecimalField(max_digits=16, decimal_places=3, default=Decimal("0.000"))
+    value = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        ordering = ["-snapshot_date", "material", "warehouse"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["material", "warehouse", "snapshot_date"],
+                name="procurement_stock_snapshot_unique_location_date",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["snapshot_date"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.material.sku} @ {self.warehouse.code} on {self.snapshot_date}"
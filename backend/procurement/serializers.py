@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from core.bulk import BulkCreateListSerializer
 from core.services.sequence import next_sequence
 from .models import (
     Material,
@@ -290,6 +291,21 @@ class PurchaseOrderSerializer(serializers.ModelSerializer):
         return instance
 
 
+class StockOnHandSerializer(serializers.Serializer):
+    material_id = serializers.IntegerField()
+    material_sku = serializers.CharField()
+    warehouse_id = serializers.IntegerField()
+    warehouse_code = serializers.CharField()
+    quantity = serializers.DecimalField(max_digits=16, decimal_places=3)
+    value = serializers.DecimalField(max_digits=16, decimal_places=2)
+
+
+class StockOnHandReportSerializer(serializers.Serializer):
+    as_of = serializers.DateField(allow_null=True)
+    total_value = serializers.DecimalField(max_digits=18, decimal_places=2)
+    results = StockOnHandSerializer(many=True)
+
+
 class StockTransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = StockTransaction
@@ -309,6 +325,7 @@ class StockTransactionSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_by", "created_at", "updated_at"]
+        list_serializer_class = BulkCreateListSerializer
 
     def validate(self, attrs):
         project = attrs.get("project") or getattr(self.instance, "project", None)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Case, DecimalField, F, OuterRef, Q, Subquery, Sum, When
+from django.db.models.functions import Round
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from core.bulk import bulk_upsert
+from .models import MaterialStockBalance, MaterialStockSnapshot, StockTransaction
+
+ZERO_QUANTITY = Decimal("0.000")
+ZERO_VALUE = Decimal("0.00")
+QUANTITY_FIELD = DecimalField(max_digits=16, decimal_places=3)
+VALUE_FIELD = DecimalField(max_digits=16, decimal_places=2)
+
+
+def signed_quantity(stock_transaction) -> Decimal:
+    if stock_transaction.transaction_type == StockTransaction.TransactionType.OUT:
+        return -stock_transaction.quantity
+    return stock_transaction.quantity
+
+
+def _signed_quantity_expression():
+    return Case(
+        When(transaction_type=StockTransaction.TransactionType.OUT, then=-F("quantity")),
+        default=F("quantity"),
+        output_field=QUANTITY_FIELD,
+    )
+
+
+def _stock_value(quantity: Decimal, unit_cost: Decimal) -> Decimal:
+    return (quantity * unit_cost).quantize(ZERO_VALUE, rounding=ROUND_HALF_UP)
+
+
+def apply_stock_transactions(*, added=(), removed=()):
+    changes: dict[tuple[int, int], list[Decimal]] = {}
+    earliest_dates: dict[tuple[int, int], date] = {}
+    for sign, stock_transactions in ((1, added), (-1, removed)):
+        for stock_transaction in stock_transactions:
+            key = (stock_transaction.material_id, stock_transaction.warehouse_id)
+            quantity = signed_quantity(stock_transaction) * sign
+            totals = changes.setdefault(key, [ZERO_QUANTITY, ZERO_VALUE])
+            totals[0] += quantity
+            totals[1] += _stock_value(quantity, stock_transaction.unit_cost)
+            earliest_dates[key] = min(earliest_dates.get(key, stock_transaction.transaction_date), stock_transaction.transaction_date)
+    if not changes:
+        return
+
+    MaterialStockBalance.objects.bulk_create(
+        [MaterialStockBalance(material_id=material_id, warehouse_id=warehouse_id) for material_id, warehouse_id in changes],
+        ignore_conflicts=True,
+    )
+    balances = [
+        balance
+        for balance in MaterialStockBalance.objects.filter(
+            material_id__in={material_id for material_id, _ in changes},
+            warehouse_id__in={warehouse_id for _, warehouse_id in changes},
+        ).order_by("pk")
+        if (balance.material_id, balance.warehouse_id) in changes
+    ]
+    now = timezone.now()
+    decreased_ids = []
+    for balance in balances:
+        quantity, value = changes[(balance.material_id, balance.warehouse_id)]
+        # Increments rather than computed totals, so concurrent writers to the same location cannot overwrite each other.
+        balance.quantity = F("quantity") + quantity
+        balance.value = F("value") + value
+        balance.updated_at = now
+        if quantity < ZERO_QUANTITY:
+            decreased_ids.append(balance.pk)
+    MaterialStockBalance.objects.bulk_update(balances, ["quantity", "value", "updated_at"], batch_size=1000)
+
+    if decreased_ids and not settings.PROCUREMENT_ALLOW_NEGATIVE_STOCK:
+        # Checked after the write, while this transaction holds the updated rows, so no aggregate over the history is needed.
+        overdrawn = (
+            MaterialStockBalance.objects.filter(pk__in=decreased_ids, quantity__lt=ZERO_QUANTITY)
+            .values_list("material_id", "warehouse_id")
+            .first()
+        )
+        if overdrawn:
+            raise ValidationError({"quantity": f"Insufficient stock for material {overdrawn[0]} in warehouse {overdrawn[1]}."})
+
+    # Snapshots taken on or after a back-dated change no longer match the history.
+    MaterialStockSnapshot.objects.filter(
+        reduce(
+            or_,
+            (
+                Q(material_id=material_id, warehouse_id=warehouse_id, snapshot_date__gte=earliest_date)
+                for (material_id, warehouse_id), earliest_date in earliest_dates.items()
+            ),
+        )
+    ).delete()
+
+
+def _filter_locations(queryset, material_ids=None, warehouse_ids=None):
+    if material_ids:
+        queryset = queryset.filter(material_id__in=material_ids)
+    if warehouse_ids:
+        queryset = queryset.filter(warehouse_id__in=warehouse_ids)
+    return queryset
+
+
+def _grouped_movements(stock_transactions) -> dict[tuple[int, int], list[Decimal]]:
+    rows = stock_transactions.order_by().values("material_id", "warehouse_id").annotate(
+        net_quantity=Sum(_signed_quantity_expression()),
+        net_value=Sum(Round(_signed_quantity_expression() * F("unit_cost"), 2, output_field=VALUE_FIELD)),
+    )
+    return {(row["material_id"], row["warehouse_id"]): [row["net_quantity"], row["net_value"]] for row in rows}
+
+
+def stock_on_hand_from_transactions(
+    stock_transactions, *, as_of: date | None = None, material_ids=None, warehouse_ids=None
+) -> dict[tuple[int, int], list[Decimal]]:
+    stock_transactions = _filter_locations(stock_transactions, material_ids, warehouse_ids)
+    if as_of is not None:
+        stock_transactions = stock_transactions.filter(transaction_date__lte=as_of)
+    return _grouped_movements(stock_transactions)
+
+
+def stock_on_hand_as_of(as_of: date, *, material_ids=None, warehouse_ids=None) -> dict[tuple[int, int], list[Decimal]]:
+    # Latest snapshot on or before the date per location, plus the movements recorded after it.
+    latest_snapshot_date = (
+        MaterialStockSnapshot.objects.filter(
+            material=OuterRef("material"),
+            warehouse=OuterRef("warehouse"),
+            snapshot_date__lte=as_of,
+        )
+        .order_by("-snapshot_date")
+        .values("snapshot_date")[:1]
+    )
+    snapshots = _filter_locations(MaterialStockSnapshot.objects.all(), material_ids, warehouse_ids).filter(
+        snapshot_date=Subquery(latest_snapshot_date)
+    )
+    totals = {
+        (row["material_id"], row["warehouse_id"]): [row["quantity"], row["value"]]
+        for row in snapshots.values("material_id", "warehouse_id", "quantity", "value")
+    }
+
+    movements = (
+        _filter_locations(StockTransaction.objects.all(), material_ids, warehouse_ids)
+        .filter(transaction_date__lte=as_of)
+        .annotate(snapshot_date=Subquery(latest_snapshot_date))
+        .filter(Q(snapshot_date__isnull=True) | Q(transaction_date__gt=F("snapshot_date")))
+    )
+    for key, (quantity, value) in _grouped_movements(movements).items():
+        location = totals.setdefault(key, [ZERO_QUANTITY, ZERO_VALUE])
+        location[0] += quantity or ZERO_QUANTITY
+        location[1] += value or ZERO_VALUE
+    return totals
+
+
+def take_stock_snapshot(snapshot_date: date) -> int:
+    totals = stock_on_hand_as_of(snapshot_date)
+    bulk_upsert(
+        MaterialStockSnapshot,
+        [
+            MaterialStockSnapshot(
+                material_id=material_id,
+                warehouse_id=warehouse_id,
+                snapshot_date=snapshot_date,
+                quantity=quantity,
+                value=value,
+            )
+            for (material_id, warehouse_id), (quantity, value) in totals.items()
+        ],
+        batch_size=1000,
+        unique_fields=["material", "warehouse", "snapshot_date"],
+        update_fields=["quantity", "value", "updated_at"],
+    )
+    return len(totals)
+
+
+def rebuild_stock_balances() -> int:
+    totals = _grouped_movements(StockTransaction.objects.all())
+    MaterialStockBalance.objects.all().delete()
+    MaterialStockBalance.objects.bulk_create(
+        [
+            MaterialStockBalance(material_id=material_id, warehouse_id=warehouse_id, quantity=quantity, value=value)
+            for (material_id, warehouse_id), (quantity, value) in totals.items()
+        ],
+        batch_size=1000,
+    )
+    return len(totals)
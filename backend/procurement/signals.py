@@ -0,0 +1,5 @@
+from core.conditional import track_model_versions
+
+from .models import Material, Supplier
+
+track_model_versions(Material, Supplier)
@@ -1,11 +1,24 @@
 from datetime import date
+from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from core.models import Role
-from .models import Supplier
+from core.models import AuditLog, ModelVersion, Role
+from .models import (
+    Material,
+    MaterialStockBalance,
+    MaterialStockSnapshot,
+    PurchaseOrder,
+    PurchaseOrderItem,
+    StockTransaction,
+    Supplier,
+    Warehouse,
+)
+from .services import rebuild_stock_balances, take_stock_snapshot
 from projects.models import CostCode, Project, ProjectCostRecord
 
 
@@ -595,3 +608,214 @@ class TestProcurementApi(APITestCase):
             format="json",
         )
         self.assertEqual(create_stock_transaction.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_material_list_supports_conditional_get(self):
+        self.client.post("/api/v1/procurement/materials/", {"sku": "MAT-ETAG", "name": "Rebar", "unit": "ton"}, format="json")
+        first = self.client.get("/api/v1/procurement/materials/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+
+        cached = self.client.get("/api/v1/procurement/materials/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached.content, b"")
+
+        material_id = first.data["results"][0]["id"]
+        self.client.patch(f"/api/v1/procurement/materials/{material_id}/", {"reorder_level": "5.000"}, format="json")
+        changed = self.client.get("/api/v1/procurement/materials/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+        older = Material.objects.create(sku="MAT-OLD", name="Old stock", unit="ton")
+        Material.objects.filter(pk=older.pk).update(updated_at=older.updated_at.replace(year=2000))
+        before_delete = self.client.get("/api/v1/procurement/materials/")
+        older.delete()
+        self.assertEqual(ModelVersion.objects.get(label="procurement.material").deletes, 1)
+        deleted = self.client.get("/api/v1/procurement/materials/", HTTP_IF_NONE_MATCH=before_delete["ETag"])
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+
+    def test_bulk_create_stock_transactions(self):
+        material_id = self.client.post(
+            "/api/v1/procurement/materials/", {"sku": "MAT-BULK", "name": "Sand", "unit": "m3"}, format="json"
+        ).data["id"]
+        warehouse_id = self.client.post(
+            "/api/v1/procurement/warehouses/", {"code": "WH-BULK", "name": "Bulk Yard"}, format="json"
+        ).data["id"]
+        payload = [
+            {
+                "material": material_id,
+                "warehouse": warehouse_id,
+                "transaction_type": "in",
+                "quantity": f"{index + 1}.000",
+                "unit_cost": "4.00",
+                "transaction_date": str(date.today()),
+            }
+            for index in range(3)
+        ]
+
+        response = self.client.post("/api/v1/procurement/stock-transactions/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row["quantity"] for row in response.data], ["1.000", "2.000", "3.000"])
+        self.assertEqual({row["created_by"] for row in response.data}, {self.user.id})
+        self.assertEqual(
+            AuditLog.objects.filter(model_name="StockTransaction", action="create").count(),
+            3,
+        )
+
+    def test_stock_balance_tracks_transactions_and_blocks_negative_stock(self):
+        material = Material.objects.create(sku="MAT-STK", name="Cement", unit="bag")
+        warehouse = Warehouse.objects.create(code="WH-STK", name="Main Yard")
+
+        def post(transaction_type, quantity, transaction_date="2026-03-10", unit_cost="4.00"):
+            return self.client.post(
+                "/api/v1/procurement/stock-transactions/",
+                {
+                    "material": material.id,
+                    "warehouse": warehouse.id,
+                    "transaction_type": transaction_type,
+                    "quantity": quantity,
+                    "unit_cost": unit_cost,
+                    "transaction_date": transaction_date,
+                },
+                format="json",
+            )
+
+        receipt = post("in", "10.000")
+        self.assertEqual(receipt.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(post("out", "3.000", "2026-03-12").status_code, status.HTTP_201_CREATED)
+        balance = MaterialStockBalance.objects.get(material=material, warehouse=warehouse)
+        self.assertEqual((balance.quantity, balance.value), (Decimal("7.000"), Decimal("28.00")))
+
+        overdraw = post("out", "8.000", "2026-03-13")
+        self.assertEqual(overdraw.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("quantity", overdraw.data)
+        self.assertEqual(StockTransaction.objects.count(), 2)
+
+        bulk = self.client.post(
+            "/api/v1/procurement/stock-transactions/bulk/",
+            [
+                {"material": material.id, "warehouse": warehouse.id, "transaction_type": tx_type, "quantity": quantity, "transaction_date": "2026-03-14"}
+                for tx_type, quantity in (("in", "1.000"), ("out", "9.000"))
+            ],
+            format="json",
+        )
+        self.assertEqual(bulk.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(StockTransaction.objects.count(), 2)
+
+        update = self.client.patch(
+            f"/api/v1/procurement/stock-transactions/{receipt.data['id']}/", {"quantity": "12.000"}, format="json"
+        )
+        self.assertEqual(update.status_code, status.HTTP_200_OK)
+        balance.refresh_from_db()
+        self.assertEqual(balance.quantity, Decimal("9.000"))
+
+        self.client.force_authenticate(user=self.approver)
+        delete = self.client.delete(f"/api/v1/procurement/stock-transactions/{receipt.data['id']}/")
+        self.assertEqual(delete.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(StockTransaction.objects.filter(pk=receipt.data["id"]).exists())
+
+    def test_stock_on_hand_as_of_combines_snapshot_and_later_movements(self):
+        material = Material.objects.create(sku="MAT-ASOF", name="Rebar", unit="ton")
+        warehouse = Warehouse.objects.create(code="WH-ASOF", name="Steel Yard")
+        for transaction_type, quantity, transaction_date in (
+            ("in", Decimal("20.000"), date(2026, 4, 1)),
+            ("out", Decimal("5.000"), date(2026, 4, 3)),
+            ("in", Decimal("2.000"), date(2026, 4, 8)),
+        ):
+            StockTransaction.objects.create(
+                material=material,
+                warehouse=warehouse,
+                transaction_type=transaction_type,
+                quantity=quantity,
+                unit_cost=Decimal("10.00"),
+                transaction_date=transaction_date,
+            )
+        take_stock_snapshot(date(2026, 4, 5))
+        snapshot = MaterialStockSnapshot.objects.get(snapshot_date=date(2026, 4, 5))
+        self.assertEqual((snapshot.quantity, snapshot.value), (Decimal("15.000"), Decimal("150.00")))
+        # Later reads must come from the snapshot rather than the full history.
+        snapshot.quantity = Decimal("100.000")
+        snapshot.save(update_fields=["quantity", "updated_at"])
+
+        self.client.force_authenticate(user=self.approver)
+        response = self.client.get("/api/v1/procurement/stock-transactions/on-hand/", {"as_of": "2026-04-10"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["quantity"], "102.000")
+        self.assertEqual(response.data["results"][0]["value"], "170.00")
+
+        self.client.force_authenticate(user=self.user)
+        back_dated = self.client.post(
+            "/api/v1/procurement/stock-transactions/",
+            {
+                "material": material.id,
+                "warehouse": warehouse.id,
+                "transaction_type": "in",
+                "quantity": "1.000",
+                "unit_cost": "10.00",
+                "transaction_date": "2026-04-02",
+            },
+            format="json",
+        )
+        self.assertEqual(back_dated.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(MaterialStockSnapshot.objects.exists())
+
+        # Scoped users only see totals over their own movements, not the company-wide balances.
+        scoped = self.client.get("/api/v1/procurement/stock-transactions/on-hand/", {"material": material.id})
+        self.assertEqual([row["quantity"] for row in scoped.data["results"]], ["1.000"])
+        self.assertEqual(scoped.data["total_value"], "10.00")
+        scoped_as_of = self.client.get("/api/v1/procurement/stock-transactions/on-hand/", {"as_of": "2026-04-01"})
+        self.assertEqual(scoped_as_of.data["results"], [])
+
+        self.client.force_authenticate(user=self.approver)
+        as_of = self.client.get("/api/v1/procurement/stock-transactions/on-hand/", {"as_of": "2026-04-05"})
+        self.assertEqual(as_of.data["results"][0]["quantity"], "16.000")
+
+        rebuild_stock_balances()
+        live = self.client.get("/api/v1/procurement/stock-transactions/on-hand/", {"material": material.id})
+        self.assertIsNone(live.data["as_of"])
+        self.assertEqual(live.data["results"][0]["quantity"], "18.000")
+        self.assertEqual(live.data["total_value"], "180.00")
+
+    def test_bulk_receive_updates_lines_and_stock_in_constant_statements(self):
+        warehouse = Warehouse.objects.create(code="WH-RCV", name="Receiving")
+        materials = [Material.objects.create(sku=f"MAT-RCV-{index}", name=f"Item {index}", unit="pcs") for index in range(30)]
+
+        def receive(order_number, line_count):
+            purchase_order = PurchaseOrder.objects.create(
+                order_number=order_number,
+                supplier=self.supplier,
+                status=PurchaseOrder.Status.SENT,
+                order_date=date(2026, 5, 1),
+                created_by=self.user,
+            )
+            items = PurchaseOrderItem.objects.bulk_create(
+                [
+                    PurchaseOrderItem(
+                        purchase_order=purchase_order,
+                        material=material,
+                        description=material.name,
+                        quantity=Decimal("10.000"),
+                        unit_cost=Decimal("2.50"),
+                    )
+                    for material in materials[:line_count]
+                ]
+            )
+            payload = {
+                "warehouse": warehouse.id,
+                "receipt_date": "2026-05-03",
+                "items": [{"item_id": item.id, "quantity": "4.000"} for item in items],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(f"/api/v1/procurement/purchase-orders/{purchase_order.id}/receive/", payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["status"], "partially_received")
+            self.assertEqual({item["received_quantity"] for item in response.data["items"]}, {"4.000"})
+            return len(queries)
+
+        small = receive("PO-RCV-S", 3)
+        large = receive("PO-RCV-L", 30)
+        self.assertEqual(small, large)
+
+        receipts = StockTransaction.objects.filter(reference_type="purchase_order", reference_id="PO-RCV-L")
+        self.assertEqual(receipts.count(), 30)
+        self.assertEqual(set(receipts.values_list("transaction_date", flat=True)), {date(2026, 5, 3)})
+        balance = MaterialStockBalance.objects.get(material=materials[0], warehouse=warehouse)
+        self.assertEqual((balance.quantity, balance.value), (Decimal("8.000"), Decimal("20.00")))
@@ -1,7 +1,9 @@
 from decimal import Decimal, InvalidOperation
 
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
@@ -17,20 +19,28 @@ from core.access import (
     RowLevelScopeMixin,
 )
 from core.audit import AuditLogMixin
+from core.bulk import BulkCreateMixin
+from core.conditional import ConditionalGetMixin
+from core.fieldsets import query_flag
+from core.pagination import HighVolumePagination
 from projects.models import ProjectCostRecord
 from projects.services import settle_project_cost_records_by_source, sync_project_cost_records_by_source
 from .models import (
     Material,
+    MaterialStockBalance,
     PurchaseOrder,
+    PurchaseOrderItem,
     PurchaseRequest,
     StockTransaction,
     Supplier,
     Warehouse,
 )
+from .services import apply_stock_transactions, stock_on_hand_as_of, stock_on_hand_from_transactions
 from .serializers import (
     MaterialSerializer,
     PurchaseOrderSerializer,
     PurchaseRequestSerializer,
+    StockOnHandReportSerializer,
     StockTransactionSerializer,
     SupplierSerializer,
     WarehouseSerializer,
@@ -155,8 +165,9 @@ class WarehouseViewSet(AuditLogMixin, viewsets.ModelViewSet):
         instance.delete()
 
 
-class MaterialViewSet(AuditLogMixin, viewsets.ModelViewSet):
+class MaterialViewSet(ConditionalGetMixin, AuditLogMixin, viewsets.ModelViewSet):
     queryset = Material.objects.select_related("preferred_supplier").all()
+    conditional_models = {"list": (Material, Supplier), "retrieve": (Material, Supplier)}
     serializer_class = MaterialSerializer
     permission_classes = [ActionBasedRolePermission]
     action_role_map = {
@@ -197,6 +208,7 @@ class PurchaseRequestViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelVi
         "rejected_by",
         "project__created_by",
     )
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROCUREMENT_READ_ROLES,
         "retrieve": PROCUREMENT_READ_ROLES,
@@ -337,6 +349,7 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
         "purchase_request__requested_by",
         "purchase_request__project__created_by",
     )
+    project_scope_fields = ("project", "purchase_request__project")
     action_role_map = {
         "list": PROCUREMENT_READ_ROLES,
         "retrieve": PROCUREMENT_READ_ROLES,
@@ -435,6 +448,12 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
         receipt_lines = request.data.get("items")
         if not isinstance(receipt_lines, list) or not receipt_lines:
             raise ValidationError({"items": "Provide at least one item receipt line."})
+        warehouse = self._resolve_receipt_warehouse(request.data.get("warehouse"))
+        receipt_date = timezone.localdate()
+        if request.data.get("receipt_date"):
+            receipt_date = parse_date(str(request.data["receipt_date"]))
+            if receipt_date is None:
+                raise ValidationError({"receipt_date": "receipt_date must be a date in YYYY-MM-DD format."})
 
         with transaction.atomic():
             purchase_order = PurchaseOrder.objects.select_for_update().get(pk=purchase_order.pk)
@@ -445,7 +464,8 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
             if not order_items:
                 raise ValidationError({"items": "Purchase order has no items to receive."})
 
-            applied_count = 0
+            received_items = {}
+            receipts = []
             for index, line in enumerate(receipt_lines):
                 if not isinstance(line, dict):
                     raise ValidationError({"items": {index: "Each line must contain item_id and quantity."}})
@@ -478,12 +498,39 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
                     )
 
                 item.received_quantity += receive_quantity
-                item.save(update_fields=["received_quantity", "updated_at"])
-                applied_count += 1
+                received_items[item.id] = item
+                receipts.append((item, receive_quantity))
 
-            if applied_count == 0:
+            if not received_items:
                 raise ValidationError({"items": "No receipt lines were applied."})
 
+            # Every line is validated before anything is written, so the statement count does not grow with the receipt.
+            now = timezone.now()
+            for item in received_items.values():
+                item.updated_at = now
+            PurchaseOrderItem.objects.bulk_update(
+                received_items.values(), ["received_quantity", "updated_at"], batch_size=settings.BULK_CREATE_BATCH_SIZE
+            )
+            if warehouse is not None:
+                stock_receipts = [
+                    StockTransaction(
+                        material_id=item.material_id,
+                        warehouse=warehouse,
+                        project_id=purchase_order.project_id,
+                        transaction_type=StockTransaction.TransactionType.IN,
+                        quantity=receive_quantity,
+                        unit_cost=item.unit_cost,
+                        transaction_date=receipt_date,
+                        reference_type="purchase_order",
+                        reference_id=purchase_order.order_number,
+                        created_by=request.user,
+                    )
+                    for item, receive_quantity in receipts
+                    if item.material_id
+                ]
+                StockTransaction.objects.bulk_create(stock_receipts, batch_size=settings.BULK_CREATE_BATCH_SIZE)
+                apply_stock_transactions(added=stock_receipts)
+
             items_after_receipt = list(order_items.values())
             fully_received = all(item.received_quantity >= item.quantity for item in items_after_receipt)
             any_received = any(item.received_quantity > Decimal("0.000") for item in items_after_receipt)
@@ -497,9 +544,21 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
                 purchase_order.status = new_status
                 purchase_order.save(update_fields=["status", "updated_at"])
 
-        purchase_order.refresh_from_db()
+        purchase_order = PurchaseOrder.objects.prefetch_related("items").get(pk=purchase_order.pk)
         return Response(self.get_serializer(purchase_order).data)
 
+    def _resolve_receipt_warehouse(self, raw_warehouse):
+        if raw_warehouse in (None, ""):
+            return None
+        try:
+            warehouse_id = int(raw_warehouse)
+        except (TypeError, ValueError):
+            raise ValidationError({"warehouse": "warehouse must be an integer id."})
+        warehouse = Warehouse.objects.filter(pk=warehouse_id, is_active=True).first()
+        if warehouse is None:
+            raise ValidationError({"warehouse": "Warehouse not found or inactive."})
+        return warehouse
+
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
         purchase_order = self.get_object()
@@ -525,18 +584,23 @@ class PurchaseOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
         return Response(self.get_serializer(purchase_order).data)
 
 
-class StockTransactionViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
+class StockTransactionViewSet(BulkCreateMixin, AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = StockTransaction.objects.select_related("material", "warehouse", "project", "created_by")
     serializer_class = StockTransactionSerializer
     permission_classes = [ActionBasedRolePermission]
+    pagination_class = HighVolumePagination
+    cursor_ordering = ("-created_at", "-id")
     user_scope_fields = ("created_by", "project__created_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROCUREMENT_READ_ROLES,
         "retrieve": PROCUREMENT_READ_ROLES,
         "create": PROCUREMENT_WRITE_ROLES,
+        "bulk_create": PROCUREMENT_WRITE_ROLES,
         "update": PROCUREMENT_WRITE_ROLES,
         "partial_update": PROCUREMENT_WRITE_ROLES,
         "destroy": {ROLE_ADMIN, ROLE_PROJECT_MANAGER},
+        "on_hand": PROCUREMENT_READ_ROLES,
     }
     filterset_fields = ["transaction_type", "material", "warehouse", "project", "transaction_date"]
     search_fields = ["material__sku", "warehouse__code", "reference_type", "reference_id"]
@@ -545,16 +609,88 @@ class StockTransactionViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelV
     def get_queryset(self):
         return self.apply_row_level_scope(super().get_queryset())
 
+    def get_bulk_save_kwargs(self) -> dict:
+        return {"created_by": self.request.user}
+
+    def perform_bulk_create(self, serializer):
+        instances = super().perform_bulk_create(serializer)
+        apply_stock_transactions(added=instances)
+        return instances
+
+    @transaction.atomic
     def perform_create(self, serializer):
         instance = serializer.save(created_by=self.request.user)
+        apply_stock_transactions(added=[instance])
         self.log_action(action="create", instance=instance, changes=serializer.validated_data)
 
+    @transaction.atomic
     def perform_update(self, serializer):
         instance = self.get_object()
         changes = self._build_changes(instance, serializer.validated_data)
-        instance = serializer.save()
-        self.log_action(action="update", instance=instance, changes=changes)
+        updated = serializer.save()
+        apply_stock_transactions(added=[updated], removed=[instance])
+        self.log_action(action="update", instance=updated, changes=changes)
 
+    @transaction.atomic
     def perform_destroy(self, instance):
+        apply_stock_transactions(removed=[instance])
         self.log_action(action="delete", instance=instance)
         instance.delete()
+
+    @action(detail=False, methods=["get"], url_path="on-hand")
+    def on_hand(self, request):
+        filters = {}
+        for param in ("material", "warehouse"):
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                filters[f"{param}_ids"] = [int(value)]
+            except (TypeError, ValueError):
+                raise ValidationError({param: f"{param} must be an integer id."})
+
+        as_of = None
+        raw_as_of = request.query_params.get("as_of")
+        if raw_as_of:
+            as_of = parse_date(raw_as_of)
+            if as_of is None:
+                raise ValidationError({"as_of": "as_of must be a date in YYYY-MM-DD format."})
+
+        if not self.has_global_row_scope():
+            # Balances and snapshots are company-wide, so scoped users get totals over the movements they can see.
+            totals = stock_on_hand_from_transactions(self.get_queryset(), as_of=as_of, **filters)
+        elif as_of:
+            totals = stock_on_hand_as_of(as_of, **filters)
+        else:
+            balances = MaterialStockBalance.objects.all()
+            if "material_ids" in filters:
+                balances = balances.filter(material_id__in=filters["material_ids"])
+            if "warehouse_ids" in filters:
+                balances = balances.filter(warehouse_id__in=filters["warehouse_ids"])
+            totals = {
+                (material_id, warehouse_id): [quantity, value]
+                for material_id, warehouse_id, quantity, value in balances.values_list(
+                    "material_id", "warehouse_id", "quantity", "value"
+                )
+            }
+
+        if not query_flag(request, "include_zero"):
+            totals = {key: amounts for key, amounts in totals.items() if amounts[0] or amounts[1]}
+        skus = dict(Material.objects.filter(id__in={key[0] for key in totals}).values_list("id", "sku"))
+        codes = dict(Warehouse.objects.filter(id__in={key[1] for key in totals}).values_list("id", "code"))
+        rows = sorted(
+            (
+                {
+                    "material_id": material_id,
+                    "material_sku": skus[material_id],
+                    "warehouse_id": warehouse_id,
+                    "warehouse_code": codes[warehouse_id],
+                    "quantity": quantity,
+                    "value": value,
+                }
+                for (material_id, warehouse_id), (quantity, value) in totals.items()
+            ),
+            key=lambda row: (row["material_sku"], row["warehouse_code"]),
+        )
+        report = {"as_of": as_of, "total_value": sum((row["value"] for row in rows), Decimal("0.00")), "results": rows}
+        return Response(StockOnHandReportSerializer(report).data)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework.request import Request
+
+from core.access import ROW_SCOPE_STRATEGY_ACCESS_INDEX, ROW_SCOPE_STRATEGY_JOIN, RowLevelScopeMixin
+
+STRATEGIES = (ROW_SCOPE_STRATEGY_JOIN, ROW_SCOPE_STRATEGY_ACCESS_INDEX)
+
+
+def iter_scoped_viewsets(patterns=None):
+    seen = set()
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            for viewset in iter_scoped_viewsets(pattern.url_patterns):
+                if viewset not in seen:
+                    seen.add(viewset)
+                    yield viewset
+        elif isinstance(pattern, URLPattern):
+            viewset = getattr(pattern.callback, "cls", None)
+            if (
+                viewset
+                and viewset not in seen
+                and issubclass(viewset, RowLevelScopeMixin)
+                and viewset.project_scope_fields
+            ):
+                seen.add(viewset)
+                yield viewset
+
+
+def build_view(viewset, user, strategy: str):
+    request = Request(RequestFactory().get("/"))
+    request.user = user
+    view = viewset()
+    view.request = request
+    view.args = ()
+    view.kwargs = {}
+    view.action = "list"
+    view.format_kwarg = None
+    view.row_scope_strategy = strategy
+    return view
+
+
+def time_strategy(viewset, user, strategy: str, iterations: int, page_size: int) -> dict:
+    samples = []
+    row_count = 0
+    for _ in range(iterations):
+        view = build_view(viewset, user, strategy)
+        started = time.perf_counter()
+        queryset = view.get_queryset()
+        row_count = queryset.count()
+        list(queryset[:page_size])
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "rows": row_count,
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare join-based and access-index row-level scoping for every project-scoped viewset"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True, help="Non-global user to evaluate scoping for.")
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--page-size", dest="page_size", type=int, default=20)
+        parser.add_argument("--json", action="store_true", help="Emit results as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.select_related("role").get(username=options["username"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"User {options['username']!r} does not exist.") from exc
+
+        iterations = max(options["iterations"], 1)
+        results = []
+        for viewset in iter_scoped_viewsets():
+            row = {"viewset": f"{viewset.__module__}.{viewset.__name__}"}
+            for strategy in STRATEGIES:
+                row[strategy] = time_strategy(viewset, user, strategy, iterations, options["page_size"])
+            results.append(row)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for row in results:
+            join_result = row[ROW_SCOPE_STRATEGY_JOIN]
+            index_result = row[ROW_SCOPE_STRATEGY_ACCESS_INDEX]
+            self.stdout.write(
+                f"{row['viewset']}: rows={index_result['rows']} "
+                f"join={join_result['median_ms']}ms access_index={index_result['median_ms']}ms"
+            )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.services import rebuild_project_access
+
+
+class Command(BaseCommand):
+    help = "Rebuild the user x project access index used for row-level scoping"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            entry_count = rebuild_project_access()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {entry_count} project access entries."))
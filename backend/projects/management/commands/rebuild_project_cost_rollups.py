@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.services import rebuild_project_cost_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the project x cost code rollup behind project cost summaries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, action="append", dest="projects", help="Limit the rebuild to these project ids.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rollup_count = rebuild_project_cost_rollups(options["projects"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rollup_count} project cost rollups."))
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_project_access(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectAccess = apps.get_model("projects", "ProjectAccess")
+    ProjectAccess.objects.bulk_create(
+        [
+            ProjectAccess(user_id=user_id, project_id=project_id)
+            for project_id, user_id in Project.objects.exclude(created_by__isnull=True).values_list("id", "created_by_id")
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_subcontractor_alter_project_currency_subcontract_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_entries', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user', 'project'],
+                'indexes': [models.Index(fields=['user', 'project'], name='projects_pr_user_id_5327f8_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'project'), name='projects_access_unique_user_project')],
+            },
+        ),
+        migrations.RunPython(backfill_project_access, migrations.RunPython.noop),
+    ]
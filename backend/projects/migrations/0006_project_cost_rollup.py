@@ -0,0 +1,60 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def backfill_project_cost_rollups(apps, schema_editor):
+    ProjectBudgetLine = apps.get_model("projects", "ProjectBudgetLine")
+    ProjectCostRecord = apps.get_model("projects", "ProjectCostRecord")
+    ProjectCostRollup = apps.get_model("projects", "ProjectCostRollup")
+
+    totals = {}
+    for project_id, cost_code_id, revised_amount in ProjectBudgetLine.objects.values_list("project_id", "cost_code_id", "revised_amount"):
+        totals.setdefault((project_id, cost_code_id), {})["budget"] = revised_amount
+    record_rows = ProjectCostRecord.objects.values("project_id", "cost_code_id").annotate(
+        commitments=Sum("amount", filter=Q(record_type="commitment")),
+        actual=Sum("amount", filter=Q(record_type="actual")),
+    )
+    for row in record_rows:
+        totals.setdefault((row["project_id"], row["cost_code_id"]), {}).update(
+            commitments=row["commitments"] or Decimal("0.00"),
+            actual=row["actual"] or Decimal("0.00"),
+        )
+    ProjectCostRollup.objects.bulk_create(
+        [
+            ProjectCostRollup(project_id=project_id, cost_code_id=cost_code_id, **values)
+            for (project_id, cost_code_id), values in totals.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_access'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCostRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('budget', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('commitments', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('actual', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('cost_code', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cost_rollups', to='projects.costcode')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cost_rollups', to='projects.project')),
+            ],
+            options={
+                'ordering': ['project', 'cost_code'],
+                'constraints': [models.UniqueConstraint(fields=('project', 'cost_code'), name='projects_cost_rollup_unique_cost_code')],
+            },
+        ),
+        migrations.RunPython(backfill_project_cost_rollups, migrations.RunPython.noop),
+    ]
@@ -53,6 +53,26 @@ class Project(TimeStampedModel):
         return f"{self.code} - {self.name}"
 
 
+class ProjectAccess(TimeStampedModel):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="project_access")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="access_entries")
+
+    class Meta:
+        ordering = ["user", "project"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "project"],
+                name="projects_access_unique_user_project",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["user", "project"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.project.code}"
+
+
 class ProjectPhase(TimeStampedModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="phases")
     name = models.CharField(max_length=255)
@@ -213,6 +233,23 @@ class ProjectCostRecord(TimeStampedModel):
         return f"{self.project.code} - {self.cost_code.code} - {self.record_type}"
 
 
+class ProjectCostRollup(TimeStampedModel):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="cost_rollups")
+    cost_code = models.ForeignKey(CostCode, on_delete=models.CASCADE, related_name="cost_rollups")
+    budget = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+    commitments = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+    actual = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        ordering = ["project", "cost_code"]
+        constraints = [
+            models.UniqueConstraint(fields=["project", "cost_code"], name="projects_cost_rollup_unique_cost_code")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.project.code} - {self.cost_code.code}"
+
+
 class ChangeOrder(TimeStampedModel):
     class Status(models.TextChoices):
         DRAFT = "draft", "Draft"
@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
+from core.bulk import BulkCreateListSerializer
 from core.services.sequence import next_sequence
 from .models import (
     BoQItem,
@@ -97,6 +98,7 @@ class BoQItemSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at", "planned_total_cost", "actual_total_cost"]
+        list_serializer_class = BulkCreateListSerializer
 
     def validate(self, attrs):
         project = attrs.get("project") or getattr(self.instance, "project", None)
@@ -148,6 +150,7 @@ class ProjectBudgetLineSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+        list_serializer_class = BulkCreateListSerializer
 
     def validate(self, attrs):
         project = attrs.get("project") or getattr(self.instance, "project", None)
@@ -159,9 +162,15 @@ class ProjectBudgetLineSerializer(serializers.ModelSerializer):
         return attrs
 
     def create(self, validated_data):
-        if "revised_amount" not in validated_data:
-            validated_data["revised_amount"] = validated_data.get("baseline_amount", Decimal("0.00"))
-        return super().create(validated_data)
+        return super().create(self._with_default_revised_amount(validated_data))
+
+    def prepare_bulk_create(self, items):
+        return [self._with_default_revised_amount(attrs) for attrs in items]
+
+    def _with_default_revised_amount(self, attrs):
+        if "revised_amount" not in attrs:
+            attrs["revised_amount"] = attrs.get("baseline_amount", Decimal("0.00"))
+        return attrs
 
 
 class ProjectCostRecordSerializer(serializers.ModelSerializer):
@@ -211,6 +220,27 @@ class ProjectCostSummarySerializer(serializers.Serializer):
     lines = ProjectCostSummaryLineSerializer(many=True)
 
 
+class ProjectPortfolioCostTotalsSerializer(serializers.Serializer):
+    currency = serializers.CharField()
+    budget = serializers.DecimalField(max_digits=16, decimal_places=2)
+    commitments = serializers.DecimalField(max_digits=16, decimal_places=2)
+    actual = serializers.DecimalField(max_digits=16, decimal_places=2)
+    variance = serializers.DecimalField(max_digits=16, decimal_places=2)
+
+
+class ProjectPortfolioCostSerializer(serializers.Serializer):
+    project_id = serializers.IntegerField(source="id")
+    project_code = serializers.CharField(source="code")
+    project_name = serializers.CharField(source="name")
+    status = serializers.CharField()
+    currency = serializers.CharField()
+    budget = serializers.DecimalField(max_digits=16, decimal_places=2)
+    commitments = serializers.DecimalField(max_digits=16, decimal_places=2)
+    actual = serializers.DecimalField(max_digits=16, decimal_places=2)
+    variance = serializers.DecimalField(max_digits=16, decimal_places=2)
+    lines = ProjectCostSummaryLineSerializer(many=True, required=False)
+
+
 class ChangeOrderLineSerializer(serializers.ModelSerializer):
     class Meta:
         model = ChangeOrderLine
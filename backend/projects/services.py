@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+from django.db import transaction
+from django.db.models import DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import ProjectCostRecord
+from .models import Project, ProjectAccess, ProjectBudgetLine, ProjectCostRecord, ProjectCostRollup
+
+ZERO = Decimal("0.00")
+ROLLUP_AMOUNT_FIELD = DecimalField(max_digits=16, decimal_places=2)
+PORTFOLIO_FIELDS = ("id", "code", "name", "status", "currency")
 
 
 def upsert_project_cost_record(
@@ -58,17 +65,27 @@ def upsert_project_cost_record(
     return cost_record
 
 
+def _zero_cost_records(queryset):
+    queryset = queryset.exclude(amount=ZERO)
+    keys = set(queryset.values_list("project_id", "cost_code_id").distinct())
+    if keys:
+        queryset.update(amount=ZERO, updated_at=timezone.now())
+        refresh_project_cost_rollups(keys)
+
+
 def settle_project_cost_records_by_source(
     *,
     record_type: str,
     source_module: str,
     source_reference: str,
 ):
-    ProjectCostRecord.objects.filter(
-        record_type=record_type,
-        source_module=source_module,
-        source_reference=source_reference,
-    ).exclude(amount=Decimal("0.00")).update(amount=Decimal("0.00"), updated_at=timezone.now())
+    _zero_cost_records(
+        ProjectCostRecord.objects.filter(
+            record_type=record_type,
+            source_module=source_module,
+            source_reference=source_reference,
+        )
+    )
 
 
 def sync_project_cost_records_by_source(
@@ -90,30 +107,218 @@ def sync_project_cost_records_by_source(
         )
         return
 
-    amount_by_cost_code = amount_by_cost_code or {}
-    synced_cost_code_ids = set()
-    for cost_code, amount in amount_by_cost_code.items():
-        if not cost_code:
-            continue
-        upsert_project_cost_record(
-            project=project,
-            cost_code=cost_code,
-            record_type=record_type,
-            amount=amount,
-            record_date=record_date,
-            source_module=source_module,
-            source_reference=source_reference,
-            created_by=created_by,
-            notes=f"{notes_prefix}{source_reference}".strip(),
-        )
-        synced_cost_code_ids.add(cost_code.id)
-
-    stale_records = ProjectCostRecord.objects.filter(
+    notes = f"{notes_prefix}{source_reference}".strip()
+    amount_by_cost_code_id = {
+        cost_code.id: amount for cost_code, amount in (amount_by_cost_code or {}).items() if cost_code
+    }
+    existing_records = {}
+    for record in ProjectCostRecord.objects.filter(
         project=project,
         record_type=record_type,
         source_module=source_module,
         source_reference=source_reference,
+    ).order_by("id"):
+        existing_records.setdefault(record.cost_code_id, record)
+
+    now = timezone.now()
+    new_records = []
+    changed_records = []
+    changed_fields = set()
+    for cost_code_id, amount in amount_by_cost_code_id.items():
+        record = existing_records.get(cost_code_id)
+        if record is None:
+            new_records.append(
+                ProjectCostRecord(
+                    project=project,
+                    cost_code_id=cost_code_id,
+                    record_type=record_type,
+                    amount=amount,
+                    record_date=record_date,
+                    source_module=source_module,
+                    source_reference=source_reference,
+                    created_by=created_by,
+                    notes=notes,
+                )
+            )
+            continue
+
+        fields = set()
+        if record.amount != amount:
+            record.amount = amount
+            fields.add("amount")
+        if record.record_date != record_date:
+            record.record_date = record_date
+            fields.add("record_date")
+        if notes and record.notes != notes:
+            record.notes = notes
+            fields.add("notes")
+        if created_by and record.created_by_id is None:
+            record.created_by = created_by
+            fields.add("created_by")
+        if fields:
+            changed_records.append(record)
+            changed_fields |= fields
+
+    for cost_code_id, record in existing_records.items():
+        if cost_code_id not in amount_by_cost_code_id and record.amount != ZERO:
+            record.amount = ZERO
+            changed_records.append(record)
+            changed_fields.add("amount")
+
+    if new_records:
+        ProjectCostRecord.objects.bulk_create(new_records, batch_size=500)
+    if changed_records:
+        for record in changed_records:
+            record.updated_at = now
+        ProjectCostRecord.objects.bulk_update(changed_records, sorted(changed_fields | {"updated_at"}), batch_size=500)
+    refresh_project_cost_rollups((project.id, record.cost_code_id) for record in [*new_records, *changed_records])
+
+
+def _rollup_totals(project_ids, cost_code_ids) -> dict[tuple[int, int], dict]:
+    totals: dict[tuple[int, int], dict] = {}
+    budget_rows = ProjectBudgetLine.objects.filter(project_id__in=project_ids, cost_code_id__in=cost_code_ids).values_list(
+        "project_id", "cost_code_id", "revised_amount"
     )
-    if synced_cost_code_ids:
-        stale_records = stale_records.exclude(cost_code_id__in=synced_cost_code_ids)
-    stale_records.exclude(amount=Decimal("0.00")).update(amount=Decimal("0.00"), updated_at=timezone.now())
+    for project_id, cost_code_id, revised_amount in budget_rows:
+        totals.setdefault((project_id, cost_code_id), {})["budget"] = revised_amount
+
+    record_rows = (
+        ProjectCostRecord.objects.filter(project_id__in=project_ids, cost_code_id__in=cost_code_ids)
+        .values("project_id", "cost_code_id")
+        .annotate(
+            commitments=Sum("amount", filter=Q(record_type=ProjectCostRecord.RecordType.COMMITMENT)),
+            actual=Sum("amount", filter=Q(record_type=ProjectCostRecord.RecordType.ACTUAL)),
+        )
+    )
+    for row in record_rows:
+        key = (row["project_id"], row["cost_code_id"])
+        totals.setdefault(key, {}).update(commitments=row["commitments"] or ZERO, actual=row["actual"] or ZERO)
+    return totals
+
+
+def _lock_rollups(keys, project_ids, cost_code_ids) -> list[ProjectCostRollup]:
+    ProjectCostRollup.objects.bulk_create(
+        [ProjectCostRollup(project_id=project_id, cost_code_id=cost_code_id) for project_id, cost_code_id in sorted(keys)],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    # Rows are locked in key order so writers touching overlapping keys queue up instead of deadlocking.
+    rollups = (
+        ProjectCostRollup.objects.select_for_update()
+        .filter(project_id__in=project_ids, cost_code_id__in=cost_code_ids)
+        .order_by("project_id", "cost_code_id")
+    )
+    return [rollup for rollup in rollups if (rollup.project_id, rollup.cost_code_id) in keys]
+
+
+def refresh_project_cost_rollups(keys):
+    keys = {(project_id, cost_code_id) for project_id, cost_code_id in keys if project_id and cost_code_id}
+    if not keys:
+        return
+    project_ids = {project_id for project_id, _ in keys}
+    cost_code_ids = {cost_code_id for _, cost_code_id in keys}
+    with transaction.atomic():
+        # Sources are summed only after the rollup rows are locked, so a concurrent writer on the same key
+        # waits for this transaction and then sees its committed rows.
+        rollups = _lock_rollups(keys, project_ids, cost_code_ids)
+        totals = _rollup_totals(project_ids, cost_code_ids)
+        now = timezone.now()
+        for rollup in rollups:
+            values = totals.get((rollup.project_id, rollup.cost_code_id), {})
+            rollup.budget = values.get("budget", ZERO)
+            rollup.commitments = values.get("commitments", ZERO)
+            rollup.actual = values.get("actual", ZERO)
+            rollup.updated_at = now
+        ProjectCostRollup.objects.bulk_update(rollups, ["budget", "commitments", "actual", "updated_at"], batch_size=1000)
+
+
+def rebuild_project_cost_rollups(project_ids=None) -> int:
+    rollups = ProjectCostRollup.objects.all()
+    budget_lines = ProjectBudgetLine.objects.all()
+    cost_records = ProjectCostRecord.objects.all()
+    if project_ids is not None:
+        rollups = rollups.filter(project_id__in=project_ids)
+        budget_lines = budget_lines.filter(project_id__in=project_ids)
+        cost_records = cost_records.filter(project_id__in=project_ids)
+
+    keys = set(budget_lines.values_list("project_id", "cost_code_id")) | set(
+        cost_records.values_list("project_id", "cost_code_id").distinct()
+    )
+    rollups.delete()
+    for project_id in sorted({project_id for project_id, _ in keys}):
+        refresh_project_cost_rollups({key for key in keys if key[0] == project_id})
+    return len(keys)
+
+
+def _rollup_sums(prefix: str = "") -> dict:
+    return {
+        name: Coalesce(Sum(f"{prefix}{name}"), Value(ZERO), output_field=ROLLUP_AMOUNT_FIELD)
+        for name in ("budget", "commitments", "actual")
+    }
+
+
+def portfolio_cost_rows(project_queryset):
+    return (
+        project_queryset.order_by()
+        .values(*PORTFOLIO_FIELDS)
+        .annotate(**_rollup_sums("cost_rollups__"))
+        .annotate(variance=F("budget") - F("actual"))
+    )
+
+
+def portfolio_cost_totals(project_queryset) -> list[dict]:
+    # Projects can be budgeted in different currencies, so totals are only summed within one currency.
+    return list(
+        ProjectCostRollup.objects.filter(project__in=project_queryset.order_by().values("pk"))
+        .values(currency=F("project__currency"))
+        .annotate(**_rollup_sums())
+        .annotate(variance=F("budget") - F("actual"))
+        .order_by("currency")
+    )
+
+
+def portfolio_cost_lines(project_ids) -> dict[int, list[dict]]:
+    lines: dict[int, list[dict]] = {project_id: [] for project_id in project_ids}
+    rows = (
+        ProjectCostRollup.objects.filter(project_id__in=project_ids)
+        .order_by("project_id", "cost_code__code")
+        .values("project_id", "cost_code_id", "cost_code__code", "cost_code__name", "budget", "commitments", "actual")
+    )
+    for row in rows:
+        lines[row["project_id"]].append(
+            {
+                "cost_code_id": row["cost_code_id"],
+                "cost_code": row["cost_code__code"],
+                "cost_code_name": row["cost_code__name"],
+                "budget": row["budget"],
+                "commitments": row["commitments"],
+                "actual": row["actual"],
+                "available": row["budget"] - row["actual"],
+                "variance": row["budget"] - row["actual"],
+            }
+        )
+    return lines
+
+
+def project_member_ids(project) -> set[int]:
+    return {project.created_by_id} if project.created_by_id else set()
+
+
+def sync_project_access(project):
+    member_ids = project_member_ids(project)
+    ProjectAccess.objects.filter(project=project).exclude(user_id__in=member_ids).delete()
+    existing_ids = set(ProjectAccess.objects.filter(project=project).values_list("user_id", flat=True))
+    ProjectAccess.objects.bulk_create(
+        [ProjectAccess(user_id=user_id, project=project) for user_id in member_ids - existing_ids],
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_project_access() -> int:
+    ProjectAccess.objects.all().delete()
+    entries = [
+        ProjectAccess(user_id=user_id, project_id=project_id)
+        for project_id, user_id in Project.objects.exclude(created_by__isnull=True).values_list("id", "created_by_id")
+    ]
+    ProjectAccess.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    return len(entries)
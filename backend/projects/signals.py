@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Project, ProjectBudgetLine, ProjectCostRecord
+from .services import refresh_project_cost_rollups, sync_project_access
+
+ROLLUP_KEY_FIELDS = {"project", "cost_code"}
+
+
+@receiver(post_save, sender=Project, dispatch_uid="projects_sync_project_access")
+def sync_project_access_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and "created_by" not in update_fields:
+        return
+    sync_project_access(instance)
+
+
+@receiver(pre_save, sender=ProjectBudgetLine, dispatch_uid="projects_budget_line_remember_rollup_key")
+@receiver(pre_save, sender=ProjectCostRecord, dispatch_uid="projects_cost_record_remember_rollup_key")
+def remember_cost_rollup_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_rollup_key = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not ROLLUP_KEY_FIELDS & set(update_fields):
+        return
+    instance._previous_rollup_key = sender.objects.filter(pk=instance.pk).values_list("project_id", "cost_code_id").first()
+
+
+@receiver(post_save, sender=ProjectBudgetLine, dispatch_uid="projects_budget_line_refresh_rollup")
+@receiver(post_save, sender=ProjectCostRecord, dispatch_uid="projects_cost_record_refresh_rollup")
+def refresh_cost_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    keys = {(instance.project_id, instance.cost_code_id)}
+    previous_key = getattr(instance, "_previous_rollup_key", None)
+    if previous_key:
+        keys.add(previous_key)
+    refresh_project_cost_rollups(keys)
+
+
+@receiver(post_delete, sender=ProjectBudgetLine, dispatch_uid="projects_budget_line_refresh_rollup_on_delete")
+@receiver(post_delete, sender=ProjectCostRecord, dispatch_uid="projects_cost_record_refresh_rollup_on_delete")
+def refresh_cost_rollup_on_delete(sender, instance, **kwargs):
+    refresh_project_cost_rollups({(instance.project_id, instance.cost_code_id)})
@@ -1,10 +1,16 @@
+from datetime import date
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from core.models import Role
-from .models import Project, ProjectBudgetLine
+from core.models import AuditLog, Role
+from .models import BoQItem, CostCode, Project, ProjectAccess, ProjectBudgetLine, ProjectCostRecord, ProjectCostRollup
+from .services import rebuild_project_cost_rollups, settle_project_cost_records_by_source, sync_project_cost_records_by_source
 
 
 class TestProjectApi(APITestCase):
@@ -49,6 +55,66 @@ class TestProjectApi(APITestCase):
         response = self.client.get(reverse("project-list"))
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_bulk_create_budget_lines_and_boq_items(self):
+        project = self.client.post(
+            "/api/v1/projects/projects/",
+            {"code": "PRJ-BULK-001", "name": "Bulk Project", "client_name": "ACME", "budget": "1000.00", "contract_value": "1200.00"},
+            format="json",
+        ).data
+        cost_code_ids = [
+            self.client.post(
+                "/api/v1/projects/cost-codes/", {"project": project["id"], "code": f"CC-B{index}", "name": f"Code {index}"}, format="json"
+            ).data["id"]
+            for index in range(3)
+        ]
+
+        invalid = self.client.post(
+            "/api/v1/projects/budget-lines/bulk/",
+            [
+                {"project": project["id"], "cost_code": cost_code_ids[0], "baseline_amount": "100.00"},
+                {"project": project["id"], "cost_code": cost_code_ids[1], "baseline_amount": "-5.00"},
+            ],
+            format="json",
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(list(invalid.data["items"]), [1])
+        self.assertIn("baseline_amount", invalid.data["items"][1])
+        self.assertFalse(ProjectBudgetLine.objects.exists())
+
+        audit_count = AuditLog.objects.count()
+        created = self.client.post(
+            "/api/v1/projects/budget-lines/bulk/",
+            [
+                {"project": project["id"], "cost_code": cost_code_id, "baseline_amount": f"{index + 1}00.00"}
+                for index, cost_code_id in enumerate(cost_code_ids)
+            ],
+            format="json",
+        )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([line["revised_amount"] for line in created.data], ["100.00", "200.00", "300.00"])
+        self.assertEqual(AuditLog.objects.count() - audit_count, 3)
+
+        duplicate = self.client.post(
+            "/api/v1/projects/budget-lines/bulk/",
+            [{"project": project["id"], "cost_code": cost_code_ids[0], "baseline_amount": "1.00"}],
+            format="json",
+        )
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+
+        boq = self.client.post(
+            "/api/v1/projects/boq-items/bulk/",
+            [
+                {"project": project["id"], "item_code": f"BOQ-{index}", "description": "Item", "planned_quantity": "2.000"}
+                for index in range(4)
+            ],
+            format="json",
+        )
+        self.assertEqual(boq.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(BoQItem.objects.filter(project_id=project["id"]).count(), 4)
+
+        not_a_list = self.client.post("/api/v1/projects/boq-items/bulk/", {"project": project["id"]}, format="json")
+        self.assertEqual(not_a_list.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_job_costing_budget_vs_actual_summary(self):
         create_project = self.client.post(
             "/api/v1/projects/projects/",
@@ -306,3 +372,164 @@ class TestProjectApi(APITestCase):
 
         project_budget_lines = ProjectBudgetLine.objects.filter(project_id=project_id)
         self.assertEqual(project_budget_lines.count(), 0)
+
+    def test_project_access_index_follows_project_owner(self):
+        project = Project.objects.create(code="PRJ-ACC-001", name="Indexed", client_name="ACME", created_by=self.user)
+        self.assertTrue(ProjectAccess.objects.filter(project=project, user=self.user).exists())
+
+        list_projects = self.client.get("/api/v1/projects/projects/")
+        self.assertEqual(list_projects.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in list_projects.data["results"]], [project.id])
+
+        project.created_by = self.other_user
+        project.save(update_fields=["created_by", "updated_at"])
+        self.assertEqual(
+            list(ProjectAccess.objects.filter(project=project).values_list("user_id", flat=True)),
+            [self.other_user.id],
+        )
+
+        list_projects = self.client.get("/api/v1/projects/projects/")
+        self.assertEqual(list_projects.data["count"], 0)
+
+    def test_cost_rollup_follows_cost_record_services_and_budget_lines(self):
+        project = Project.objects.create(code="PRJ-ROLL-001", name="Rollup", client_name="ACME", created_by=self.user)
+        concrete = CostCode.objects.create(project=project, code="CC-100", name="Concrete")
+        steel = CostCode.objects.create(project=project, code="CC-200", name="Steel")
+        budget_line = ProjectBudgetLine.objects.create(
+            project=project, cost_code=concrete, baseline_amount=Decimal("1000.00"), revised_amount=Decimal("1000.00")
+        )
+
+        sync_project_cost_records_by_source(
+            project=project,
+            record_type=ProjectCostRecord.RecordType.COMMITMENT,
+            source_module="procurement",
+            source_reference="PO-1",
+            record_date=date(2026, 1, 5),
+            amount_by_cost_code={concrete: Decimal("400.00"), steel: Decimal("250.00")},
+        )
+        sync_project_cost_records_by_source(
+            project=project,
+            record_type=ProjectCostRecord.RecordType.ACTUAL,
+            source_module="finance",
+            source_reference="INV-1",
+            record_date=date(2026, 1, 6),
+            amount_by_cost_code={concrete: Decimal("300.00")},
+        )
+        budget_line.revised_amount = Decimal("1200.00")
+        budget_line.save(update_fields=["revised_amount", "updated_at"])
+
+        rollups = {rollup.cost_code_id: rollup for rollup in ProjectCostRollup.objects.filter(project=project)}
+        self.assertEqual(
+            (rollups[concrete.id].budget, rollups[concrete.id].commitments, rollups[concrete.id].actual),
+            (Decimal("1200.00"), Decimal("400.00"), Decimal("300.00")),
+        )
+        self.assertEqual(rollups[steel.id].commitments, Decimal("250.00"))
+
+        sync_project_cost_records_by_source(
+            project=project,
+            record_type=ProjectCostRecord.RecordType.COMMITMENT,
+            source_module="procurement",
+            source_reference="PO-1",
+            record_date=date(2026, 1, 5),
+            amount_by_cost_code={concrete: Decimal("400.00")},
+        )
+        settle_project_cost_records_by_source(
+            record_type=ProjectCostRecord.RecordType.ACTUAL,
+            source_module="finance",
+            source_reference="INV-1",
+        )
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=steel).commitments, Decimal("0.00"))
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=concrete).actual, Decimal("0.00"))
+
+        record = ProjectCostRecord.objects.get(project=project, cost_code=concrete, record_type=ProjectCostRecord.RecordType.COMMITMENT)
+        record.cost_code = steel
+        record.save()
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=concrete).commitments, Decimal("0.00"))
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=steel).commitments, Decimal("400.00"))
+
+        expected = list(ProjectCostRollup.objects.order_by("cost_code").values_list("cost_code", "budget", "commitments", "actual"))
+        rebuild_project_cost_rollups([project.id])
+        self.assertEqual(
+            list(ProjectCostRollup.objects.order_by("cost_code").values_list("cost_code", "budget", "commitments", "actual")),
+            expected,
+        )
+
+        summary = self.client.get(f"/api/v1/projects/projects/{project.id}/cost-summary/")
+        self.assertEqual(summary.status_code, status.HTTP_200_OK)
+        self.assertEqual([line["cost_code"] for line in summary.data["lines"]], ["CC-100", "CC-200"])
+        self.assertEqual(summary.data["totals"]["budget"], "1200.00")
+        self.assertEqual(summary.data["totals"]["commitments"], "400.00")
+
+    def test_sync_cost_records_runs_a_fixed_number_of_queries(self):
+        project = Project.objects.create(code="PRJ-SYNC-001", name="Sync", client_name="ACME", created_by=self.user)
+        cost_codes = [CostCode.objects.create(project=project, code=f"CC-{index}", name=f"Code {index}") for index in range(8)]
+
+        def sync(reference, amounts):
+            with CaptureQueriesContext(connection) as queries:
+                sync_project_cost_records_by_source(
+                    project=project,
+                    record_type=ProjectCostRecord.RecordType.ACTUAL,
+                    source_module="finance.invoice",
+                    source_reference=reference,
+                    record_date=date(2026, 2, 1),
+                    created_by=self.user,
+                    amount_by_cost_code=amounts,
+                    notes_prefix="Auto-synced from invoice ",
+                )
+            return len(queries)
+
+        small = sync("INV-S", {cost_codes[0]: Decimal("10.00"), cost_codes[1]: Decimal("20.00")})
+        large = sync("INV-L", {cost_code: Decimal("10.00") for cost_code in cost_codes})
+        self.assertEqual(small, large)
+
+        resync = sync("INV-L", {cost_code: Decimal("15.00") for cost_code in cost_codes[:4]})
+        self.assertLessEqual(resync, large)
+        records = ProjectCostRecord.objects.filter(source_reference="INV-L")
+        self.assertEqual(records.count(), 8)
+        self.assertEqual(records.filter(amount=Decimal("15.00")).count(), 4)
+        self.assertEqual(records.filter(amount=Decimal("0.00")).count(), 4)
+        self.assertEqual(set(records.values_list("notes", flat=True)), {"Auto-synced from invoice INV-L"})
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=cost_codes[0]).actual, Decimal("25.00"))
+        self.assertEqual(ProjectCostRollup.objects.get(project=project, cost_code=cost_codes[7]).actual, Decimal("0.00"))
+
+    def test_portfolio_costs_are_scoped_sorted_and_filtered_by_variance(self):
+        amounts = {
+            "PRJ-PF-001": (self.user, Decimal("1000.00"), Decimal("1200.00")),
+            "PRJ-PF-002": (self.user, Decimal("1000.00"), Decimal("400.00")),
+            "PRJ-PF-003": (self.other_user, Decimal("1000.00"), Decimal("5000.00")),
+            "PRJ-PF-004": (self.user, Decimal("300.00"), Decimal("100.00")),
+        }
+        for code, (owner, budget, actual) in amounts.items():
+            currency = "USD" if code == "PRJ-PF-004" else "KWD"
+            project = Project.objects.create(code=code, name=code, client_name="ACME", created_by=owner, currency=currency)
+            cost_code = CostCode.objects.create(project=project, code="CC-100", name="Concrete")
+            ProjectBudgetLine.objects.create(project=project, cost_code=cost_code, baseline_amount=budget, revised_amount=budget)
+            ProjectCostRecord.objects.create(
+                project=project, cost_code=cost_code, record_type=ProjectCostRecord.RecordType.ACTUAL, amount=actual
+            )
+
+        response = self.client.get("/api/v1/projects/projects/portfolio-costs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["project_code"] for row in response.data["results"]], ["PRJ-PF-001", "PRJ-PF-004", "PRJ-PF-002"])
+        self.assertEqual(response.data["results"][0]["variance"], "-200.00")
+        self.assertNotIn("lines", response.data["results"][0])
+        self.assertEqual(
+            [(row["currency"], row["budget"], row["variance"]) for row in response.data["totals"]],
+            [("KWD", "2000.00", "400.00"), ("USD", "300.00", "200.00")],
+        )
+
+        response = self.client.get("/api/v1/projects/projects/portfolio-costs/", {"currency": "USD"})
+        self.assertEqual([row["project_code"] for row in response.data["results"]], ["PRJ-PF-004"])
+        self.assertEqual([row["currency"] for row in response.data["totals"]], ["USD"])
+
+        response = self.client.get("/api/v1/projects/projects/portfolio-costs/", {"ordering": "-variance", "lines": "true"})
+        self.assertEqual([row["project_code"] for row in response.data["results"]], ["PRJ-PF-002", "PRJ-PF-004", "PRJ-PF-001"])
+        self.assertEqual(response.data["results"][0]["lines"][0]["cost_code"], "CC-100")
+        self.assertEqual(response.data["results"][0]["lines"][0]["variance"], "600.00")
+
+        response = self.client.get("/api/v1/projects/projects/portfolio-costs/", {"over_budget": "true"})
+        self.assertEqual([row["project_code"] for row in response.data["results"]], ["PRJ-PF-001"])
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get("/api/v1/projects/projects/portfolio-costs/", {"ordering": "client_name"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
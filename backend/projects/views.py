@@ -1,7 +1,8 @@
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 from django.db import transaction
-from django.db.models import Q, Sum
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action
@@ -18,6 +19,15 @@ from core.access import (
     RowLevelScopeMixin,
 )
 from core.audit import AuditLogMixin
+from core.bulk import BulkCreateMixin
+from core.fieldsets import query_flag
+from .services import (
+    ROLLUP_AMOUNT_FIELD,
+    portfolio_cost_lines,
+    portfolio_cost_rows,
+    portfolio_cost_totals,
+    refresh_project_cost_rollups,
+)
 from .models import (
     BoQItem,
     ChangeOrder,
@@ -37,6 +47,8 @@ from .serializers import (
     ProjectBudgetLineSerializer,
     ProjectCostRecordSerializer,
     ProjectCostSummarySerializer,
+    ProjectPortfolioCostSerializer,
+    ProjectPortfolioCostTotalsSerializer,
     ProjectPhaseSerializer,
     ProjectSerializer,
     SubcontractPaymentSerializer,
@@ -54,6 +66,7 @@ PROJECT_READ_ROLES = {
 PROJECT_WRITE_ROLES = {ROLE_ADMIN, ROLE_PROJECT_MANAGER, ROLE_UNASSIGNED}
 PROJECT_APPROVER_ROLES = {ROLE_ADMIN, ROLE_PROJECT_MANAGER}
 LOCKED_PROJECT_STATUSES = {Project.Status.COMPLETED, Project.Status.CANCELLED}
+PORTFOLIO_ORDERING_FIELDS = {"variance", "budget", "commitments", "actual", "code", "name"}
 
 
 def _assert_project_open(project):
@@ -66,6 +79,7 @@ class ProjectViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("created_by",)
+    project_scope_fields = ("pk",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -74,6 +88,7 @@ class ProjectViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         "partial_update": PROJECT_WRITE_ROLES,
         "destroy": {ROLE_ADMIN},
         "cost_summary": PROJECT_READ_ROLES,
+        "portfolio_costs": PROJECT_READ_ROLES,
         "close": PROJECT_WRITE_ROLES,
     }
     filterset_fields = ["status", "currency", "created_by"]
@@ -103,40 +118,27 @@ class ProjectViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         project = self.get_object()
         zero = Decimal("0.00")
 
-        budget_map = {
-            budget_line.cost_code_id: budget_line.revised_amount
-            for budget_line in project.budget_lines.select_related("cost_code")
-        }
-        record_map = {
-            row["cost_code"]: {
-                "commitments": row["commitments"] or zero,
-                "actual": row["actual"] or zero,
+        rows = project.cost_codes.order_by("code").values(
+            "id",
+            "code",
+            "name",
+            budget=Coalesce("cost_rollups__budget", Value(zero), output_field=ROLLUP_AMOUNT_FIELD),
+            commitments=Coalesce("cost_rollups__commitments", Value(zero), output_field=ROLLUP_AMOUNT_FIELD),
+            actual=Coalesce("cost_rollups__actual", Value(zero), output_field=ROLLUP_AMOUNT_FIELD),
+        )
+        lines = [
+            {
+                "cost_code_id": row["id"],
+                "cost_code": row["code"],
+                "cost_code_name": row["name"],
+                "budget": row["budget"],
+                "commitments": row["commitments"],
+                "actual": row["actual"],
+                "available": row["budget"] - row["actual"],
+                "variance": row["budget"] - row["actual"],
             }
-            for row in project.cost_records.values("cost_code").annotate(
-                commitments=Sum("amount", filter=Q(record_type=ProjectCostRecord.RecordType.COMMITMENT)),
-                actual=Sum("amount", filter=Q(record_type=ProjectCostRecord.RecordType.ACTUAL)),
-            )
-        }
-
-        lines = []
-        for cost_code in project.cost_codes.order_by("code"):
-            budget = budget_map.get(cost_code.id, zero)
-            commitments = record_map.get(cost_code.id, {}).get("commitments", zero)
-            actual = record_map.get(cost_code.id, {}).get("actual", zero)
-            available = budget - actual
-            variance = budget - actual
-            lines.append(
-                {
-                    "cost_code_id": cost_code.id,
-                    "cost_code": cost_code.code,
-                    "cost_code_name": cost_code.name,
-                    "budget": budget,
-                    "commitments": commitments,
-                    "actual": actual,
-                    "available": available,
-                    "variance": variance,
-                }
-            )
+            for row in rows
+        ]
 
         totals = {
             "budget": sum((line["budget"] for line in lines), zero),
@@ -155,6 +157,42 @@ class ProjectViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         )
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], url_path="portfolio-costs")
+    def portfolio_costs(self, request):
+        projects = self.filter_queryset(self.get_queryset())
+        rows = portfolio_cost_rows(projects)
+
+        if query_flag(request, "over_budget"):
+            rows = rows.filter(variance__lt=Decimal("0.00"))
+        for param, lookup in (("min_variance", "variance__gte"), ("max_variance", "variance__lte")):
+            value = request.query_params.get(param)
+            if value in (None, ""):
+                continue
+            try:
+                rows = rows.filter(**{lookup: Decimal(value)})
+            except InvalidOperation:
+                raise ValidationError({param: f"{param} must be a decimal number."})
+
+        ordering = request.query_params.get("ordering") or "variance"
+        if ordering.lstrip("-") not in PORTFOLIO_ORDERING_FIELDS:
+            raise ValidationError({"ordering": f"ordering must be one of: {', '.join(sorted(PORTFOLIO_ORDERING_FIELDS))}."})
+        rows = rows.order_by(ordering, "code")
+
+        page = self.paginate_queryset(rows)
+        results = list(page if page is not None else rows)
+        if query_flag(request, "lines"):
+            lines = portfolio_cost_lines([row["id"] for row in results])
+            for row in results:
+                row["lines"] = lines[row["id"]]
+        data = ProjectPortfolioCostSerializer(results, many=True).data
+
+        totals = ProjectPortfolioCostTotalsSerializer(portfolio_cost_totals(projects), many=True).data
+        if page is None:
+            return Response({"totals": totals, "results": data})
+        response = self.get_paginated_response(data)
+        response.data["totals"] = totals
+        return response
+
     @action(detail=True, methods=["post"])
     def close(self, request, pk=None):
         project = self.get_object()
@@ -173,6 +211,7 @@ class ProjectPhaseViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
     serializer_class = ProjectPhaseSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by",)
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -207,15 +246,17 @@ class ProjectPhaseViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewS
         instance.delete()
 
 
-class BoQItemViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
+class BoQItemViewSet(BulkCreateMixin, AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = BoQItem.objects.select_related("project", "phase").all()
     serializer_class = BoQItemSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by",)
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
         "create": PROJECT_WRITE_ROLES,
+        "bulk_create": PROJECT_WRITE_ROLES,
         "update": PROJECT_WRITE_ROLES,
         "partial_update": PROJECT_WRITE_ROLES,
         "destroy": {ROLE_ADMIN, ROLE_PROJECT_MANAGER},
@@ -251,6 +292,7 @@ class CostCodeViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     serializer_class = CostCodeSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by",)
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -285,15 +327,17 @@ class CostCodeViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
         instance.delete()
 
 
-class ProjectBudgetLineViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
+class ProjectBudgetLineViewSet(BulkCreateMixin, AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = ProjectBudgetLine.objects.select_related("project", "cost_code").all()
     serializer_class = ProjectBudgetLineSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by",)
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
         "create": PROJECT_WRITE_ROLES,
+        "bulk_create": PROJECT_WRITE_ROLES,
         "update": PROJECT_WRITE_ROLES,
         "partial_update": PROJECT_WRITE_ROLES,
         "destroy": {ROLE_ADMIN, ROLE_PROJECT_MANAGER},
@@ -323,12 +367,18 @@ class ProjectBudgetLineViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.Model
         self.log_action(action="delete", instance=instance)
         instance.delete()
 
+    def perform_bulk_create(self, serializer):
+        instances = super().perform_bulk_create(serializer)
+        refresh_project_cost_rollups((instance.project_id, instance.cost_code_id) for instance in instances)
+        return instances
+
 
 class ProjectCostRecordViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = ProjectCostRecord.objects.select_related("project", "cost_code", "created_by").all()
     serializer_class = ProjectCostRecordSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by", "created_by")
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -378,6 +428,7 @@ class ChangeOrderViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSe
         "approved_by",
         "rejected_by",
     )
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -575,6 +626,7 @@ class SubcontractViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSe
     serializer_class = SubcontractSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("project__created_by",)
+    project_scope_fields = ("project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
@@ -596,6 +648,7 @@ class SubcontractPaymentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.Mode
     serializer_class = SubcontractPaymentSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("subcontract__project__created_by",)
+    project_scope_fields = ("subcontract__project",)
     action_role_map = {
         "list": PROJECT_READ_ROLES,
         "retrieve": PROJECT_READ_ROLES,
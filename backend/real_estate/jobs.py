@@ -0,0 +1,14 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from core.services.jobs import register_job
+
+OVERDUE_SWEEP_JOB = "real_estate.mark_overdue_installments"
+
+
+@register_job(OVERDUE_SWEEP_JOB)
+def run_overdue_sweep_job(job, payload):
+    output = StringIO()
+    call_command("mark_overdue_installments", as_of_date=payload.get("as_of_date"), stdout=output)
+    return {"as_of_date": payload.get("as_of_date"), "output": output.getvalue().strip()}
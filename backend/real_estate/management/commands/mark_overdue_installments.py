@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from real_estate.services import mark_overdue_installments, rebuild_contract_overdue_totals
+
+
+class Command(BaseCommand):
+    help = "Mark pending installments past their due date as overdue and refresh per-contract overdue totals"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--as-of-date",
+            dest="as_of_date",
+            default=None,
+            help="Installments due before this YYYY-MM-DD date become overdue (defaults to today).",
+        )
+        parser.add_argument("--rebuild", action="store_true", help="Recompute overdue totals for every contract afterwards.")
+
+    def handle(self, *args, **options):
+        as_of_date_text = options.get("as_of_date")
+        as_of_date = self.parse_as_of_date(as_of_date_text) if as_of_date_text else timezone.localdate()
+
+        marked_count = mark_overdue_installments(as_of_date)
+        self.stdout.write(self.style.SUCCESS(f"Marked {marked_count} installments overdue as of {as_of_date.isoformat()}."))
+        if options["rebuild"]:
+            contract_count = rebuild_contract_overdue_totals()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt overdue totals for {contract_count} contracts."))
+
+    def parse_as_of_date(self, value):
+        try:
+            as_of_date = parse_date(value)
+        except ValueError:
+            as_of_date = None
+        if as_of_date is None:
+            raise CommandError(f"--as-of-date must be a valid YYYY-MM-DD date, got {value!r}.")
+        return as_of_date
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.2 on 2026-10-19 11:01
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, F, Min, Sum
+
+
+def backfill_contract_overdue_totals(apps, schema_editor):
+    Installment = apps.get_model("real_estate", "Installment")
+    SalesContract = apps.get_model("real_estate", "SalesContract")
+
+    rows = (
+        Installment.objects.filter(status="overdue")
+        .order_by()
+        .values("schedule__contract_id")
+        .annotate(outstanding=Sum(F("amount") - F("paid_amount")), installment_count=Count("id"), oldest_due_date=Min("due_date"))
+    )
+    for row in rows:
+        SalesContract.objects.filter(pk=row["schedule__contract_id"]).update(
+            overdue_amount=row["outstanding"] or Decimal("0.00"),
+            overdue_installment_count=row["installment_count"],
+            overdue_since=row["oldest_due_date"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('real_estate', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='salescontract',
+            name='overdue_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='salescontract',
+            name='overdue_installment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='salescontract',
+            name='overdue_since',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='installment',
+            index=models.Index(fields=['status', 'due_date'], name='real_estate_status_bc59b1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salescontract',
+            index=models.Index(fields=['overdue_since'], name='real_estate_overdue_e2c0f9_idx'),
+        ),
+        migrations.RunPython(backfill_contract_overdue_totals, migrations.RunPython.noop),
+    ]
@@ -173,9 +173,16 @@ class SalesContract(TimeStampedModel):
         blank=True,
         related_name="sales_contracts",
     )
+    # Maintained from overdue installments by real_estate.services.refresh_contract_overdue_totals.
+    overdue_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    overdue_installment_count = models.PositiveIntegerField(default=0)
+    overdue_since = models.DateField(null=True, blank=True)
 
     class Meta:
         ordering = ["-contract_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["overdue_since"]),
+        ]
 
     def __str__(self) -> str:
         return self.contract_number
@@ -220,6 +227,9 @@ class Installment(TimeStampedModel):
 
     class Meta:
         ordering = ["due_date", "installment_number"]
+        indexes = [
+            models.Index(fields=["status", "due_date"]),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["schedule", "installment_number"],
@@ -1,8 +1,11 @@
 from decimal import Decimal
 
+from django.conf import settings
 from rest_framework import serializers
 
-from core.services.sequence import next_sequence
+from core.fieldsets import SparseFieldsetSerializerMixin
+from core.bulk import BulkCreateListSerializer
+from core.services.sequence import next_sequence, next_sequences
 from .models import (
     Building,
     Handover,
@@ -15,6 +18,7 @@ from .models import (
     UnitPricing,
     UnitType,
 )
+from .services import INSTALLMENT_DETAIL_PATHS, with_installment_details
 
 
 class RealEstateProjectSerializer(serializers.ModelSerializer):
@@ -199,11 +203,21 @@ class SalesContractSerializer(serializers.ModelSerializer):
             "down_payment",
             "currency",
             "signed_by",
+            "overdue_amount",
+            "overdue_installment_count",
+            "overdue_since",
+            "created_by",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "overdue_amount",
+            "overdue_installment_count",
+            "overdue_since",
             "created_by",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["created_by", "created_at", "updated_at"]
         extra_kwargs = {"contract_number": {"required": False, "allow_blank": True}}
 
     def validate(self, attrs):
@@ -235,22 +249,76 @@ class PaymentScheduleSerializer(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]
 
 
-class InstallmentSerializer(serializers.ModelSerializer):
-    contract_number = serializers.CharField(source="schedule.contract.contract_number", read_only=True)
-    unit_code = serializers.CharField(source="schedule.contract.unit.code", read_only=True)
-    unit_building_code = serializers.CharField(source="schedule.contract.unit.building.code", read_only=True)
-    building_name = serializers.CharField(source="schedule.contract.unit.building.name", read_only=True, allow_null=True)
-    project_name = serializers.CharField(source="schedule.contract.unit.building.project.name", read_only=True, allow_null=True)
-    project_code = serializers.CharField(source="schedule.contract.unit.building.project.code", read_only=True)
-    unit_floor = serializers.IntegerField(source="schedule.contract.unit.floor", read_only=True)
-    unit_area_sqm = serializers.DecimalField(
-        source="schedule.contract.unit.area_sqm",
-        max_digits=10,
-        decimal_places=2,
-        read_only=True,
-    )
-    unit_type_name = serializers.CharField(source="schedule.contract.unit.unit_type.name", read_only=True, allow_null=True)
-    currency = serializers.CharField(source="schedule.contract.currency", read_only=True)
+class PaymentPlanSerializer(serializers.Serializer):
+    PLAN_EQUAL = "equal"
+    PLAN_BALLOON = "balloon"
+    FREQUENCY_MONTHS = {"monthly": 1, "quarterly": 3, "semi_annual": 6, "annual": 12}
+
+    plan = serializers.ChoiceField(choices=[PLAN_EQUAL, PLAN_BALLOON], default=PLAN_EQUAL)
+    frequency = serializers.ChoiceField(choices=[*FREQUENCY_MONTHS, "custom"], default="monthly")
+    interval_months = serializers.IntegerField(min_value=1, max_value=60, required=False)
+    installment_count = serializers.IntegerField(min_value=1)
+    start_date = serializers.DateField(required=False)
+    total_amount = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal("0.01"), required=False)
+    balloon_amount = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal("0.01"), required=False)
+
+    def validate(self, attrs):
+        schedule = self.context["schedule"]
+        if attrs["installment_count"] > settings.BULK_CREATE_MAX_ITEMS:
+            raise serializers.ValidationError(
+                {"installment_count": f"At most {settings.BULK_CREATE_MAX_ITEMS} installments can be generated at once."}
+            )
+        if attrs["frequency"] == "custom":
+            if "interval_months" not in attrs:
+                raise serializers.ValidationError({"interval_months": "interval_months is required for a custom frequency."})
+        else:
+            attrs["interval_months"] = self.FREQUENCY_MONTHS[attrs["frequency"]]
+
+        attrs.setdefault("start_date", schedule.start_date)
+        if attrs["start_date"] is None:
+            raise serializers.ValidationError({"start_date": "start_date is required when the schedule has none."})
+        if "total_amount" not in attrs:
+            contract = schedule.contract
+            attrs["total_amount"] = schedule.total_amount or contract.total_price - contract.down_payment
+        if attrs["total_amount"] <= Decimal("0.00"):
+            raise serializers.ValidationError({"total_amount": "total_amount must be greater than zero."})
+
+        regular_count = attrs["installment_count"]
+        regular_total = attrs["total_amount"]
+        if attrs["plan"] == self.PLAN_BALLOON:
+            balloon_amount = attrs.get("balloon_amount")
+            if balloon_amount is None:
+                raise serializers.ValidationError({"balloon_amount": "balloon_amount is required for a balloon plan."})
+            if attrs["installment_count"] < 2:
+                raise serializers.ValidationError({"installment_count": "A balloon plan needs at least two installments."})
+            regular_count -= 1
+            regular_total -= balloon_amount
+        else:
+            attrs.pop("balloon_amount", None)
+        if regular_total < Decimal("0.01") * regular_count:
+            raise serializers.ValidationError({"total_amount": "total_amount is too small for the number of installments."})
+        return attrs
+
+
+class InstallmentDetailsMixin:
+    def to_representation(self, instance):
+        if not hasattr(instance, "contract_number"):
+            # Detail fields read the flat columns of with_installment_details; freshly written rows are re-read once.
+            instance = with_installment_details(Installment.objects.filter(pk=instance.pk)).get()
+        return super().to_representation(instance)
+
+
+class InstallmentSerializer(InstallmentDetailsMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    contract_number = serializers.CharField(read_only=True)
+    unit_code = serializers.CharField(read_only=True)
+    unit_building_code = serializers.CharField(read_only=True)
+    building_name = serializers.CharField(read_only=True, allow_null=True)
+    project_name = serializers.CharField(read_only=True, allow_null=True)
+    project_code = serializers.CharField(read_only=True)
+    unit_floor = serializers.IntegerField(read_only=True)
+    unit_area_sqm = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    unit_type_name = serializers.CharField(read_only=True, allow_null=True)
+    currency = serializers.CharField(read_only=True)
 
     class Meta:
         model = Installment
@@ -279,12 +347,28 @@ class InstallmentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["created_at", "updated_at"]
         extra_kwargs = {"installment_number": {"required": False, "allow_blank": True}}
+        list_serializer_class = BulkCreateListSerializer
 
     def create(self, validated_data):
         if not validated_data.get("installment_number"):
             validated_data["installment_number"] = next_sequence("installment")
         return Installment.objects.create(**validated_data)
 
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        if "schedule" in validated_data:
+            # The flat details were read for the previous schedule.
+            for name in INSTALLMENT_DETAIL_PATHS:
+                instance.__dict__.pop(name, None)
+        return instance
+
+    def prepare_bulk_create(self, items):
+        unnumbered = [attrs for attrs in items if not attrs.get("installment_number")]
+        if unnumbered:
+            for attrs, number in zip(unnumbered, next_sequences("installment", len(unnumbered))):
+                attrs["installment_number"] = number
+        return items
+
     def validate(self, attrs):
         amount = attrs.get("amount") or getattr(self.instance, "amount", None)
         if amount is not None and amount <= Decimal("0.00"):
@@ -292,6 +376,33 @@ class InstallmentSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class InstallmentListSerializer(InstallmentDetailsMixin, SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    contract_number = serializers.CharField(read_only=True)
+    unit_code = serializers.CharField(read_only=True)
+    currency = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Installment
+        fields = [
+            "id",
+            "schedule",
+            "installment_number",
+            "contract_number",
+            "unit_code",
+            "due_date",
+            "amount",
+            "currency",
+            "status",
+            "paid_amount",
+        ]
+        read_only_fields = fields
+        expandable_fields = {
+            "building_name": (serializers.CharField, {"read_only": True, "allow_null": True}),
+            "project_code": (serializers.CharField, {"read_only": True}),
+            "project_name": (serializers.CharField, {"read_only": True, "allow_null": True}),
+        }
+
+
 class HandoverSerializer(serializers.ModelSerializer):
     contract_number = serializers.CharField(source="contract.contract_number", read_only=True)
     unit_code = serializers.CharField(source="contract.unit.code", read_only=True)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import calendar
+from datetime import date
+from decimal import ROUND_DOWN, Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Min, Sum
+from django.utils import timezone
+
+from core.bulk import bulk_create_with_pks
+from core.services.sequence import next_sequences
+from .models import Installment, PaymentSchedule, SalesContract
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+SWEEP_BATCH_SIZE = 500
+INSTALLMENT_DETAIL_PATHS = {
+    "contract_number": "schedule__contract__contract_number",
+    "currency": "schedule__contract__currency",
+    "unit_code": "schedule__contract__unit__code",
+    "unit_floor": "schedule__contract__unit__floor",
+    "unit_area_sqm": "schedule__contract__unit__area_sqm",
+    "unit_building_code": "schedule__contract__unit__building__code",
+    "building_name": "schedule__contract__unit__building__name",
+    "project_code": "schedule__contract__unit__building__project__code",
+    "project_name": "schedule__contract__unit__building__project__name",
+    "unit_type_name": "schedule__contract__unit__unit_type__name",
+}
+
+
+def with_installment_details(queryset):
+    # Flat columns from one joined query instead of hydrating the whole contract chain per row.
+    return queryset.select_related(None).annotate(**{name: F(path) for name, path in INSTALLMENT_DETAIL_PATHS.items()})
+
+
+def _outstanding_expression():
+    return ExpressionWrapper(F("amount") - F("paid_amount"), output_field=DecimalField(max_digits=14, decimal_places=2))
+
+
+def overdue_totals_by_contract(contract_ids=None) -> dict[int, dict]:
+    installments = Installment.objects.filter(status=Installment.Status.OVERDUE)
+    if contract_ids is not None:
+        installments = installments.filter(schedule__contract_id__in=contract_ids)
+    rows = installments.order_by().values("schedule__contract_id").annotate(
+        outstanding=Sum(_outstanding_expression()),
+        installment_count=Count("id"),
+        oldest_due_date=Min("due_date"),
+    )
+    return {row.pop("schedule__contract_id"): row for row in rows}
+
+
+def _apply_overdue_totals(contracts, totals: dict[int, dict]):
+    for contract in contracts:
+        row = totals.get(contract.pk)
+        contract.overdue_amount = row["outstanding"] if row else ZERO
+        contract.overdue_installment_count = row["installment_count"] if row else 0
+        contract.overdue_since = row["oldest_due_date"] if row else None
+    SalesContract.objects.bulk_update(
+        contracts,
+        ["overdue_amount", "overdue_installment_count", "overdue_since"],
+        batch_size=SWEEP_BATCH_SIZE,
+    )
+
+
+def refresh_contract_overdue_totals(contract_ids) -> None:
+    contract_ids = {contract_id for contract_id in contract_ids if contract_id is not None}
+    if not contract_ids:
+        return
+    contracts = list(SalesContract.objects.filter(pk__in=contract_ids).only("id"))
+    _apply_overdue_totals(contracts, overdue_totals_by_contract(contract_ids))
+
+
+def rebuild_contract_overdue_totals() -> int:
+    totals = overdue_totals_by_contract()
+    stale = SalesContract.objects.filter(overdue_since__isnull=False).values_list("pk", flat=True)
+    contracts = list(SalesContract.objects.filter(pk__in={*totals, *stale}).only("id"))
+    _apply_overdue_totals(contracts, totals)
+    return len(totals)
+
+
+def mark_overdue_installments(as_of: date) -> int:
+    due = Installment.objects.filter(status=Installment.Status.PENDING, due_date__lt=as_of)
+    contract_ids = sorted(set(due.order_by().values_list("schedule__contract_id", flat=True).distinct()))
+    marked = 0
+    for start in range(0, len(contract_ids), SWEEP_BATCH_SIZE):
+        batch = contract_ids[start:start + SWEEP_BATCH_SIZE]
+        with transaction.atomic():
+            # One UPDATE per batch; installments that turn due after the id scan are left for the next sweep.
+            marked += due.filter(schedule__contract_id__in=batch).update(
+                status=Installment.Status.OVERDUE,
+                updated_at=timezone.now(),
+            )
+            refresh_contract_overdue_totals(batch)
+    return marked
+
+
+def add_months(base_date: date, months: int) -> date:
+    month_index = base_date.month - 1 + months
+    year = base_date.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(base_date.day, calendar.monthrange(year, month)[1]))
+
+
+def split_plan_amounts(total_amount: Decimal, installment_count: int, balloon_amount: Decimal | None = None) -> list[Decimal]:
+    regular_count = installment_count - 1 if balloon_amount is not None else installment_count
+    regular_total = total_amount - (balloon_amount or ZERO)
+    share = (regular_total / regular_count).quantize(CENT, rounding=ROUND_DOWN)
+    # Rounding leftovers go to the last regular installment so the plan adds up to the total exactly.
+    amounts = [share] * (regular_count - 1) + [regular_total - share * (regular_count - 1)]
+    if balloon_amount is not None:
+        amounts.append(balloon_amount)
+    return amounts
+
+
+def generate_installments(
+    schedule: PaymentSchedule,
+    *,
+    installment_count: int,
+    interval_months: int,
+    start_date: date,
+    total_amount: Decimal,
+    balloon_amount: Decimal | None = None,
+) -> list[Installment]:
+    amounts = split_plan_amounts(total_amount, installment_count, balloon_amount)
+    numbers = next_sequences("installment", installment_count)
+    installments = [
+        Installment(
+            schedule=schedule,
+            installment_number=number,
+            due_date=add_months(start_date, index * interval_months),
+            amount=amount,
+        )
+        for index, (number, amount) in enumerate(zip(numbers, amounts))
+    ]
+    installments = bulk_create_with_pks(Installment, installments)
+
+    schedule.total_amount = total_amount
+    schedule.start_date = installments[0].due_date
+    schedule.end_date = installments[-1].due_date
+    schedule.save(update_fields=["total_amount", "start_date", "end_date", "updated_at"])
+    return installments
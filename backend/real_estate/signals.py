@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Installment
+from .services import refresh_contract_overdue_totals
+
+OVERDUE_FIELDS = {"schedule", "status", "amount", "paid_amount", "due_date"}
+
+
+@receiver(pre_save, sender=Installment, dispatch_uid="real_estate_installment_remember_overdue_state")
+def remember_overdue_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._previous_overdue_contract_id = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not OVERDUE_FIELDS & set(update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list("status", "schedule__contract_id").first()
+    if previous and previous[0] == Installment.Status.OVERDUE:
+        instance._previous_overdue_contract_id = previous[1]
+
+
+@receiver(post_save, sender=Installment, dispatch_uid="real_estate_installment_refresh_overdue_totals")
+def refresh_overdue_totals_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    contract_ids = {getattr(instance, "_previous_overdue_contract_id", None)}
+    if instance.status == Installment.Status.OVERDUE:
+        contract_ids.add(instance.schedule.contract_id)
+    refresh_contract_overdue_totals(contract_ids)
+
+
+@receiver(post_delete, sender=Installment, dispatch_uid="real_estate_installment_refresh_overdue_totals_on_delete")
+def refresh_overdue_totals_on_delete(sender, instance, **kwargs):
+    if instance.status == Installment.Status.OVERDUE:
+        refresh_contract_overdue_totals({instance.schedule.contract_id})
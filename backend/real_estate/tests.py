@@ -0,0 +1,224 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import AuditLog, Customer, Role
+from .models import Building, Installment, PaymentSchedule, RealEstateProject, SalesContract, Unit, UnitType
+
+
+class TestRealEstateApi(APITestCase):
+    def setUp(self):
+        accountant_role = Role.objects.create(name="Accountant", slug="accountant")
+        self.accountant = get_user_model().objects.create_user(username="re-acct", password="pass1234", role=accountant_role)
+        self.customer_user = get_user_model().objects.create_user(username="re-customer", password="pass1234")
+        self.customer = Customer.objects.create(code="CUST-RE-1", name="Portal Customer", user=self.customer_user)
+        self.project = RealEstateProject.objects.create(code="RE-T1", name="Towers")
+        self.unit_type = UnitType.objects.create(project=self.project, code="2BR", name="Two Bedroom")
+        self.contract_count = 0
+
+    def create_contract(self, due_dates):
+        self.contract_count += 1
+        building = Building.objects.create(project=self.project, code=f"B{self.contract_count}", name=f"Block {self.contract_count}")
+        unit = Unit.objects.create(building=building, unit_type=self.unit_type, code=f"U{self.contract_count}", floor=self.contract_count)
+        contract = SalesContract.objects.create(
+            contract_number=f"SC-{self.contract_count}",
+            unit=unit,
+            customer=self.customer,
+            contract_date=date(2026, 1, 1),
+        )
+        schedule = PaymentSchedule.objects.create(contract=contract)
+        for index, due_date in enumerate(due_dates, start=1):
+            Installment.objects.create(schedule=schedule, installment_number=str(index), due_date=due_date, amount=Decimal("100.00"))
+        return contract
+
+    def test_portal_installment_lists_use_constant_queries(self):
+        contract = self.create_contract([date(2026, 2, 1), date(2026, 3, 1)])
+        self.client.force_authenticate(user=self.customer_user)
+
+        def count_queries(url):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return response, len(queries.captured_queries)
+
+        contract_url = f"/api/v1/real-estate/portal/contracts/{contract.id}/installments/"
+        _, list_queries = count_queries("/api/v1/real-estate/portal/installments/")
+        _, contract_queries = count_queries(contract_url)
+
+        for _ in range(3):
+            self.create_contract([date(2026, 2, 1), date(2026, 3, 1), date(2026, 4, 1)])
+        Installment.objects.create(
+            schedule=contract.payment_schedules.get(),
+            installment_number="3",
+            due_date=date(2026, 4, 1),
+            amount=Decimal("100.00"),
+        )
+
+        list_response, grown_list_queries = count_queries("/api/v1/real-estate/portal/installments/")
+        contract_response, grown_contract_queries = count_queries(contract_url)
+        self.assertEqual(grown_list_queries, list_queries)
+        self.assertEqual(grown_contract_queries, contract_queries)
+        self.assertEqual(list_response.data["count"], 12)
+        self.assertEqual(len(contract_response.data), 3)
+        self.assertEqual(contract_response.data[0]["contract_number"], "SC-1")
+        self.assertEqual(contract_response.data[0]["building_name"], "Block 1")
+        self.assertEqual(contract_response.data[0]["project_code"], "RE-T1")
+        self.assertEqual(contract_response.data[0]["unit_type_name"], "Two Bedroom")
+        self.assertEqual(contract_response.data[0]["currency"], "KWD")
+
+    def test_installment_write_responses_include_details(self):
+        contract = self.create_contract([date(2026, 2, 1)])
+        self.client.force_authenticate(user=self.accountant)
+        response = self.client.post(
+            "/api/v1/real-estate/installments/",
+            {
+                "schedule": contract.payment_schedules.get().id,
+                "installment_number": "9",
+                "due_date": "2026-09-01",
+                "amount": "250.00",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["contract_number"], "SC-1")
+        self.assertEqual(response.data["unit_code"], "U1")
+
+    def test_overdue_sweep_maintains_contract_totals(self):
+        overdue_contract = self.create_contract([date(2026, 1, 15), date(2026, 2, 15), date(2026, 5, 15)])
+        current_contract = self.create_contract([date(2026, 6, 15)])
+
+        call_command("mark_overdue_installments", as_of_date="2026-03-01", stdout=StringIO())
+
+        overdue_contract.refresh_from_db()
+        self.assertEqual(overdue_contract.overdue_amount, Decimal("200.00"))
+        self.assertEqual(overdue_contract.overdue_installment_count, 2)
+        self.assertEqual(overdue_contract.overdue_since, date(2026, 1, 15))
+        self.assertEqual(Installment.objects.filter(status=Installment.Status.OVERDUE).count(), 2)
+
+        self.client.force_authenticate(user=self.accountant)
+        response = self.client.get("/api/v1/real-estate/sales-contracts/overdue/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.data["results"]], [overdue_contract.id])
+
+        installment = Installment.objects.get(schedule__contract=overdue_contract, due_date=date(2026, 1, 15))
+        installment.status = Installment.Status.PAID
+        installment.paid_amount = installment.amount
+        installment.save()
+        overdue_contract.refresh_from_db()
+        self.assertEqual(overdue_contract.overdue_amount, Decimal("100.00"))
+        self.assertEqual(overdue_contract.overdue_since, date(2026, 2, 15))
+
+        current_contract.refresh_from_db()
+        self.assertIsNone(current_contract.overdue_since)
+
+    def test_deleting_overdue_installment_refreshes_contract_totals(self):
+        contract = self.create_contract([date(2026, 1, 15), date(2026, 2, 15)])
+        call_command("mark_overdue_installments", as_of_date="2026-03-01", stdout=StringIO())
+
+        Installment.objects.get(schedule__contract=contract, due_date=date(2026, 1, 15)).delete()
+        contract.refresh_from_db()
+        self.assertEqual(contract.overdue_amount, Decimal("100.00"))
+        self.assertEqual(contract.overdue_installment_count, 1)
+        self.assertEqual(contract.overdue_since, date(2026, 2, 15))
+
+        Installment.objects.get(schedule__contract=contract).delete()
+        contract.refresh_from_db()
+        self.assertEqual(contract.overdue_amount, Decimal("0.00"))
+        self.assertEqual(contract.overdue_installment_count, 0)
+        self.assertIsNone(contract.overdue_since)
+
+    def test_bulk_created_overdue_installments_refresh_contract_totals(self):
+        contract = self.create_contract([])
+        schedule_id = contract.payment_schedules.get().id
+        self.client.force_authenticate(user=self.accountant)
+        response = self.client.post(
+            "/api/v1/real-estate/installments/bulk/",
+            [
+                {"schedule": schedule_id, "installment_number": "1", "due_date": "2026-01-15", "amount": "150.00", "status": "overdue"},
+                {"schedule": schedule_id, "installment_number": "2", "due_date": "2026-02-15", "amount": "50.00", "status": "overdue"},
+                {"schedule": schedule_id, "installment_number": "3", "due_date": "2026-09-15", "amount": "75.00"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        contract.refresh_from_db()
+        self.assertEqual(contract.overdue_amount, Decimal("200.00"))
+        self.assertEqual(contract.overdue_installment_count, 2)
+        self.assertEqual(contract.overdue_since, date(2026, 1, 15))
+
+    def test_overdue_sweep_rejects_invalid_as_of_date(self):
+        for value in ("2026-13-01", "yesterday"):
+            with self.assertRaisesMessage(CommandError, "--as-of-date must be a valid YYYY-MM-DD date"):
+                call_command("mark_overdue_installments", as_of_date=value, stdout=StringIO())
+
+    def test_generate_installments_builds_plan_in_bulk(self):
+        self.client.force_authenticate(user=self.accountant)
+
+        def generate(payload):
+            contract = self.create_contract([])
+            schedule = contract.payment_schedules.get()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    f"/api/v1/real-estate/payment-schedules/{schedule.id}/generate-installments/",
+                    payload,
+                    format="json",
+                )
+            return schedule, response, len(queries.captured_queries)
+
+        # The first plan also creates the installment sequence row.
+        generate({"installment_count": 1, "start_date": "2026-01-31", "total_amount": "100.00"})
+        _, _, small_plan_queries = generate({"installment_count": 6, "start_date": "2026-01-31", "total_amount": "600.00"})
+        # Kept within one insert batch; SQLite splits larger bulk inserts by its parameter limit.
+        _, _, larger_plan_queries = generate({"installment_count": 48, "start_date": "2026-01-31", "total_amount": "4800.00"})
+        self.assertEqual(larger_plan_queries, small_plan_queries)
+
+        schedule, response, _ = generate({"installment_count": 120, "start_date": "2026-01-31", "total_amount": "10000.00"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 120)
+        self.assertEqual(response.data[1]["due_date"], "2026-02-28")
+        self.assertEqual(len({row["installment_number"] for row in response.data}), 120)
+        self.assertEqual(sum(Decimal(row["amount"]) for row in response.data), Decimal("10000.00"))
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.end_date, date(2035, 12, 31))
+
+        repeat = self.client.post(
+            f"/api/v1/real-estate/payment-schedules/{schedule.id}/generate-installments/",
+            {"installment_count": 2, "start_date": "2026-01-31", "total_amount": "100.00"},
+            format="json",
+        )
+        self.assertEqual(repeat.status_code, status.HTTP_400_BAD_REQUEST)
+
+        _, balloon, _ = generate(
+            {
+                "plan": "balloon",
+                "frequency": "quarterly",
+                "installment_count": 5,
+                "start_date": "2026-01-15",
+                "total_amount": "1000.00",
+                "balloon_amount": "600.00",
+            }
+        )
+        self.assertEqual(balloon.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row["amount"] for row in balloon.data], ["100.00", "100.00", "100.00", "100.00", "600.00"])
+        self.assertEqual(balloon.data[-1]["due_date"], "2027-01-15")
+
+    def test_generate_installments_audits_ids_without_bulk_insert_returning(self):
+        self.client.force_authenticate(user=self.accountant)
+        schedule = self.create_contract([]).payment_schedules.get()
+        with patch.object(type(connection.features), "can_return_rows_from_bulk_insert", False):
+            response = self.client.post(
+                f"/api/v1/real-estate/payment-schedules/{schedule.id}/generate-installments/",
+                {"installment_count": 3, "start_date": "2026-01-31", "total_amount": "300.00"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        audited_ids = set(AuditLog.objects.filter(model_name="Installment", action="create").values_list("object_id", flat=True))
+        self.assertEqual(audited_ids, {str(row["id"]) for row in response.data})
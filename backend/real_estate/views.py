@@ -1,5 +1,6 @@
+from django.db import transaction
 from django.utils import timezone
-from rest_framework import mixins, viewsets
+from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
@@ -14,6 +15,8 @@ from core.access import (
     RowLevelScopeMixin,
 )
 from core.audit import AuditLogMixin
+from core.bulk import BulkCreateMixin
+from core.fieldsets import SparseFieldsetViewMixin
 from payments.models import PaymentAllocation
 from payments.serializers import PaymentAllocationDetailSerializer
 from .models import (
@@ -31,7 +34,9 @@ from .models import (
 from .serializers import (
     BuildingSerializer,
     HandoverSerializer,
+    InstallmentListSerializer,
     InstallmentSerializer,
+    PaymentPlanSerializer,
     PaymentScheduleSerializer,
     RealEstateProjectSerializer,
     ReservationSerializer,
@@ -40,6 +45,7 @@ from .serializers import (
     UnitSerializer,
     UnitTypeSerializer,
 )
+from .services import generate_installments, refresh_contract_overdue_totals, with_installment_details
 
 REAL_ESTATE_READ_ROLES = {ROLE_ADMIN, ROLE_ACCOUNTANT, ROLE_PROJECT_MANAGER, ROLE_UNASSIGNED}
 REAL_ESTATE_WRITE_ROLES = {ROLE_ADMIN, ROLE_PROJECT_MANAGER}
@@ -239,14 +245,26 @@ class SalesContractViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelView
         "update": REAL_ESTATE_SALES_ROLES,
         "partial_update": REAL_ESTATE_SALES_ROLES,
         "destroy": {ROLE_ADMIN},
+        "overdue": REAL_ESTATE_READ_ROLES,
     }
     filterset_fields = ["status", "unit", "customer", "contract_date"]
     search_fields = ["contract_number", "unit__code", "customer__name"]
-    ordering_fields = ["contract_date", "created_at"]
+    ordering_fields = ["contract_date", "created_at", "overdue_amount", "overdue_since"]
 
     def get_queryset(self):
         return self.apply_row_level_scope(super().get_queryset())
 
+    @action(detail=False, methods=["get"])
+    def overdue(self, request):
+        # Reads the maintained overdue totals, so only contracts with overdue installments are touched.
+        queryset = self.filter_queryset(self.get_queryset().filter(overdue_since__isnull=False))
+        if "ordering" not in request.query_params:
+            queryset = queryset.order_by("overdue_since", "pk")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
     def perform_create(self, serializer):
         unit = serializer.validated_data.get("unit")
         if unit.status not in {Unit.Status.AVAILABLE, Unit.Status.RESERVED}:
@@ -272,6 +290,7 @@ class PaymentScheduleViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelVi
         "update": REAL_ESTATE_SALES_ROLES,
         "partial_update": REAL_ESTATE_SALES_ROLES,
         "destroy": {ROLE_ADMIN},
+        "generate_plan": REAL_ESTATE_SALES_ROLES,
     }
     filterset_fields = ["contract"]
     search_fields = ["contract__contract_number"]
@@ -280,23 +299,35 @@ class PaymentScheduleViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelVi
     def get_queryset(self):
         return self.apply_row_level_scope(super().get_queryset())
 
+    @action(detail=True, methods=["post"], url_path="generate-installments")
+    def generate_plan(self, request, pk=None):
+        schedule = self.get_object()
+        plan = PaymentPlanSerializer(data=request.data, context={"schedule": schedule})
+        plan.is_valid(raise_exception=True)
+        options = {key: value for key, value in plan.validated_data.items() if key not in {"plan", "frequency"}}
 
-class InstallmentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
-    queryset = Installment.objects.select_related(
-        "schedule",
-        "schedule__contract",
-        "schedule__contract__unit",
-        "schedule__contract__unit__building",
-        "schedule__contract__unit__building__project",
-        "schedule__contract__unit__unit_type",
-    ).all()
+        with transaction.atomic():
+            schedule = PaymentSchedule.objects.select_for_update().select_related("contract").get(pk=schedule.pk)
+            if schedule.installments.exists():
+                raise ValidationError({"schedule": "Schedule already has installments."})
+            installments = generate_installments(schedule, **options)
+            self.log_bulk_action(action="create", instances=installments)
+
+        generated = with_installment_details(schedule.installments.all()).order_by("due_date", "installment_number")
+        return Response(InstallmentSerializer(generated, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class InstallmentViewSet(BulkCreateMixin, SparseFieldsetViewMixin, AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
+    queryset = with_installment_details(Installment.objects.all())
     serializer_class = InstallmentSerializer
+    list_serializer_class = InstallmentListSerializer
     permission_classes = [ActionBasedRolePermission]
     user_scope_fields = ("schedule__contract__created_by", "schedule__contract__customer__user")
     action_role_map = {
         "list": REAL_ESTATE_READ_ROLES,
         "retrieve": REAL_ESTATE_READ_ROLES,
         "create": REAL_ESTATE_SALES_ROLES,
+        "bulk_create": REAL_ESTATE_SALES_ROLES,
         "update": REAL_ESTATE_SALES_ROLES,
         "partial_update": REAL_ESTATE_SALES_ROLES,
         "destroy": {ROLE_ADMIN},
@@ -308,6 +339,13 @@ class InstallmentViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSe
     def get_queryset(self):
         return self.apply_row_level_scope(super().get_queryset())
 
+    def perform_bulk_create(self, serializer):
+        instances = super().perform_bulk_create(serializer)
+        refresh_contract_overdue_totals(
+            {instance.schedule.contract_id for instance in instances if instance.status == Installment.Status.OVERDUE}
+        )
+        return instances
+
 
 class HandoverViewSet(AuditLogMixin, RowLevelScopeMixin, viewsets.ModelViewSet):
     queryset = Handover.objects.select_related(
@@ -372,31 +410,15 @@ class CustomerContractViewSet(RowLevelScopeMixin, mixins.ListModelMixin, mixins.
     @action(detail=True, methods=["get"])
     def installments(self, request, pk=None):
         contract = self.get_object()
-        installments = (
-            Installment.objects.select_related(
-                "schedule",
-                "schedule__contract",
-                "schedule__contract__unit",
-                "schedule__contract__unit__building",
-                "schedule__contract__unit__building__project",
-                "schedule__contract__unit__unit_type",
-            )
-            .filter(schedule__contract=contract)
-            .order_by("due_date", "installment_number")
+        installments = with_installment_details(Installment.objects.filter(schedule__contract=contract)).order_by(
+            "due_date", "installment_number"
         )
         serializer = InstallmentSerializer(installments, many=True)
         return Response(serializer.data)
 
 
 class CustomerInstallmentViewSet(RowLevelScopeMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
-    queryset = Installment.objects.select_related(
-        "schedule",
-        "schedule__contract",
-        "schedule__contract__unit",
-        "schedule__contract__unit__building",
-        "schedule__contract__unit__building__project",
-        "schedule__contract__unit__unit_type",
-    ).all()
+    queryset = with_installment_details(Installment.objects.all())
     serializer_class = InstallmentSerializer
     permission_classes = [IsAuthenticated]
     user_scope_fields = ("schedule__contract__customer__user",)
@@ -0,0 +1,33 @@
+#!/bin/sh
+# Compare the development server with the production pre-fork server inside the same container:
+#   docker compose exec backend sh scripts/compare_servers.sh /api/v1/core/health/
+set -eu
+
+ENDPOINT="${1:-/api/v1/core/health/}"
+CONCURRENCY="${LOAD_TEST_CONCURRENCY:-32}"
+DURATION="${LOAD_TEST_DURATION:-20}"
+USERNAME="${LOAD_TEST_USERNAME:-}"
+PASSWORD="${LOAD_TEST_PASSWORD:-}"
+
+wait_for() {
+  for _ in $(seq 1 50); do
+    python -c "import urllib.request; urllib.request.urlopen('http://127.0.0.1:$1/api/v1/core/health/', timeout=1)" 2>/dev/null && return 0
+    sleep 0.2
+  done
+  echo "Server on port $1 did not start" >&2
+  return 1
+}
+
+python manage.py runserver 127.0.0.1:8101 --noreload >/tmp/load-test-runserver.log 2>&1 &
+RUNSERVER_PID=$!
+GUNICORN_BIND=127.0.0.1:8102 GUNICORN_ACCESS_LOG=/dev/null gunicorn -c gunicorn.conf.py >/tmp/load-test-gunicorn.log 2>&1 &
+GUNICORN_PID=$!
+trap 'kill $RUNSERVER_PID $GUNICORN_PID 2>/dev/null || true' EXIT
+
+wait_for 8101
+wait_for 8102
+
+python scripts/load_test.py --label runserver --url "http://127.0.0.1:8101$ENDPOINT" --concurrency "$CONCURRENCY" --duration "$DURATION" \
+  --username "$USERNAME" --password "$PASSWORD"
+python scripts/load_test.py --label gunicorn --url "http://127.0.0.1:8102$ENDPOINT" --concurrency "$CONCURRENCY" --duration "$DURATION" \
+  --username "$USERNAME" --password "$PASSWORD"
@@ -0,0 +1,111 @@
+"""Closed-loop HTTP load generator for comparing server modes.
+
+Usage: python scripts/load_test.py --url http://127.0.0.1:8000/api/v1/core/health/ --concurrency 32 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+
+def obtain_token(base_url: str, username: str, password: str) -> str:
+    request = urllib.request.Request(
+        f"{base_url}/api/auth/token/",
+        data=json.dumps({"username": username, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())["access"]
+
+
+def run_worker(url: str, headers: dict, deadline: float, latencies: list[float], errors: list[str], lock):
+    target = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if target.scheme == "https" else http.client.HTTPConnection
+    path = target.path + (f"?{target.query}" if target.query else "")
+    connection = connection_class(target.netloc, timeout=30)
+    local_latencies = []
+    local_errors = []
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors.append(f"HTTP {response.status}")
+            else:
+                local_latencies.append((time.perf_counter() - started) * 1000)
+        except (OSError, http.client.HTTPException) as exc:
+            local_errors.append(type(exc).__name__)
+            connection.close()
+            connection = connection_class(target.netloc, timeout=30)
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.extend(local_errors)
+
+
+def percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--label", default="")
+    parser.add_argument("--username", default="")
+    parser.add_argument("--password", default="")
+    args = parser.parse_args()
+
+    headers = {"Connection": "keep-alive"}
+    if args.username:
+        target = urlsplit(args.url)
+        token = obtain_token(f"{target.scheme}://{target.netloc}", args.username, args.password)
+        headers["Authorization"] = f"Bearer {token}"
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    workers = [
+        threading.Thread(target=run_worker, args=(args.url, headers, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    print(
+        json.dumps(
+            {
+                "label": args.label or args.url,
+                "concurrency": args.concurrency,
+                "requests": len(latencies),
+                "errors": len(errors),
+                "requests_per_second": round(len(latencies) / elapsed, 1),
+                "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+            }
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()